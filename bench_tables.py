@@ -0,0 +1,67 @@
+import sys
+import time
+import argparse
+from pathlib import Path
+
+from src.PDFTextExtractor import TABLE_BACKENDS, get_table_extractor
+from src.HeaderParser import HeaderBasedTableParser
+
+
+def benchmark_pdf(pdf_path: str, backends, repeat: int = 3, password: str = None):
+    """Time every backend on one PDF; returns one result dict per backend."""
+    results = []
+    for backend in backends:
+        extractor = get_table_extractor(backend, pdf_path, password=password)
+        timings = []
+        tables = []
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                tables = extractor.extract_tables()
+                timings.append(time.perf_counter() - start)
+        except Exception as e:
+            results.append({"backend": backend, "error": str(e)})
+            continue
+
+        txns = HeaderBasedTableParser().parse(tables)
+        results.append({
+            "backend": backend,
+            "best_s": min(timings),
+            "mean_s": sum(timings) / len(timings),
+            "tables": len(tables),
+            "rows": sum(len(t["rows"]) for t in tables),
+            "transactions": len(txns),
+        })
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark table-extraction backends.")
+    ap.add_argument("-i", "--input", required=True, help="PDF file or directory of PDFs")
+    ap.add_argument("-b", "--backends", nargs="+", default=list(TABLE_BACKENDS),
+                    help=f"Backends to compare (default: {' '.join(TABLE_BACKENDS)})")
+    ap.add_argument("-n", "--repeat", type=int, default=3, help="Runs per backend (default: 3)")
+    ap.add_argument("-p", "--password", default=None, help="Password for encrypted PDF files")
+    args = ap.parse_args()
+
+    input_path = Path(args.input).expanduser().resolve()
+    if input_path.is_dir():
+        pdfs = sorted(p for p in input_path.iterdir() if p.suffix.lower() == ".pdf")
+    elif input_path.is_file():
+        pdfs = [input_path]
+    else:
+        print(f"Invalid path: {input_path}")
+        sys.exit(1)
+
+    print(f"{'file':<30} {'backend':<12} {'best s':>8} {'mean s':>8} {'tables':>7} {'rows':>6} {'txns':>6}")
+    for pdf in pdfs:
+        for r in benchmark_pdf(str(pdf), args.backends, args.repeat, args.password):
+            if "error" in r:
+                print(f"{pdf.name:<30} {r['backend']:<12} ERROR: {r['error']}")
+                continue
+            print(f"{pdf.name:<30} {r['backend']:<12} {r['best_s']:>8.3f} {r['mean_s']:>8.3f} "
+                  f"{r['tables']:>7} {r['rows']:>6} {r['transactions']:>6}")
+
+
+if __name__ == "__main__":
+    main()
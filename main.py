@@ -82,6 +82,12 @@ def main():
     print("\nPartial Doc ")
     print(partial_doc)
 
+    statements = BankStatementAssembler().assemble(
+        profile_hint, summary_data, partial_doc["transactions"]
+    )
+    for statement in statements:
+        print(statement.transactionsMeta)
+
     
 
 
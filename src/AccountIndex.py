@@ -0,0 +1,102 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def _table_text(table: Dict[str, Any]) -> str:
+    # Same flattening find_account_for_table used: cells space-joined, row by row
+    text = ""
+    for row in table.get("rows", []) or []:
+        text += " ".join(str(cell) for cell in row if cell) + " "
+    return text.lower()
+
+
+class AccountTableIndex:
+    """
+    Maps each account number (AccountNumberExtractor(return_all=True) output)
+    to the tables it occurs in, so every table can be routed to an account by
+    lookup instead of re-searching the current and previous table's text for
+    every account.
+
+    All account numbers are compiled into one pattern and each table's text is
+    searched once as it is added. Tables can be added as they arrive
+    (HeaderBasedTableParser.iter_parse) or all at once with build().
+
+    account_for() keeps find_account_for_table's rules:
+      1. a single account is used for every table
+      2. the first account (in extractor order) found in this or the previous table
+      3. the account at the table's position, then the highest-confidence one
+    """
+
+    def __init__(self, accounts: Optional[List[Dict[str, Any]]]):
+        self.accounts = [acc for acc in (accounts or []) if acc.get("account_number")]
+        self.all_accounts = accounts or []
+        keys: List[str] = []
+        for acc in self.accounts:
+            key = str(acc["account_number"]).lower()
+            if key not in keys:
+                keys.append(key)
+        self._keys = keys
+        # Longest alternative first; a lookahead reports a hit at every position
+        # and shorter numbers contained in a hit are added from _contained.
+        self._pattern = None
+        if keys:
+            alternatives = "|".join(re.escape(k) for k in sorted(keys, key=len, reverse=True))
+            self._pattern = re.compile(f"(?=({alternatives}))")
+        self._contained = {k: [o for o in keys if o != k and o in k] for k in keys}
+        self._table_hits: List[Set[str]] = []
+        self.occurrences: Dict[str, List[Tuple[Optional[int], int]]] = {k: [] for k in keys}
+
+    @classmethod
+    def build(cls, accounts: Optional[List[Dict[str, Any]]],
+              tables: Iterable[Dict[str, Any]]) -> "AccountTableIndex":
+        index = cls(accounts)
+        for table in tables:
+            index.add(table)
+        return index
+
+    def add(self, table: Dict[str, Any]) -> int:
+        """Index the next table; returns its table index."""
+        table_index = len(self._table_hits)
+        hits: Set[str] = set()
+        if self._pattern is not None:
+            for m in self._pattern.finditer(_table_text(table)):
+                key = m.group(1)
+                if key not in hits:
+                    hits.add(key)
+                    hits.update(self._contained[key])
+        for key in hits:
+            self.occurrences[key].append((table.get("page_number"), table_index))
+        self._table_hits.append(hits)
+        return table_index
+
+    def spans(self, account_number: str) -> List[Tuple[Optional[int], int]]:
+        """(page_number, table_index) of every table mentioning the account."""
+        return self.occurrences.get(str(account_number).lower(), [])
+
+    def account_for(self, table_index: int) -> Optional[str]:
+        if not self.all_accounts:
+            return None
+        if len(self.all_accounts) == 1:
+            return self.all_accounts[0]["account_number"]
+        if table_index >= len(self._table_hits):
+            return None
+
+        nearby = self._table_hits[table_index]
+        if table_index > 0:
+            nearby = nearby | self._table_hits[table_index - 1]
+        for acc in self.accounts:
+            if str(acc["account_number"]).lower() in nearby:
+                return acc["account_number"]
+
+        if table_index < len(self.all_accounts):
+            return self.all_accounts[table_index]["account_number"]
+        return max(self.all_accounts, key=lambda x: x["confidence"])["account_number"]
+
+
+def split_by_account(transactions: Iterable[Dict[str, Any]],
+                     field: str = "maskedAccNumber") -> Dict[str, List[Dict[str, Any]]]:
+    """Group transactions into per-account lists, in first-seen order ("" = unassigned)."""
+    streams: Dict[str, List[Dict[str, Any]]] = {}
+    for txn in transactions:
+        streams.setdefault(txn.get(field) or "", []).append(txn)
+    return streams
@@ -0,0 +1,152 @@
+import csv
+import codecs
+import logging
+from itertools import count, islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.HeaderParser import HeaderBasedTableParser
+from src.StringPool import StringPool
+
+logger = logging.getLogger(__name__)
+
+# Encodings tried in order on the sample; latin-1 decodes anything, so it is last
+ENCODINGS = ("utf-8-sig", "cp1252", "latin-1")
+DELIMITERS = ",;\t|"
+SAMPLE_BYTES = 64 * 1024
+DEFAULT_CHUNK_ROWS = 5000
+# Rows searched for the transaction header (bank exports put account details above it)
+HEADER_SCAN_ROWS = 100
+# Data rows after the header kept in the text page for the profile extractors
+PROFILE_ROWS = 50
+
+
+def detect_encoding(sample: bytes, encodings=ENCODINGS) -> str:
+    for encoding in encodings:
+        try:
+            # incremental: the sample may end inside a multi-byte character
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+
+def delimiter_dialect(delimiter: str) -> Any:
+    """csv.excel (quoting rules of spreadsheet exports) with another delimiter."""
+    return type("delimited", (csv.excel,), {"delimiter": delimiter})
+
+
+def detect_dialect(sample: str) -> Any:
+    # Sniff complete lines only; fall back to plain commas
+    if "\n" in sample:
+        sample = sample[:sample.rfind("\n")]
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=DELIMITERS)
+    except csv.Error:
+        return csv.excel
+
+
+class CSVExtractor:
+    """
+    Streaming CSV statement extractor with the ExcelExtractor interface
+    (extract_text_pages / extract_tables).
+
+    Encoding is detected from the first SAMPLE_BYTES. The delimiter is the
+    one of DELIMITERS under which HeaderBasedTableParser's alias matcher
+    finds the transaction header in the first HEADER_SCAN_ROWS rows (the
+    account-detail lines above it have other column counts, which defeats
+    csv.Sniffer); csv.Sniffer is only the fallback. iter_tables() then reads the file chunk_rows rows at a time, so
+    only one chunk is held in memory while it is parsed and normalized; the
+    header mapping carries over between chunks like between PDF pages.
+    """
+
+    def __init__(self, csv_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 parser: Optional[HeaderBasedTableParser] = None):
+        self.csv_path = csv_path
+        self.chunk_rows = max(1, int(chunk_rows))
+        self.sheet_name = Path(csv_path).stem
+        self.parser = parser or HeaderBasedTableParser()
+        self._strings = StringPool()
+        with open(csv_path, "rb") as fh:
+            sample = fh.read(SAMPLE_BYTES)
+        self.encoding = detect_encoding(sample)
+        self.dialect, self.header_index, self._preamble = self._detect_layout(
+            sample.decode(self.encoding, errors="replace")
+        )
+        logger.debug("CSV %s: encoding=%s delimiter=%r header row=%s",
+                     csv_path, self.encoding, self.dialect.delimiter, self.header_index)
+
+    def _open(self):
+        return open(self.csv_path, newline="", encoding=self.encoding, errors="replace")
+
+    def _iter_rows(self, fh, dialect=None) -> Iterator[List[Optional[str]]]:
+        # Same cleanup as ExcelExtractor: stripped strings, None for blanks,
+        # leading empty cells dropped, so an exported workbook parses the same
+        cell = self._strings.cell
+        for row in csv.reader(fh, dialect or self.dialect):
+            cleaned = [cell(value) for value in row]
+            start = 0
+            while start < len(cleaned) and cleaned[start] is None:
+                start += 1
+            if start < len(cleaned):
+                yield cleaned[start:]
+
+    def _is_header(self, row: List[Optional[str]]) -> bool:
+        compressed = self.parser.compress_row(row)
+        if len(compressed) < 3:
+            return False
+        return self.parser.is_transaction_header(self.parser.map_headers(compressed))
+
+    def _scan_header(self, dialect) -> Tuple[Optional[int], List[List[Optional[str]]]]:
+        """(header row index or None, rows up to the header plus PROFILE_ROWS)."""
+        with self._open() as fh:
+            rows = list(islice(self._iter_rows(fh, dialect), HEADER_SCAN_ROWS + PROFILE_ROWS))
+        for i, row in enumerate(rows[:HEADER_SCAN_ROWS]):
+            if self._is_header(row):
+                return i, rows[:i + 1 + PROFILE_ROWS]
+        return None, rows[:PROFILE_ROWS]
+
+    def _detect_layout(self, sample: str) -> Tuple[Any, Optional[int], List[List[Optional[str]]]]:
+        """(dialect, header row index or None, preamble rows)."""
+        for delimiter in DELIMITERS:
+            dialect = delimiter_dialect(delimiter)
+            header_index, preamble = self._scan_header(dialect)
+            if header_index is not None:
+                return dialect, header_index, preamble
+        dialect = detect_dialect(sample)
+        logger.warning("No transaction header in the first %s rows of %s; reading it as %r-separated",
+                       HEADER_SCAN_ROWS, self.csv_path, dialect.delimiter)
+        return (dialect, *self._scan_header(dialect))
+
+    def extract_text_pages(self, max_sheets: int = 3) -> List[Dict[str, Any]]:
+        """One text page: the account details above the header and the first rows."""
+        if max_sheets < 1:
+            return []
+        text = "\n".join(" ".join(cell for cell in row if cell) for row in self._preamble)
+        return [{"text": text, "sheet_name": self.sheet_name}]
+
+    def iter_tables(self) -> Iterator[Dict[str, Any]]:
+        """
+        Tables of up to chunk_rows rows each, read lazily from the file. The
+        first one also holds the rows up to the header, so the parser always
+        sees the header in its first table.
+        """
+        first_extra = self.header_index + 1 if self.header_index is not None else 0
+        with self._open() as fh:
+            rows = self._iter_rows(fh)
+            for chunk_no in count(1):
+                chunk = list(islice(rows, self.chunk_rows + (first_extra if chunk_no == 1 else 0)))
+                if not chunk:
+                    return
+                yield {
+                    "rows": chunk,
+                    "sheet_name": self.sheet_name,
+                    "page_number": chunk_no,
+                    "total_rows": len(chunk),
+                    "total_cols": len(chunk[0]),
+                }
+
+    def extract_tables(self) -> List[Dict[str, Any]]:
+        """Every chunk at once, for callers that want ExcelExtractor's list."""
+        return list(self.iter_tables())
@@ -0,0 +1,132 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.Serializer import JSONSerializer
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for --format parquet/arrow
+    pa = None
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+FILE_SUFFIX = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# SchemaNormalizer output columns, always written in this order (even for a
+# statement without transactions) so every dataset partition has one schema
+TRANSACTION_COLUMNS = ("mode", "type", "fipId", "txnId", "amount", "narration", "reference",
+                       "valueDate", "account_type", "linkedAccRef", "fnrkAccountId",
+                       "currentBalance", "maskedAccNumber", "transactionTimestamp")
+# Typed columns; anything not listed stays a string
+FLOAT_COLUMNS = ("amount", "currentBalance")
+CATEGORY_COLUMNS = ("type", "mode", "account_type", "maskedAccNumber")
+DATE_COLUMNS = ("valueDate",)
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for parquet/arrow output (pip install pyarrow)")
+
+
+def _float_or_none(v):
+    # normalizer leaves "" (or an unparseable string) when there is no amount
+    return float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else None
+
+
+def _str_or_none(v):
+    if v is None or v == "":
+        return None
+    return str(v)
+
+
+def column_type(name: str) -> "pa.DataType":
+    _require_pyarrow()
+    if name in FLOAT_COLUMNS:
+        return pa.float64()
+    if name in DATE_COLUMNS:
+        return pa.timestamp("ms")
+    if name in CATEGORY_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+
+def transactions_to_table(transactions: List[Dict[str, Any]]) -> "pa.Table":
+    """
+    Normalized transactions -> Arrow table with every TRANSACTION_COLUMNS
+    column (plus any extra keys, as strings):
+      amount/currentBalance float64, valueDate timestamp[ms],
+      type/mode/account_type/maskedAccNumber dictionary (category) strings.
+    Empty strings become nulls.
+    """
+    _require_pyarrow()
+    names: List[str] = list(TRANSACTION_COLUMNS)
+    for txn in transactions:
+        for key in txn:
+            if key not in names:
+                names.append(key)
+
+    columns = {}
+    for name in names:
+        values = [txn.get(name) for txn in transactions]
+        if name in FLOAT_COLUMNS:
+            columns[name] = pa.array([_float_or_none(v) for v in values], type=pa.float64())
+        elif name in DATE_COLUMNS:
+            strings = pa.array([_str_or_none(v) for v in values], type=pa.string())
+            columns[name] = pc.strptime(strings, format="%Y-%m-%d", unit="ms", error_is_null=True)
+        elif name in CATEGORY_COLUMNS:
+            columns[name] = pa.array([_str_or_none(v) for v in values], type=pa.string()).dictionary_encode()
+        else:
+            columns[name] = pa.array([_str_or_none(v) for v in values], type=pa.string())
+    return pa.table(columns, schema=pa.schema([(name, column_type(name)) for name in names]))
+
+
+def write_table(table: "pa.Table", path: Path, fmt: str = "parquet") -> Path:
+    _require_pyarrow()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        pq.write_table(table, path)
+    elif fmt == "arrow":
+        feather.write_feather(table, path)  # Arrow IPC file format
+    else:
+        raise ValueError(f"Unknown columnar format '{fmt}'. Choose from: {', '.join(COLUMNAR_FORMATS)}")
+    return path
+
+
+class ColumnarWriter:
+    """
+    Write a statement as a small JSON (document_info, profile, summary) plus
+    its transactions as a typed Parquet / Arrow IPC file next to it.
+
+    With a dataset_dir every statement's transactions are also written to a
+    hive-partitioned batch dataset, one partition per statement:
+        <dataset_dir>/statement=<pdf_name>/part-0.parquet
+    readable with pyarrow.dataset.dataset(dataset_dir, partitioning="hive").
+    """
+
+    def __init__(self, output_dir: Path, fmt: str = "parquet", dataset_dir: Optional[Path] = None,
+                 serializer: JSONSerializer = None):
+        _require_pyarrow()
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format '{fmt}'. Choose from: {', '.join(COLUMNAR_FORMATS)}")
+        self.output_dir = Path(output_dir)
+        self.fmt = fmt
+        self.dataset_dir = Path(dataset_dir) if dataset_dir else None
+        self.serializer = serializer or JSONSerializer()
+
+    def write(self, pdf_name: str, document_data: Dict[str, Any]) -> Dict[str, str]:
+        """Returns {"json": path, "transactions": path[, "dataset": path]}."""
+        table = transactions_to_table(document_data.get("transactions") or [])
+        txn_path = write_table(table, self.output_dir / f"{pdf_name}_transactions{FILE_SUFFIX[self.fmt]}", self.fmt)
+
+        meta = {k: v for k, v in document_data.items() if k != "transactions"}
+        meta["transactions_file"] = txn_path.name
+        json_path = self.serializer.dump(meta, self.output_dir / f"{pdf_name}_analysis.json")
+
+        written = {"json": str(json_path), "transactions": str(txn_path)}
+        if self.dataset_dir is not None:
+            part = self.dataset_dir / f"statement={pdf_name}" / f"part-0{FILE_SUFFIX[self.fmt]}"
+            written["dataset"] = str(write_table(table, part, self.fmt))
+        return written
@@ -1,65 +1,90 @@
+import io
+import logging
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from pathlib import Path
 
+from src.Logger import log_row
+from src.StringPool import StringPool
+
+try:
+    import msoffcrypto
+except ImportError:  # optional: only needed for password-protected workbooks
+    msoffcrypto = None
+
+logger = logging.getLogger(__name__)
+
+
+def decrypt_workbook(excel_path: str, password: str) -> Union[str, io.BytesIO]:
+    """
+    Decrypt a password-protected .xls/.xlsx into memory (no temp file).
+    Workbooks that are not encrypted are returned as their path.
+    """
+    if msoffcrypto is None:
+        raise ImportError("msoffcrypto-tool is required for password-protected workbooks "
+                          "(pip install msoffcrypto-tool)")
+    with open(excel_path, "rb") as fh:
+        office_file = msoffcrypto.OfficeFile(fh)
+        if not office_file.is_encrypted():
+            return excel_path
+        office_file.load_key(password=password)
+        decrypted = io.BytesIO()
+        office_file.decrypt(decrypted)
+    decrypted.seek(0)
+    logger.debug("Decrypted %s in memory", excel_path)
+    return decrypted
+
+
 class ExcelExtractor:
     """
-    Simple Excel extractor that handles both .xls and .xlsx files
+    Simple Excel extractor that handles both .xls and .xlsx files.
+    password: decrypts protected workbooks in memory (needs msoffcrypto-tool).
     """
-    
-    def __init__(self, excel_path: str):
+
+    def __init__(self, excel_path: str, password: Optional[str] = None):
         self.excel_path = excel_path
+        self.password = password
         self.file_extension = Path(excel_path).suffix.lower()
         self.pd_sheets = None
+        self._strings = StringPool()
         self._load_workbook()
-    
+
+    def _read_excel(self, source, engine: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        if isinstance(source, io.BytesIO):
+            source.seek(0)  # a failed engine may have read part of the buffer
+        return pd.read_excel(source, sheet_name=None, header=None, engine=engine)
+
     def _load_workbook(self):
         """Load Excel workbook with appropriate engine"""
-        print(f"Loading {self.file_extension} file...")
-        
+        logger.debug("Loading %s file %s", self.file_extension, self.excel_path)
+
         try:
+            source = decrypt_workbook(self.excel_path, self.password) if self.password else self.excel_path
+
             if self.file_extension == '.xls':
                 # Try xlrd first
                 try:
-                    self.pd_sheets = pd.read_excel(
-                        self.excel_path, 
-                        sheet_name=None, 
-                        header=None, 
-                        engine='xlrd'
-                    )
-                    print("Successfully loaded using xlrd engine")
+                    self.pd_sheets = self._read_excel(source, engine='xlrd')
+                    logger.debug("Loaded using xlrd engine")
                 except Exception as e:
-                    print(f"xlrd failed: {e}")
+                    logger.warning("xlrd failed on %s: %s", self.excel_path, e)
                     # Try other engines as fallback
                     try:
-                        self.pd_sheets = pd.read_excel(
-                            self.excel_path, 
-                            sheet_name=None, 
-                            header=None
-                        )
-                        print("Successfully loaded using default engine")
+                        self.pd_sheets = self._read_excel(source)
+                        logger.debug("Loaded using default engine")
                     except Exception as e2:
                         raise Exception(f"All engines failed. xlrd error: {e}, default error: {e2}")
             else:
                 # .xlsx files
                 try:
-                    self.pd_sheets = pd.read_excel(
-                        self.excel_path, 
-                        sheet_name=None, 
-                        header=None, 
-                        engine='openpyxl'
-                    )
-                    print("Successfully loaded using openpyxl engine")
+                    self.pd_sheets = self._read_excel(source, engine='openpyxl')
+                    logger.debug("Loaded using openpyxl engine")
                 except Exception as e:
-                    print(f"openpyxl failed: {e}")
+                    logger.warning("openpyxl failed on %s: %s", self.excel_path, e)
                     # Try default engine
-                    self.pd_sheets = pd.read_excel(
-                        self.excel_path, 
-                        sheet_name=None, 
-                        header=None
-                    )
-                    print("Successfully loaded using default engine")
-                    
+                    self.pd_sheets = self._read_excel(source)
+                    logger.debug("Loaded using default engine")
+
         except Exception as e:
             raise Exception(f"Failed to load Excel file: {e}")
     
@@ -126,7 +151,7 @@ class ExcelExtractor:
                 if pd.isna(value):
                     row_list.append(None)
                 else:
-                    row_list.append(str(value).strip())
+                    row_list.append(self._strings.intern(str(value).strip()))
             
             # NEW: Remove leading None columns if they're consistently empty
             while row_list and row_list[0] is None:
@@ -149,12 +174,12 @@ class ExcelExtractor:
             # Remove leading empty columns from all rows
             if leading_empty_cols > 0:
                 rows = [row[leading_empty_cols:] for row in rows]
-                if self.debug:
-                    print(f"Removed {leading_empty_cols} leading empty columns")
+                logger.debug("Removed %s leading empty columns", leading_empty_cols)
         
-        print(f"Cleaned rows (first 30):")
-        for i, row in enumerate(rows[:30]):
-            print(f"  Row {i:2d}: {row}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sheet %s: %s cleaned rows", sheet_name, len(rows))
+            for i, row in enumerate(rows[:30]):
+                log_row(logger, "Row %2d: %s", i, row)
         
         if not rows:
             return None
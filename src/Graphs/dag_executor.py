@@ -0,0 +1,149 @@
+from __future__ import annotations
+import logging
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from collections.abc import Sequence as SequenceABC
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class FutureSequence(SequenceABC):
+    """
+    A list still being produced by a Future (e.g. tables being extracted).
+    Nothing blocks until it is first read: len(), indexing, iteration or a
+    truth test wait for the Future.
+    """
+
+    def __init__(self, future: Future):
+        self._future = future
+
+    def _items(self) -> Sequence[Any]:
+        return self._future.result() or []
+
+    def __len__(self) -> int:
+        return len(self._items())
+
+    def __getitem__(self, index):
+        return self._items()[index]
+
+    def __iter__(self):
+        return iter(self._items())
+
+
+class Node:
+    """
+    One step of a DAG: fn is called with keyword arguments named after deps,
+    each dep being either a graph input or another node's name.
+    process=True lets the executor run fn in its process pool (fn and its
+    arguments must then be picklable).
+    lazy: deps (graph inputs) that fn only reads as a fallback; a pending
+    Future input is passed as a FutureSequence so fn starts right away and
+    waits only if it reaches that input.
+    """
+
+    def __init__(self, name: str, fn: Callable[..., Any], deps: Sequence[str] = (), process: bool = False,
+                 lazy: Sequence[str] = ()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.process = process
+        self.lazy = frozenset(lazy)
+
+    def __repr__(self) -> str:
+        return f"Node({self.name!r}, deps={list(self.deps)})"
+
+
+def topological_order(nodes: List[Node], inputs: Dict[str, Any]) -> List[Node]:
+    """Order nodes so every node comes after its deps; ValueError on unknown deps or cycles."""
+    by_name = {n.name: n for n in nodes}
+    order: List[Node] = []
+    state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def visit(node: Node, path: List[str]) -> None:
+        if state.get(node.name) == 2:
+            return
+        if state.get(node.name) == 1:
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [node.name])}")
+        state[node.name] = 1
+        for dep in node.deps:
+            if dep in by_name:
+                visit(by_name[dep], path + [node.name])
+            elif dep not in inputs:
+                raise ValueError(f"Node '{node.name}' depends on unknown '{dep}'")
+        state[node.name] = 2
+        order.append(node)
+
+    for node in nodes:
+        visit(node, [])
+    return order
+
+
+class DAGExecutor:
+    """
+    Run a small dependency graph of extractors concurrently.
+
+    Independent nodes run side by side in a thread pool; a node starts as soon
+    as its deps are done. Graph inputs may be concurrent.futures.Future objects
+    (e.g. tables still being extracted): only the nodes that need them wait.
+    process_workers > 0 adds a process pool for nodes marked process=True,
+    for regex-heavy extractors that hold the GIL.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, process_workers: int = 0, debug: bool = False):
+        self.debug = debug
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dag")
+        self._processes = ProcessPoolExecutor(max_workers=process_workers) if process_workers else None
+
+    def __enter__(self) -> "DAGExecutor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        self._threads.shutdown(wait=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=True)
+
+    @staticmethod
+    def _resolve(value: Any) -> Any:
+        return value.result() if isinstance(value, Future) else value
+
+    def _run_node(self, node: Node, futures: Dict[str, Future], inputs: Dict[str, Any]) -> Any:
+        # A pending Future cannot be pickled: while a lazy input is still being
+        # produced, a process node runs in its thread instead
+        pending = {dep for dep in node.lazy & set(node.deps)
+                   if isinstance(inputs.get(dep), Future) and not inputs[dep].done()}
+        in_process = node.process and self._processes is not None and not pending
+        kwargs = {}
+        for dep in node.deps:
+            if dep in futures:
+                kwargs[dep] = futures[dep].result()
+            elif dep in pending:
+                kwargs[dep] = FutureSequence(inputs[dep])
+            else:
+                kwargs[dep] = self._resolve(inputs[dep])
+        logger.debug("[dag] running %s", node.name)
+        if in_process:
+            return self._processes.submit(node.fn, **kwargs).result()
+        return node.fn(**kwargs)
+
+    def submit_input(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Start producing a graph input in the background (e.g. table extraction)."""
+        return self._threads.submit(fn, *args, **kwargs)
+
+    def submit(self, nodes: List[Node], inputs: Dict[str, Any]) -> Dict[str, Future]:
+        """
+        Schedule every node and return {name: Future} without waiting.
+        Nodes are queued in dependency order, so a worker only ever blocks on
+        deps that are already running or done.
+        """
+        futures: Dict[str, Future] = {}
+        for node in topological_order(nodes, inputs):
+            futures[node.name] = self._threads.submit(self._run_node, node, futures, inputs)
+        return futures
+
+    def run(self, nodes: List[Node], inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the graph to completion and return {node name: result}."""
+        futures = self.submit(nodes, inputs)
+        return {name: fut.result() for name, fut in futures.items()}
@@ -1,9 +1,24 @@
 import re
+import logging
 from src.constants.field_aliases import FIELD_ALIASES
+from src.AccountIndex import AccountTableIndex
+from src.Logger import log_row
+from src.StringPool import StringPool
+
+logger = logging.getLogger(__name__)
+
+# Distinct column signatures kept by _cached_header_mapping
+HEADER_CACHE_SIZE = 256
 
 class HeaderBasedTableParser:
-    def __init__(self, debug=False):
-        self.debug = debug
+    def __init__(self, debug=False, stitch_continuations=True):
+        self.debug = debug  # kept for callers; output is controlled by the src.HeaderParser log level
+        # Attach date-less continuation rows (wrapped narrations) to the previous transaction
+        self.stitch_continuations = stitch_continuations
+        self._last_txn = None
+        self._header_cache = {}
+        # Shared str per repeated cell value (dates, "UPI", "0.00", ...)
+        self._strings = StringPool()
         self.expected_fields = {
             key: [alias.lower() for alias in aliases]
             for key, aliases in FIELD_ALIASES.items()
@@ -12,7 +27,7 @@ class HeaderBasedTableParser:
     def normalize_cell(self, cell):
         if isinstance(cell, str):
             cell = cell.strip()
-            return cell if cell else None
+            return self._strings.intern(cell) if cell else None
         return cell
     
     def compress_row(self, row):
@@ -30,6 +45,27 @@ class HeaderBasedTableParser:
                     mapping[key] = i
                     break
         return mapping
+
+    def is_transaction_header(self, header_mapping):
+        """Date + description, plus either amount OR debit+credit (common in bank statements)"""
+        has_amount = "amount" in header_mapping
+        has_debit_credit = "debit" in header_mapping and "credit" in header_mapping
+        REQUIRED_FIELDS = {"txn_date", "description"}
+        return REQUIRED_FIELDS.issubset(header_mapping.keys()) and (has_amount or has_debit_credit)
+
+    def _is_continuation(self, txn):
+        """A wrapped narration line: description text but no date, amount or balance"""
+        if txn.get('txn_date') or not txn.get('description'):
+            return False
+        return not any(txn.get(f) for f in ("debit", "credit", "amount", "balance"))
+
+    def _stitch(self, txn):
+        """Append a continuation row to the previous transaction; False if there is none"""
+        if not self.stitch_continuations or self._last_txn is None or not self._is_continuation(txn):
+            return False
+        self._last_txn['description'] = f"{self._last_txn['description']} {txn['description']}"
+        log_row(logger, "Stitched continuation: %s", txn['description'])
+        return True
     
     
     def parse_single_table(self, table, table_index, inherited_header_mapping=None, current_account=None):
@@ -39,8 +75,7 @@ class HeaderBasedTableParser:
         
         # NEW: Check if this table has nested account structure
         if self._has_nested_account_structure(rows):
-            if self.debug:
-                print(f"Detected nested account structure in table {table_index}")
+            logger.debug("Detected nested account structure in table %s", table_index)
             nested_transactions = self._parse_nested_account_table(rows, table_index)
             return nested_transactions, None
         
@@ -50,38 +85,30 @@ class HeaderBasedTableParser:
         header_mapping = inherited_header_mapping or {}
         found_new_header = None
         
-        if self.debug:
-            print(f"\nProcessing Table {table_index} with {len(rows)} rows")
-            if inherited_header_mapping:
-                print(f"Using inherited header: {inherited_header_mapping}")
-            if current_account:
-                print(f"Current account: {current_account}")
+        logger.debug("Processing Table %s with %s rows", table_index, len(rows))
+        if inherited_header_mapping:
+            logger.debug("Using inherited header: %s", inherited_header_mapping)
+        if current_account:
+            logger.debug("Current account: %s", current_account)
         
         for i, row in enumerate(rows):
             compressed = self.compress_row(row)
             if not compressed or len(compressed) < 3:
                 continue
                 
-            if self.debug:
-                print(f"Table {table_index}, Row {i}: {compressed}")
+            log_row(logger, "Table %s, Row %s: %s", table_index, i, compressed)
             
             # Look for header row (only if we don't have one yet)
             if not header_found and len(compressed) >= 3:
                 header_mapping = self.map_headers(compressed)
                 
-                # Check for either amount OR debit+credit (common in bank statements)
-                has_amount = "amount" in header_mapping
-                has_debit_credit = "debit" in header_mapping and "credit" in header_mapping
-                
-                REQUIRED_FIELDS = {"txn_date", "description"}
-                if REQUIRED_FIELDS.issubset(header_mapping.keys()) and (has_amount or has_debit_credit):
+                if self.is_transaction_header(header_mapping):
                     header_found = True
                     found_new_header = header_mapping
-                    if self.debug:
-                        # print(f"New header found in Table {table_index}, Row {i}: {header_mapping}")
-                        print(f"HEADER ROW {i}: {compressed}")
-                        print(f"MAPPING: {header_mapping}")
-                        print(f"SAMPLE DATA ROW: {self.compress_row(rows[i+1]) if i+1 < len(rows) else 'N/A'}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Header row %s in table %s: %s -> %s; sample data row: %s",
+                                     i, table_index, compressed, header_mapping,
+                                     self.compress_row(rows[i+1]) if i+1 < len(rows) else 'N/A')
                     continue  # Skip the header row itself
             
             # Process data rows (either after finding header OR using inherited header)
@@ -92,14 +119,12 @@ class HeaderBasedTableParser:
                 
                 # Skip rows that look like headers (common in multi-page docs)
                 if self.looks_like_header(clean_row):
-                    if self.debug:
-                        print(f"Skipping duplicate header row: {clean_row}")
+                    log_row(logger, "Skipping duplicate header row: %s", clean_row)
                     continue
                 
                 # Skip rows that look like account info or balance summary
                 if self.looks_like_account_info(clean_row):
-                    if self.debug:
-                        print(f"Skipping account info row: {clean_row}")
+                    log_row(logger, "Skipping account info row: %s", clean_row)
                     continue
                 
                 txn = {}
@@ -113,28 +138,28 @@ class HeaderBasedTableParser:
                         txn[field] = None  # genuine missing field
                 if not hasattr(self, '_current_analysis') or self._current_analysis is None:
                     self._current_analysis = self._analyze_column_structure(header_mapping)
-                    if self.debug:
-                        print(f"Column analysis: {self._current_analysis}")
+                    logger.debug("Column analysis: %s", self._current_analysis)
 
                 # Extract transaction using smart logic
                 txn = self._extract_transaction_smart(row, header_mapping, self._current_analysis)
                 
                 #DEBUG for transactions:
-                if self.debug:
-                    print(f"Built transaction: {txn}")
+                log_row(logger, "Built transaction: %s", txn)
                 
                 # Add account number to transaction if available
                 if current_account:
                     txn['account_number'] = current_account
                 
+                if self._stitch(txn):
+                    continue
+
                 # Only add non-empty transactions (must have date and description)
                 if txn.get('txn_date') and txn.get('description'):
                     transactions.append(txn)
-                    if self.debug:
-                        print(f"Added transaction: {txn}")
+                    self._last_txn = txn
+                    log_row(logger, "Added transaction: %s", txn)
         
-        if self.debug:
-            print(f"Table {table_index} yielded {len(transactions)} transactions")
+        logger.debug("Table %s yielded %s transactions", table_index, len(transactions))
         
         return transactions, found_new_header
 
@@ -179,45 +204,10 @@ class HeaderBasedTableParser:
         Smart account mapping logic:
         1. If single account found - use for all tables
         2. If multiple accounts - try to map based on table position/content
+        Builds a throwaway AccountTableIndex; iter_parse keeps one per document.
         """
-        if not all_accounts:
-            return None
-            
-        # Single account case - simple
-        if len(all_accounts) == 1:
-            return all_accounts[0]['account_number']
-        
-        # Multiple accounts case - need smarter mapping
-        # Strategy: Look for account numbers that appear close to this table
-        current_table = tables[table_index] if table_index < len(tables) else None
-        if not current_table:
-            return None
-        
-        # Check if any account number appears in the current table or nearby tables
-        table_text = ""
-        for row in current_table.get("rows", []):
-            table_text += " ".join(str(cell) for cell in row if cell) + " "
-        
-        # Also check previous table (often has account header info)
-        if table_index > 0:
-            prev_table = tables[table_index - 1]
-            for row in prev_table.get("rows", []):
-                table_text += " ".join(str(cell) for cell in row if cell) + " "
-        
-        table_text = table_text.lower()
-        
-        # Find which account number appears in or near this table
-        for account in all_accounts:
-            acc_num = account['account_number']
-            if acc_num and acc_num.lower() in table_text:
-                return acc_num
-        
-        # Fallback: use account based on table position (rough heuristic)
-        if table_index < len(all_accounts):
-            return all_accounts[table_index]['account_number']
-        
-        # Last fallback: use the highest confidence account
-        return max(all_accounts, key=lambda x: x['confidence'])['account_number']
+        index = AccountTableIndex.build(all_accounts, tables[:table_index + 1])
+        return index.account_for(table_index)
     
     def parse(self, tables, all_accounts=None):
         """
@@ -228,18 +218,44 @@ class HeaderBasedTableParser:
             all_accounts: List of account dicts from AccountNumberExtractor (optional)
         """
         all_transactions = []
+        logger.debug("Starting to parse %s tables", len(tables))
+        for batch in self.iter_parse(tables, all_accounts):
+            all_transactions.extend(batch)
+        
+        logger.debug("Total transactions found across all tables: %s", len(all_transactions))
+        
+        return all_transactions
+
+    def iter_parse(self, tables, all_accounts=None):
+        """
+        Parse tables one at a time and yield a list of transactions per table.
+
+        tables may be any iterable (e.g. tables still arriving from a background
+        extractor). Each table's last transaction is held back until the next
+        table has been parsed, since a continuation row at the top of the next
+        page can still extend its narration.
+        """
         global_header_mapping = None  # Share header across tables
+        self._last_txn = None  # continuation rows may spill onto the next page's table
+        account_index = AccountTableIndex(all_accounts) if all_accounts else None
+        held = []
+        previous_account = None
         
-        if self.debug:
-            print(f"🚀 Starting to parse {len(tables)} tables")
-            if all_accounts:
-                print(f"🏦 Available accounts: {[acc['account_number'] for acc in all_accounts]}")
+        if all_accounts and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Available accounts: %s", [acc['account_number'] for acc in all_accounts])
         
         for table_idx, table in enumerate(tables):
             # Determine which account this table belongs to
             current_account = None
-            if all_accounts:
-                current_account = self.find_account_for_table(table_idx, all_accounts, tables)
+            if account_index is not None:
+                account_index.add(table)
+                current_account = account_index.account_for(table_idx)
+            if current_account is not None and current_account != previous_account:
+                # a new account section never continues the previous account's narration;
+                # tables with no account of their own still follow the one before them
+                if previous_account is not None:
+                    self._last_txn = None
+                previous_account = current_account
             
             # Try to find header in this table, or reuse global header
             table_transactions, found_header = self.parse_single_table(
@@ -249,15 +265,14 @@ class HeaderBasedTableParser:
             # If we found a header in this table, save it for future tables
             if found_header:
                 global_header_mapping = found_header
-                if self.debug:
-                    print(f"📋 Saved header mapping for subsequent tables: {global_header_mapping}")
+                logger.debug("Saved header mapping for subsequent tables: %s", global_header_mapping)
             
-            all_transactions.extend(table_transactions)
-        
-        if self.debug:
-            print(f"🎯 Total transactions found across all tables: {len(all_transactions)}")
+            if table_transactions:
+                yield held + table_transactions[:-1]
+                held = table_transactions[-1:]
         
-        return all_transactions
+        if held:
+            yield held
 
     # Patch HeaderBasedTableParser class
     def _extract_transaction_smart(self, row, header_mapping, column_analysis):
@@ -351,11 +366,14 @@ class HeaderBasedTableParser:
         
         return analysis
 
+    def _is_account_section_row(self, row):
+        return bool(row) and len(row) > 0 and str(row[0]).strip().lower() == 'account number'
+
     def _has_nested_account_structure(self, rows):
         """Detect if table has nested account structure (multiple 'Account Number' rows)"""
         account_count = 0
         for row in rows[:20]:  # Check first 20 rows
-            if row and len(row) > 0 and str(row[0]).strip().lower() == 'account number':
+            if self._is_account_section_row(row):
                 account_count += 1
         return account_count > 1
 
@@ -369,95 +387,72 @@ class HeaderBasedTableParser:
         match = re.search(r'(\d{10,})', account_cell)
         return match.group(1) if match else None
 
+    def _cached_header_mapping(self, compressed):
+        """map_headers keyed by the row's column signature; sections repeat the same header"""
+        signature = tuple(str(cell) if cell else "" for cell in compressed)
+        mapping = self._header_cache.get(signature)
+        if mapping is None:
+            if len(self._header_cache) >= HEADER_CACHE_SIZE:
+                self._header_cache.clear()
+            mapping = self._header_cache[signature] = self.map_headers(compressed)
+        return mapping
+
+    def _account_sections(self, rows):
+        """(account_number, start, end) row spans, found in one scan of the table"""
+        starts = [i for i, row in enumerate(rows) if self._is_account_section_row(row)]
+        for n, start in enumerate(starts):
+            end = starts[n + 1] if n + 1 < len(starts) else len(rows)
+            yield self._extract_account_number_from_row(rows[start]), start + 1, end
+
+    def _iter_nested_account_table(self, rows, table_index):
+        """Yield transactions from a table with nested account structure, section by section"""
+        logger.debug("Parsing nested account table %s", table_index)
+        for account_num, start, end in self._account_sections(rows):
+            logger.debug("Found account section: %s", account_num)
+            self._last_txn = None  # never stitch across account sections
+            header_mapping = {}
+
+            for current_row in rows[start:end]:
+                compressed = self.compress_row(current_row)
+                if not compressed or len(compressed) < 3:
+                    continue
+
+                # Header is the first row in the section that maps to a transaction header
+                if not header_mapping:
+                    test_mapping = self._cached_header_mapping(compressed)
+                    if self.is_transaction_header(test_mapping):
+                        header_mapping = test_mapping
+                        logger.debug("Found header: %s", header_mapping)
+                    continue
+
+                # Skip opening/closing balance rows
+                if (compressed[0] == '' and 'balance' in str(compressed[1]).lower()) or \
+                'closing balance' in str(compressed[0]).lower():
+                    log_row(logger, "Skipping balance row: %s", compressed)
+                    continue
+
+                # Build transaction
+                txn = {}
+                for field, index in header_mapping.items():
+                    txn[field] = self.normalize_cell(current_row[index]) if index < len(current_row) else None
+                log_row(logger, "Nested row %s -> %s (header %s)", current_row, txn, header_mapping)
+
+                if self._stitch(txn):
+                    continue
+
+                # Add account number
+                txn['account_number'] = account_num
+
+                # Validate transaction (must have date and at least one amount field)
+                has_date = bool(txn.get('txn_date'))
+                has_desc = bool(txn.get('description'))
+                has_amount = bool(txn.get('amount') or txn.get('debit') or txn.get('credit'))
+
+                if has_date and has_desc and has_amount:
+                    self._last_txn = txn
+                    yield txn
+
     def _parse_nested_account_table(self, rows, table_index):
         """Parse table with nested account structure"""
-        all_transactions = []
-        
-        if self.debug:
-            print(f"Parsing nested account table {table_index}")
-        
-        i = 0
-        while i < len(rows):
-            row = rows[i]
-            
-            # Look for account number row
-            if (row and len(row) > 0 and 
-                str(row[0]).strip().lower() == 'account number'):
-                
-                # Extract account number
-                account_num = self._extract_account_number_from_row(row)
-                if self.debug:
-                    print(f"Found account section: {account_num}")
-                
-                # Look for header row (should be next row)
-                i += 1
-                header_row = None
-                header_mapping = {}
-                
-                while i < len(rows):
-                    current_row = rows[i]
-                    compressed = self.compress_row(current_row)
-                    
-                    # Stop if we hit another account section
-                    if (current_row and len(current_row) > 0 and 
-                        str(current_row[0]).strip().lower() == 'account number'):
-                        break
-                    
-                    # Look for header row
-                    if not header_mapping and compressed and len(compressed) >= 3:
-                        test_mapping = self.map_headers(compressed)
-                        has_amount = "amount" in test_mapping
-                        has_debit_credit = "debit" in test_mapping and "credit" in test_mapping
-                        REQUIRED_FIELDS = {"txn_date", "description"}
-                        
-                        if REQUIRED_FIELDS.issubset(test_mapping.keys()) and (has_amount or has_debit_credit):
-                            header_mapping = test_mapping
-                            if self.debug:
-                                print(f"  Found header: {header_mapping}")
-                            i += 1
-                            continue
-                    
-                    # Process transaction rows
-                    if header_mapping and compressed and len(compressed) >= 3:
-                        # Skip opening/closing balance rows
-                        if (compressed[0] == '' and 'balance' in str(compressed[1]).lower()) or \
-                        'closing balance' in str(compressed[0]).lower():
-                            if self.debug:
-                                print(f"  Skipping balance row: {compressed}")
-                            i += 1
-                            continue
-                        
-                        # Build transaction
-                        txn = {}
-                        print(f"DEBUG Transaction extraction:")
-                        print(f"  Original row: {current_row}")
-                        print(f"  Compressed row: {compressed}")
-                        print(f"  Header mapping: {header_mapping}")
-                        for field, index in header_mapping.items():
-                            # if index < len(compressed):
-                                # txn[field] = self.normalize_cell(compressed[index])
-                            if index < len(current_row):
-                                txn[field] = self.normalize_cell(current_row[index])
-                                
-                            else:
-                                txn[field] = None
-                        
-                        # Add account number
-                        txn['account_number'] = account_num
-                        
-                        # Validate transaction (must have date and at least one amount field)
-                        has_date = bool(txn.get('txn_date'))
-                        has_desc = bool(txn.get('description'))
-                        has_amount = bool(txn.get('amount') or txn.get('debit') or txn.get('credit'))
-                        
-                        if has_date and has_desc and has_amount:
-                            all_transactions.append(txn)
-                            if self.debug:
-                                print(f"  Added transaction: {txn}")
-                    
-                    i += 1
-            else:
-                i += 1
-        
-        return all_transactions
+        return list(self._iter_nested_account_table(rows, table_index))
         
\ No newline at end of file
@@ -0,0 +1,606 @@
+import os
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+from datetime import datetime
+from itertools import chain, islice
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from src.PDFTextExtractor import (
+    PDFTextExtractor, DEFAULT_TABLE_BACKEND,
+    select_table_backend, get_table_extractor, extract_backend_tables_shared,
+)
+from src.OCRExtractor import OCRTextExtractor
+from src.ExcelExtractor.ExcelExtractor import ExcelExtractor
+from src.CSVExtractor import CSVExtractor, DEFAULT_CHUNK_ROWS
+from src.Profile.name_extractor import NameExtractor
+from src.Profile.address_extractor import AddressExtractor
+from src.HeaderParser import HeaderBasedTableParser
+from src.SchemaNormalizer import SchemaNormalizer
+from src.Graphs.dag_executor import DAGExecutor
+from src.Nodes.profile_nodes import build_profile_graph
+from src.ColumnarWriter import ColumnarWriter, COLUMNAR_FORMATS
+from src.Serializer import JSONSerializer, NDJSONWriter
+from src.assembler import BankStatementAssembler
+from src.AccountIndex import split_by_account
+from src.TableTransport import unshare_tables
+
+logger = logging.getLogger(__name__)
+
+# File suffix -> input format; excel and csv share the spreadsheet pipeline
+INPUT_FORMATS = {".pdf": "pdf", ".xls": "excel", ".xlsx": "excel", ".csv": "csv"}
+OUTPUT_FORMATS = ("json", "ndjson", *COLUMNAR_FORMATS)
+
+
+def detect_format(path) -> Optional[str]:
+    """Input format for a file from its suffix, None when unsupported."""
+    return INPUT_FORMATS.get(Path(path).suffix.lower())
+
+
+def collect_inputs(input_path: Path, formats: Optional[Iterable[str]] = None) -> List[Path]:
+    """
+    The supported statement files at input_path (a file or a directory,
+    not recursive), sorted by name. formats limits the result, e.g. ("excel",).
+    """
+    wanted = set(formats or INPUT_FORMATS.values())
+    if input_path.is_file():
+        candidates = [input_path]
+    else:
+        candidates = sorted(p for p in input_path.iterdir() if p.is_file())
+    return [p for p in candidates if detect_format(p) in wanted]
+
+
+def make_writer(output_dir: Path, fmt: str = "json", serializer: JSONSerializer = None):
+    """Per-file writer for --format; None for the default single JSON file."""
+    if fmt == "json":
+        return None
+    if fmt == "ndjson":
+        return NDJSONWriter(output_dir, serializer)
+    if fmt in COLUMNAR_FORMATS:
+        return ColumnarWriter(output_dir, fmt=fmt, dataset_dir=output_dir / "transactions",
+                              serializer=serializer)
+    raise ValueError(f"Unknown output format '{fmt}'. Choose from: {', '.join(OUTPUT_FORMATS)}")
+
+
+def is_valid_transaction(txn: Dict[str, Any]) -> bool:
+    """
+    A transaction is valid if it has EITHER:
+    - An amount (non-zero, non-empty)
+    - OR a meaningful narration with some date info
+    """
+    has_amount = (txn.get('amount') and
+                 str(txn.get('amount')).strip() not in ['', '0', '0.0'])
+
+    has_meaningful_narration = (txn.get('narration') and
+                              len(str(txn.get('narration')).strip()) > 10)
+
+    has_date = (txn.get('valueDate') and str(txn.get('valueDate')).strip())
+
+    # Keep transaction if it has amount OR (narration and date)
+    return bool(has_amount or (has_meaningful_narration and has_date))
+
+
+def iter_pipeline(filename: str,
+                  file_type: str,
+                  raw_pages: List[Dict[str, Any]],
+                  head_tables: Union[List[Dict[str, Any]], Future],
+                  tables: Iterable[Dict[str, Any]],
+                  name_extractor: NameExtractor,
+                  addr_extractor: AddressExtractor,
+                  executor: DAGExecutor,
+                  parser: HeaderBasedTableParser = None,
+                  output_dir: Path = None,
+                  debug: bool = False,
+                  writer=None,
+                  serializer: JSONSerializer = None,
+                  statements: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Everything after extraction, shared by every input format: profile graph
+    on raw_pages + head_tables, then parse / normalize / filter `tables` and
+    write the outputs. head_tables may be a Future (text-only profile nodes
+    start without it); tables may be lazy and is only consumed after the
+    profile and summary events. Yields the iter_process_pdf events.
+    """
+    # 2) run extractors: profile fields as a dependency graph
+    profile_futures = executor.submit(build_profile_graph(), {
+        "raw_pages": raw_pages,
+        "tables": head_tables,
+        "name_extractor": name_extractor,
+        "addr_extractor": addr_extractor,
+        "debug": debug,
+    })
+    profile = profile_futures["profile"].result()
+    yield {"event": "profile", "file": filename, "data": profile}
+    summary_res = profile_futures["summary_res"].result()
+    yield {"event": "summary", "file": filename, "data": summary_res}
+    profile_account_numbers = profile["maskedAccNumber"]
+    # scored account list, used to route each table to its account
+    all_accounts = profile_futures["acct_res"].result()
+
+    # 3) parse + normalize + filter, one batch per table
+    if parser is None:
+        parser = HeaderBasedTableParser(debug=debug)
+    normalizer = SchemaNormalizer()
+    assembler = BankStatementAssembler() if statements else None
+    doc_name = os.path.splitext(filename)[0]
+    # ndjson: transactions go to disk batch by batch instead of at the end
+    txn_stream = writer.open_transactions(doc_name) if output_dir and isinstance(writer, NDJSONWriter) else None
+    total_found = 0
+    valid_transactions = []
+    account_counts = {}
+    try:
+        for batch_no, raw_batch in enumerate(parser.iter_parse(tables, all_accounts)):
+            normalized = normalizer.normalize_transactions(raw_batch, profile_accounts=profile_account_numbers)
+            total_found += len(normalized)
+            valid_batch = [txn for txn in normalized if is_valid_transaction(txn)]
+            valid_transactions.extend(valid_batch)
+            if txn_stream is not None:
+                txn_stream.write(valid_batch)
+            if assembler is not None:
+                assembler.extend(valid_batch)
+            # one event per account so consumers get per-account transaction streams
+            for account, account_batch in split_by_account(valid_batch).items():
+                account_counts[account] = account_counts.get(account, 0) + len(account_batch)
+                yield {"event": "transactions", "file": filename, "batch": batch_no,
+                       "account": account, "data": account_batch}
+    except BaseException:
+        if txn_stream is not None:
+            txn_stream.close()
+        raise
+
+    logger.info("Valid transactions after filtering: %s (from %s total)", len(valid_transactions), total_found)
+
+    # 4) Create simplified JSON structure (only what you need)
+
+    # Complete document structure (simplified)
+    document_data = {
+        "document_info": {
+            "filename": filename,
+            "file_type": file_type,
+            "processed_at": datetime.now().isoformat(),
+            "total_transactions_found": total_found,
+            "valid_transactions_count": len(valid_transactions),
+            "transactions_per_account": account_counts
+        },
+        "profile": profile,
+        "transactions": valid_transactions,  # Only valid transactions, only SchemaNormalizer fields
+        "summary": summary_res
+    }
+
+    # 5) Export individual JSON file
+    if output_dir and writer is not None:
+        # ndjson / columnar: transactions file + small profile/summary JSON
+        if txn_stream is not None:
+            written = writer.write(doc_name, document_data, transactions=txn_stream)
+        else:
+            written = writer.write(doc_name, document_data)
+        json_path = Path(written["json"])
+        logger.info("Exported: %s + %s", json_path, Path(written['transactions']).name)
+    elif output_dir:
+        json_filename = f"{doc_name}_analysis.json"
+        json_path = output_dir / json_filename
+
+        (serializer or JSONSerializer()).dump(document_data, json_path)
+        logger.info("Exported: %s", json_path)
+
+    # BankStatement documents (one per account) built while parsing
+    statement_paths = []
+    if output_dir and assembler is not None:
+        documents = assembler.build(profile, summary_res)
+        for doc in documents:
+            account = doc.transactionsMeta.maskedAccNumber
+            suffix = f"_{account}" if account and len(documents) > 1 else ""
+            path = output_dir / f"{doc_name}{suffix}_statement.json"
+            statement_paths.append(str((serializer or JSONSerializer()).dump_model(doc, path)))
+        logger.info("Exported %s BankStatement document(s)", len(statement_paths))
+
+    # 6) Return summary for batch processing
+    yield {"event": "done", "file": filename, "data": {
+        "file": filename,
+        "file_type": file_type,
+        "profile": profile,
+        "transaction_count": len(valid_transactions),  # Only valid ones
+        "summary": summary_res,
+        "json_exported": str(json_path) if output_dir else None,
+        "statements_exported": statement_paths
+    }}
+
+
+def iter_process_pdf(pdf_path: str,
+                     name_extractor: NameExtractor,
+                     addr_extractor: AddressExtractor,
+                     first_n_pages: int = 3,
+                     output_dir: Path = None,
+                     password: str = None,
+                     debug: bool = False,
+                     ocr: bool = False,
+                     ocr_workers: int = None,
+                     ocr_cache: str = None,
+                     ocr_roi: bool = False,
+                     table_backend: str = DEFAULT_TABLE_BACKEND,
+                     executor: DAGExecutor = None,
+                     table_pool: ProcessPoolExecutor = None,
+                     writer=None,
+                     serializer: JSONSerializer = None,
+                     statements: bool = False,
+                     parser: HeaderBasedTableParser = None) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming version of process_pdf. Yields events in order:
+      {"event": "profile", "file", "data": profile}
+      {"event": "summary", "file", "data": summary}
+      {"event": "transactions", "file", "batch": n, "account", "data": [valid txns]}  (zero or more;
+          one per table batch and maskedAccNumber, "" for unassigned rows)
+      {"event": "done", "file", "data": <process_pdf result>}
+    or a single {"event": "error", "file", "data": {"file", "error"}} once something fails.
+    Tables are extracted on background threads (or table_pool): the profile
+    and summary events come once the profile graph is done with the first
+    pages' text and tables, while the remaining pages are still being
+    extracted; those are only waited for when transactions are parsed.
+    """
+    filename = os.path.basename(pdf_path)
+    own_executor = executor is None
+    tables_future = None
+    table_threads = None
+    try:
+        # 1) raw text (first N pages) + tables
+        text_extractor = PDFTextExtractor(pdf_path,password=password)
+        all_pages = text_extractor.extractor()
+        raw_pages = all_pages[:first_n_pages]
+
+        # Pages without a usable text layer (scanned statements) go through OCR
+        if ocr:
+            ocr_extractor = OCRTextExtractor(
+                pdf_path, password=password, max_workers=ocr_workers, cache_path=ocr_cache
+            )
+            if ocr_roi:
+                # Profile fields only need the header block of the pages the profile reads
+                raw_pages = ocr_extractor.extract_profile_header(raw_pages, [p["page_no"] for p in raw_pages])
+            else:
+                raw_pages = ocr_extractor.fill_scanned_pages(raw_pages)
+
+        backend = select_table_backend(all_pages, table_backend)
+        logger.debug("Table backend: %s", backend)
+        table_extractor = get_table_extractor(backend, pdf_path, password=password)
+
+        scanned_pages = text_extractor.scanned_pages(all_pages) if ocr else {}
+
+        def ocr_tables(pages):
+            # Scanned pages have no tables for pdfplumber; rebuild them from OCR word boxes
+            scanned = {p: t for p, t in scanned_pages.items() if p in pages}
+            if not scanned:
+                return []
+            # ROI mode crops only the profile header pass; table pages stay
+            # full height (rows start at the top of page 2..N), at body DPI
+            return ocr_extractor.extract_tables(scanned, dpi_key="body" if ocr_roi else None)
+
+        def with_ocr_tables(tables, extra):
+            return sorted(tables + extra, key=lambda t: t["page_number"]) if extra else tables
+
+        # Profile extractors only look at the first pages' tables: extract those
+        # here and every other page in a background worker, joined at the end.
+        head_pages = [p["page_no"] for p in all_pages[:first_n_pages]]
+        tail_pages = [p["page_no"] for p in all_pages[first_n_pages:]]
+        # Backends that learn from earlier pages re-extract the whole document
+        background_pages = tail_pages if table_extractor.page_independent else None
+
+        if own_executor:
+            executor = DAGExecutor(max_workers=1, debug=debug)
+
+        # Table extraction gets its own threads: queued on the DAG executor it
+        # would hold a worker the profile graph needs (with one worker the
+        # profile waited for every tail page)
+        table_threads = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tables")
+        # Text-based profile nodes start right away; the rest wait on this Future.
+        # The head pages' OCR tables are kept for the whole-document pass below.
+        head_ocr: List[Dict[str, Any]] = []
+
+        def head_tables():
+            head_ocr.extend(ocr_tables(head_pages))
+            return with_ocr_tables(table_extractor.extract_tables(head_pages), head_ocr)
+
+        head_future = table_threads.submit(head_tables)
+        tables_future = None
+        if tail_pages or background_pages is None:
+            if table_pool is not None:
+                # Packed transport: no pickling of per-cell strings between processes
+                tables_future = table_pool.submit(
+                    extract_backend_tables_shared, backend, pdf_path, password, background_pages
+                )
+            else:
+                tables_future = table_threads.submit(table_extractor.extract_tables, background_pages)
+
+        def background_tables():
+            nonlocal tables_future
+            future, tables_future = tables_future, None
+            return unshare_tables(future.result()) if table_pool is not None else future.result()
+
+        def iter_tables():
+            # Head tables are parsed while the background worker is still busy
+            if background_pages is None and tables_future is not None:
+                # The backend re-reads the head pages; their OCR is not redone
+                tables = background_tables()
+                head_future.result()
+                yield from with_ocr_tables(tables, head_ocr + ocr_tables(tail_pages))
+                return
+            yield from head_future.result()
+            if tables_future is not None:
+                yield from with_ocr_tables(background_tables(), ocr_tables(tail_pages))
+
+        yield from iter_pipeline(filename, "pdf", raw_pages, head_future, iter_tables(),
+                                 name_extractor, addr_extractor, executor, parser=parser,
+                                 output_dir=output_dir, debug=debug, writer=writer,
+                                 serializer=serializer, statements=statements)
+
+    except Exception as e:
+        logger.debug("Failed to process %s", filename, exc_info=True)
+        yield {"event": "error", "file": filename, "data": {
+            "file": filename,
+            "error": str(e),
+        }}
+    finally:
+        if table_pool is not None and tables_future is not None:
+            # Never consumed (error or early close): free the worker's shared memory
+            tables_future.add_done_callback(_discard_shared_tables)
+        if table_threads is not None:
+            # Early close: let a running extraction finish on its own
+            table_threads.shutdown(wait=False)
+        if own_executor and executor is not None:
+            executor.shutdown()
+
+
+def _discard_shared_tables(future) -> None:
+    try:
+        unshare_tables(future.result())
+    except Exception:
+        logger.debug("Could not release background tables", exc_info=True)
+
+
+def iter_process_spreadsheet(path: str,
+                             name_extractor: NameExtractor,
+                             addr_extractor: AddressExtractor,
+                             first_n_pages: int = 3,
+                             output_dir: Path = None,
+                             password: str = None,
+                             debug: bool = False,
+                             executor: DAGExecutor = None,
+                             writer=None,
+                             serializer: JSONSerializer = None,
+                             statements: bool = False,
+                             parser: HeaderBasedTableParser = None,
+                             csv_chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Dict[str, Any]]:
+    """
+    iter_process_pdf for .xls / .xlsx / .csv. Workbooks: each sheet is one
+    text page and one table, first_n_pages sheets go to the profile
+    extractors; encrypted workbooks are decrypted in memory with password.
+    CSV: streamed csv_chunk_rows rows per table, the profile sees the first
+    chunk. Same events as iter_process_pdf.
+    """
+    filename = os.path.basename(path)
+    own_executor = executor is None
+    try:
+        if detect_format(path) == "csv":
+            extractor = CSVExtractor(path, chunk_rows=csv_chunk_rows, parser=parser)
+            chunks = extractor.iter_tables()
+            head_tables = list(islice(chunks, 1))
+            tables = chain(head_tables, chunks)
+        else:
+            extractor = ExcelExtractor(path, password=password)
+            head_tables = tables = extractor.extract_tables()
+            logger.debug("Extracted %s tables", len(tables))
+        raw_pages = extractor.extract_text_pages(max_sheets=first_n_pages)
+
+        if own_executor:
+            executor = DAGExecutor(max_workers=1, debug=debug)
+        yield from iter_pipeline(filename, detect_format(path) or "excel", raw_pages, head_tables, tables,
+                                 name_extractor, addr_extractor, executor, parser=parser,
+                                 output_dir=output_dir, debug=debug, writer=writer,
+                                 serializer=serializer, statements=statements)
+
+    except Exception as e:
+        logger.debug("Failed to process %s", filename, exc_info=True)
+        yield {"event": "error", "file": filename, "data": {
+            "file": filename,
+            "error": str(e),
+        }}
+    finally:
+        if own_executor and executor is not None:
+            executor.shutdown()
+
+
+def process_pdf(pdf_path: str,
+                name_extractor: NameExtractor,
+                addr_extractor: AddressExtractor,
+                first_n_pages: int = 3,
+                output_dir: Path = None,
+                password: str = None,
+                debug: bool = False,
+                ocr: bool = False,
+                ocr_workers: int = None,
+                ocr_cache: str = None,
+                ocr_roi: bool = False,
+                table_backend: str = DEFAULT_TABLE_BACKEND,
+                executor: DAGExecutor = None,
+                table_pool: ProcessPoolExecutor = None,
+                writer=None,
+                serializer: JSONSerializer = None,
+                statements: bool = False,
+                on_event: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:  # Added debug parameter
+    """
+    Extract text + tables, then run Name & Address extractors.
+    Returns a small dict with per-file results and exports detailed JSON.
+    writer: optional NDJSONWriter / ColumnarWriter instead of one JSON file.
+    serializer: JSONSerializer for the JSON output (default: orjson if installed, indented).
+    statements: also write src.models.BankStatement documents, one per account.
+    on_event: optional callback receiving every iter_process_pdf event as it happens.
+    """
+    return _drain(iter_process_pdf(pdf_path, name_extractor, addr_extractor,
+                                   first_n_pages=first_n_pages, output_dir=output_dir,
+                                   password=password, debug=debug, ocr=ocr,
+                                   ocr_workers=ocr_workers, ocr_cache=ocr_cache, ocr_roi=ocr_roi,
+                                   table_backend=table_backend, executor=executor,
+                                   table_pool=table_pool, writer=writer,
+                                   serializer=serializer, statements=statements), on_event)
+
+
+def _drain(events: Iterator[Dict[str, Any]],
+           on_event: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:
+    result = None
+    for event in events:
+        if on_event is not None:
+            on_event(event)
+        if event["event"] in ("done", "error"):
+            result = event["data"]
+    return result
+
+
+class IngestionRunner:
+    """
+    Batch runner for every supported input format. Each file is dispatched
+    on its suffix (INPUT_FORMATS) to iter_process_pdf or
+    iter_process_spreadsheet; all of them share one DAGExecutor, table
+    process pool, header parser (and its header-mapping cache), OCR cache,
+    serializer and output writer for the whole batch.
+
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self,
+                 output_dir: Optional[Path] = None,
+                 first_n_pages: int = 3,
+                 password: Optional[str] = None,
+                 debug: bool = False,
+                 output_format: str = "json",
+                 serializer: Optional[JSONSerializer] = None,
+                 statements: bool = False,
+                 profile_workers: int = 4,
+                 profile_processes: int = 0,
+                 table_workers: int = 1,
+                 ocr: bool = False,
+                 ocr_workers: Optional[int] = None,
+                 ocr_cache: Optional[str] = None,
+                 ocr_roi: bool = False,
+                 table_backend: str = DEFAULT_TABLE_BACKEND,
+                 csv_chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 name_extractor: Optional[NameExtractor] = None,
+                 addr_extractor: Optional[AddressExtractor] = None):
+        self.output_dir = output_dir
+        self.first_n_pages = first_n_pages
+        self.password = password
+        self.debug = debug
+        self.statements = statements
+        self.csv_chunk_rows = csv_chunk_rows
+        self.pdf_options = {
+            "ocr": ocr,
+            "ocr_workers": ocr_workers,
+            "ocr_cache": ocr_cache,
+            "ocr_roi": ocr_roi,
+            "table_backend": table_backend,
+        }
+        self.name_extractor = name_extractor or NameExtractor(debug=debug)
+        self.addr_extractor = addr_extractor or AddressExtractor(debug=debug)
+        self.serializer = serializer or JSONSerializer()
+        self.writer = make_writer(output_dir, output_format, self.serializer) if output_dir else None
+        self.parser = HeaderBasedTableParser(debug=debug)
+        # One executor for the whole batch so pools are not re-created per file
+        self.executor = DAGExecutor(max_workers=profile_workers,
+                                    process_workers=profile_processes, debug=debug)
+        self.table_pool = ProcessPoolExecutor(max_workers=table_workers) if table_workers else None
+
+    def __enter__(self) -> "IngestionRunner":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.table_pool is not None:
+            self.table_pool.shutdown()
+            self.table_pool = None
+        self.executor.shutdown()
+
+    def iter_process(self, path) -> Iterator[Dict[str, Any]]:
+        """iter_process_pdf events for any supported file."""
+        path = str(path)
+        fmt = detect_format(path)
+        common = {
+            "first_n_pages": self.first_n_pages,
+            "output_dir": self.output_dir,
+            "password": self.password,
+            "debug": self.debug,
+            "executor": self.executor,
+            "writer": self.writer,
+            "serializer": self.serializer,
+            "statements": self.statements,
+            "parser": self.parser,
+        }
+        if fmt == "pdf":
+            return iter_process_pdf(path, self.name_extractor, self.addr_extractor,
+                                    table_pool=self.table_pool, **common, **self.pdf_options)
+        if fmt in ("excel", "csv"):
+            return iter_process_spreadsheet(path, self.name_extractor, self.addr_extractor,
+                                            csv_chunk_rows=self.csv_chunk_rows, **common)
+        filename = os.path.basename(path)
+        return iter([{"event": "error", "file": filename, "data": {
+            "file": filename,
+            "error": f"Unsupported file type: {Path(path).suffix or filename}",
+        }}])
+
+    def process(self, path, on_event: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:
+        """Run one file; returns its batch result ("done" or "error" data)."""
+        return _drain(self.iter_process(path), on_event)
+
+    def run(self, paths: Iterable, on_event: Callable[[Dict[str, Any]], None] = None) -> List[Dict[str, Any]]:
+        results = []
+        for path in paths:
+            logger.info("Processing: %s", Path(path).name)
+            results.append(self.process(path, on_event))
+        return results
+
+
+def print_batch_summary(results: List[Dict[str, Any]], title: str = "BATCH PROCESSING SUMMARY") -> None:
+    # Pretty print summary
+    print("\n" + "="*60)
+    print(title)
+    print("="*60)
+
+    for r in results:
+        if "error" in r:
+            print(f"ERROR {r['file']}: {r['error']}")
+        else:
+            profile = r.get('profile', {})
+            name = profile.get('name', 'N/A')
+            account_type = profile.get('account_type', 'N/A')
+            holder_type = profile.get('type', 'N/A')
+            nominee = profile.get('nominee', 'N/A')
+            accounts = profile.get('maskedAccNumber', [])
+
+            print(f"SUCCESS {r['file']}:")
+            print(f"  Name: {name}")
+            print(f"  Account Type: {account_type}")
+            print(f"  Type: {holder_type}")
+            print(f"  Nominee: {nominee}")
+            print(f"  Accounts: {len(accounts)} found")
+            if accounts:
+                for acc in accounts:  # Show ALL accounts
+                    print(f"    - {acc}")
+            print(f"  Valid Transactions: {r.get('transaction_count', 0)}")
+            if r.get('json_exported'):
+                print(f"  Exported: {Path(r['json_exported']).name}")
+
+
+def batch_summary(results: List[Dict[str, Any]], input_path: Path, output_dir: Path,
+                  **processing_info) -> Dict[str, Any]:
+    """Batch summary JSON; processing_info adds fields such as total_pdfs."""
+    success_count = sum(1 for r in results if "error" not in r)
+    return {
+        "processing_info": {
+            "processed_at": datetime.now().isoformat(),
+            "input_directory": str(input_path),
+            "output_directory": str(output_dir),
+            **processing_info,
+            "successful": success_count,
+            "failed": len(results) - success_count
+        },
+        "total_valid_transactions": sum(r.get('transaction_count', 0) for r in results if "error" not in r),
+        "results": results
+    }
@@ -0,0 +1,117 @@
+import json
+import logging
+import sys
+import threading
+from typing import Dict, Iterable, Optional, Union
+
+# Loggers configured by default: every module under src/ logs to "src.<module>"
+PACKAGE_LOGGERS = ("src",)
+TEXT_FORMAT = "%(levelname)s %(name)s: %(message)s"
+DEFAULT_SAMPLE_EVERY = 100
+
+# Attributes every LogRecord has; anything else came in through extra={...}
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class SampleFilter(logging.Filter):
+    """
+    Keep one in every `every` records logged with extra={"sample": True}
+    (see log_row), counted per logger and message template. Other records
+    always pass.
+    """
+
+    def __init__(self, every: int = DEFAULT_SAMPLE_EVERY):
+        super().__init__()
+        self.every = max(1, int(every))
+        self._counts: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.every == 1 or not getattr(record, "sample", False):
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            seen = self._counts.get(key, 0)
+            self._counts[key] = seen + 1
+        return seen % self.every == 0
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, message plus any extra={...} fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key != "sample":
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def log_row(logger: logging.Logger, msg: str, *args) -> None:
+    """DEBUG event for a per-row message; sampled by SampleFilter, free when DEBUG is off."""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(msg, *args, extra={"sample": True})
+
+
+def parse_module_levels(specs: Optional[Iterable[str]]) -> Dict[str, str]:
+    """["src.HeaderParser=DEBUG", "src.Profile=info"] -> {"src.HeaderParser": "DEBUG", ...}"""
+    levels = {}
+    for spec in specs or []:
+        for item in spec.split(","):
+            if not item.strip():
+                continue
+            name, sep, level = item.partition("=")
+            if not sep or not name.strip():
+                raise ValueError(f"Invalid module level '{item}', expected <logger>=<LEVEL>")
+            level = level.strip().upper()
+            if not isinstance(logging.getLevelName(level), int):
+                raise ValueError(f"Unknown log level '{level}' for {name.strip()}")
+            levels[name.strip()] = level
+    return levels
+
+
+def configure_logging(level: Union[int, str] = "INFO",
+                      module_levels: Optional[Dict[str, Union[int, str]]] = None,
+                      json_path: Optional[str] = None,
+                      sample_every: int = DEFAULT_SAMPLE_EVERY,
+                      loggers: Iterable[str] = PACKAGE_LOGGERS,
+                      stream=None) -> None:
+    """
+    Set up the package loggers: text to stderr, optionally JSON lines to
+    json_path, per-row events sampled, and per-module level overrides.
+    Only the given logger trees are touched, so third-party libraries
+    (pdfminer, PIL, ...) stay at their own levels. Safe to call again.
+    """
+    if isinstance(level, str):
+        level = level.upper()
+    handlers = []
+    text_handler = logging.StreamHandler(stream or sys.stderr)
+    text_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    handlers.append(text_handler)
+    if json_path:
+        json_handler = logging.FileHandler(json_path, encoding="utf-8")
+        json_handler.setFormatter(JSONFormatter())
+        handlers.append(json_handler)
+    for handler in handlers:
+        handler.addFilter(SampleFilter(sample_every))
+        handler._from_configure_logging = True
+
+    for name in loggers:
+        logger = logging.getLogger(name)
+        for old in [h for h in logger.handlers if getattr(h, "_from_configure_logging", False)]:
+            logger.removeHandler(old)
+            old.close()
+        logger.setLevel(level)
+        logger.propagate = False
+        for handler in handlers:
+            logger.addHandler(handler)
+
+    for name, module_level in (module_levels or {}).items():
+        logging.getLogger(name).setLevel(module_level.upper() if isinstance(module_level, str) else module_level)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+
+from src.Graphs.dag_executor import Node
+from src.Profile.name_extractor import NameExtractor
+from src.Profile.address_extractor import AddressExtractor
+from src.Profile.email_extractor import EmailExtractor
+from src.Profile.account_no_extractor import AccountNumberExtractor
+from src.Profile.account_type_extractor import AccountTypeExtractor
+from src.Profile.nominee_extractor import NomineeExtractor
+from src.Profile.type_extractor import TypeExtractor
+from src.Summary.summary_extractor import SummaryExtractor
+
+# Graph inputs: raw_pages, tables (list or Future), name_extractor, addr_extractor, debug.
+# Module-level functions so nodes can be shipped to a process pool.
+
+
+def extract_name(raw_pages, tables, name_extractor: NameExtractor) -> Dict[str, Any]:
+    return name_extractor.extract(raw_pages, tables=tables)
+
+
+def extract_address(raw_pages, tables, addr_extractor: AddressExtractor) -> Dict[str, Any]:
+    return addr_extractor.extract(raw_pages, tables=tables, first_n_pages=2)
+
+
+def extract_email(raw_pages, tables, name_res) -> Dict[str, Any]:
+    return EmailExtractor().extract(raw_pages, tables=tables, name_hint=name_res.get("name"))
+
+
+def extract_accounts(raw_pages, tables) -> List[Dict[str, Any]]:
+    # Extract ALL account numbers
+    return AccountNumberExtractor().extract(
+        raw_pages, tables=tables, first_n_pages=2,
+        skip_promos=True, return_all=True
+    )
+
+
+def extract_account_type(raw_pages, tables, debug) -> Optional[Dict[str, Any]]:
+    return AccountTypeExtractor(debug=debug).extract(raw_pages, tables=tables, first_n_pages=2)
+
+
+def extract_nominee(raw_pages, tables, name_res, debug) -> Optional[Dict[str, Any]]:
+    return NomineeExtractor(debug=debug).extract(
+        raw_pages, tables=tables, first_n_pages=2, name_hint=name_res.get("name")
+    )
+
+
+def extract_type(raw_pages, tables, name_res, debug) -> Optional[Dict[str, Any]]:
+    return TypeExtractor(debug=debug).extract(
+        raw_pages, tables=tables, first_n_pages=2, name_hint=name_res.get("name")
+    )
+
+
+def assemble_profile(name_res, type_res, email_res, addr_res, nominee_res,
+                     account_type_res, acct_res) -> Dict[str, Any]:
+    # Profile data - fixed structure to just store values
+    return {
+        "name": name_res.get("name"),
+        "type": type_res.get("type") if type_res else None,
+        "email": email_res.get("email"),
+        "address": addr_res.get("address"),
+        "nominee": nominee_res.get("nominee") if nominee_res else None,
+        "account_type": account_type_res.get("account_type") if account_type_res else None,
+        "maskedAccNumber": [acc.get("account_number") for acc in acct_res] if acct_res else [],
+    }
+
+
+def extract_summary(raw_pages, tables, profile, debug) -> Dict[str, Any]:
+    return SummaryExtractor(debug=debug).extract(
+        raw_pages, tables=tables, first_n_pages=3, existing_profile=profile
+    )
+
+
+def build_profile_graph() -> List[Node]:
+    """
+    Profile + summary extraction as a DAG. Only email, nominee and type need
+    the name hint; summary needs the assembled profile. The regex-heavy
+    text extractors may run in a process pool.
+
+    "tables" may be a Future. Name, email, account number and the summary
+    (IFSC, MICR, ...) work on the page text and read tables only as a
+    fallback, so they take tables lazily and start before extraction ends.
+    """
+    return [
+        Node("name_res", extract_name, ("raw_pages", "tables", "name_extractor"), process=True,
+             lazy=("tables",)),
+        Node("addr_res", extract_address, ("raw_pages", "tables", "addr_extractor"), process=True),
+        Node("acct_res", extract_accounts, ("raw_pages", "tables"), process=True, lazy=("tables",)),
+        Node("account_type_res", extract_account_type, ("raw_pages", "tables", "debug")),
+        Node("email_res", extract_email, ("raw_pages", "tables", "name_res"), process=True,
+             lazy=("tables",)),
+        Node("nominee_res", extract_nominee, ("raw_pages", "tables", "name_res", "debug")),
+        Node("type_res", extract_type, ("raw_pages", "tables", "name_res", "debug")),
+        Node("profile", assemble_profile, ("name_res", "type_res", "email_res", "addr_res",
+                                           "nominee_res", "account_type_res", "acct_res")),
+        Node("summary_res", extract_summary, ("raw_pages", "tables", "profile", "debug"),
+             lazy=("tables",)),
+    ]
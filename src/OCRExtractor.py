@@ -1,29 +1,413 @@
-from pdf2image import convert_from_path
+import os
+import time
+import sqlite3
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Iterable
+
+import fitz
+import numpy as np
 from PIL import Image
 import pytesseract
 
+from src.PDFTextExtractor import detect_scanned_pages
+from src.WordTableBuilder import WordTableBuilder
+
+
+# DPI used when rasterizing a page, keyed by the page type reported by
+# PDFTextExtractor.classify_page_text. "scanned" pages have no text layer at
+# all; "sparse" pages only carry a stray stamp/page number on top of an image.
+DEFAULT_OCR_DPI = {
+    "scanned": 300,
+    "sparse": 300,
+    # region-of-interest mode: small crisp header crop for profile fields,
+    # cheaper full-height render of the transaction tables
+    "header": 400,
+    "body": 200,
+}
+
+# Vertical page bands (top, bottom) as fractions of the page height. Name,
+# address, account number and IFSC sit in the header block of the first pages.
+# Tables are never cropped: rows start at the top of continuation pages.
+OCR_REGIONS = {
+    "header": (0.0, 0.35),
+}
+
+DEFAULT_OCR_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "structured_json", "ocr_cache.sqlite3"
+)
+
+
+class OCRCache:
+    """
+    Persistent OCR text cache keyed by the hash of the binarized page image.
+    Backed by sqlite so worker processes can share it; least recently used
+    entries are evicted once max_entries is exceeded.
+    """
+
+    def __init__(self, path: str = DEFAULT_OCR_CACHE_PATH, max_entries: int = 5000):
+        self.path = path
+        self.max_entries = max_entries
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_pages ("
+            " key TEXT PRIMARY KEY, text TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ocr_pages_last_used ON ocr_pages (last_used)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        keys = list(set(keys))
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        rows = self._conn.execute(
+            f"SELECT key, text FROM ocr_pages WHERE key IN ({placeholders})", keys
+        ).fetchall()
+        if rows:
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE ocr_pages SET last_used = ? WHERE key = ?",
+                [(now, key) for key, _ in rows],
+            )
+            self._conn.commit()
+        return dict(rows)
+
+    def put(self, key: str, text: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO ocr_pages (key, text, last_used) VALUES (?, ?, ?)",
+            (key, text, time.time()),
+        )
+        # LRU eviction: keep only the max_entries most recently used pages
+        self._conn.execute(
+            "DELETE FROM ocr_pages WHERE key IN ("
+            " SELECT key FROM ocr_pages ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _configure_tesseract(tesseract_cmd: Optional[str]) -> None:
+    cmd = tesseract_cmd or os.environ.get("TESSERACT_CMD")
+    if cmd:
+        pytesseract.pytesseract.tesseract_cmd = cmd
+
+
+def _open_document(pdf_path: str, password: Optional[str]):
+    doc = fitz.open(pdf_path)
+    if password:
+        doc.authenticate(password)
+    return doc
+
+
+def _render_page(doc, page_no: int, dpi: int, threshold: int, region: Optional[str] = None) -> np.ndarray:
+    """
+    Render one page (or one OCR_REGIONS band of it) straight to a grayscale
+    pixmap and binarize it with a vectorized threshold. Only this page's
+    pixels are ever held in memory.
+    """
+    page = doc[page_no - 1]
+    clip = None
+    if region:
+        top, bottom = OCR_REGIONS[region]
+        r = page.rect
+        clip = fitz.Rect(r.x0, r.y0 + top * r.height, r.x1, r.y0 + bottom * r.height)
+    pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False, clip=clip)
+    gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+    bw = (gray >= threshold) * np.uint8(255)  # bool * uint8 stays uint8: no int64 temporary
+    del pix, gray
+    return bw
+
+
+def _page_key(bw: np.ndarray, lang: str) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{bw.shape[0]}x{bw.shape[1]}:{lang}:".encode())
+    h.update(bw.data)
+    return h.hexdigest()
+
+
+def _ocr_array(bw: np.ndarray, lang: str) -> str:
+    img = Image.fromarray(bw)
+    try:
+        return pytesseract.image_to_string(img, lang=lang).strip()
+    finally:
+        img.close()
+
+
+def _ocr_cached(bw: np.ndarray, lang: str, cache: Optional[OCRCache]) -> str:
+    if cache is None:
+        return _ocr_array(bw, lang)
+    key = _page_key(bw, lang)
+    text = cache.get(key)
+    if text is None:
+        text = _ocr_array(bw, lang)
+        cache.put(key, text)
+    return text
+
+
+def _ocr_page(pdf_path: str,
+              password: Optional[str],
+              page_no: int,
+              dpi: int,
+              threshold: int,
+              lang: str,
+              region: Optional[str],
+              tesseract_cmd: Optional[str]) -> Dict[str, Any]:
+    """Rasterize and OCR a single page. Runs inside a worker process."""
+    _configure_tesseract(tesseract_cmd)
+    with _open_document(pdf_path, password) as doc:
+        text = _ocr_array(_render_page(doc, page_no, dpi, threshold, region), lang)
+    return {"page_no": page_no, "text": text}
+
+
+def _pack_image(bw: np.ndarray) -> tuple:
+    # 1 bit per pixel: a binarized page is shipped between processes at 1/8 size
+    return bw.shape, np.packbits(bw == 0)
+
+
+def _unpack_image(packed: tuple) -> np.ndarray:
+    shape, bits = packed
+    black = np.unpackbits(bits, count=shape[0] * shape[1]).reshape(shape)
+    return (black ^ 1) * np.uint8(255)
+
+
+def _render_key(pdf_path: str,
+                password: Optional[str],
+                page_no: int,
+                dpi: int,
+                threshold: int,
+                lang: str,
+                region: Optional[str],
+                cache_path: str,
+                cache_size: int = 5000) -> Dict[str, Any]:
+    """
+    Rasterize a single page and look its hash up in the cache. Runs inside a
+    worker process. Returns {"key", "text"}, plus the packed image on a miss
+    so the page never has to be rendered again for tesseract.
+    """
+    with _open_document(pdf_path, password) as doc:
+        bw = _render_page(doc, page_no, dpi, threshold, region)
+    key = _page_key(bw, lang)
+    cache = OCRCache(cache_path, cache_size)
+    try:
+        text = cache.get(key)
+    finally:
+        cache.close()
+    if text is not None:
+        return {"key": key, "text": text}
+    return {"key": key, "text": None, "image": _pack_image(bw)}
+
+
+def _ocr_packed(packed: tuple, lang: str, tesseract_cmd: Optional[str]) -> str:
+    """OCR an image from _render_key. Runs inside a worker process."""
+    _configure_tesseract(tesseract_cmd)
+    return _ocr_array(_unpack_image(packed), lang)
+
+
+def _ocr_table_page(pdf_path: str,
+                    password: Optional[str],
+                    page_no: int,
+                    dpi: int,
+                    threshold: int,
+                    lang: str,
+                    region: Optional[str],
+                    tesseract_cmd: Optional[str],
+                    min_conf: float = 0.0) -> Dict[str, Any]:
+    """
+    OCR a single page into word boxes and rebuild its table rows.
+    Runs inside a worker process.
+    """
+    _configure_tesseract(tesseract_cmd)
+    with _open_document(pdf_path, password) as doc:
+        bw = _render_page(doc, page_no, dpi, threshold, region)
+    img = Image.fromarray(bw)
+    try:
+        data = pytesseract.image_to_data(img, lang=lang, output_type=pytesseract.Output.DICT)
+    finally:
+        img.close()
+        del bw
+
+    text = np.asarray(data["text"], dtype=object)
+    conf = np.asarray(data["conf"], dtype=np.float64)
+    keep = (conf > min_conf) & np.fromiter((bool(t and t.strip()) for t in text), bool, len(text))
+    left = np.asarray(data["left"], dtype=np.float64)[keep]
+    top = np.asarray(data["top"], dtype=np.float64)[keep]
+    width = np.asarray(data["width"], dtype=np.float64)[keep]
+    height = np.asarray(data["height"], dtype=np.float64)[keep]
+    words = [t.strip() for t in text[keep]]
+
+    rows = WordTableBuilder().build(left, top, left + width, top + height, words)
+    return {"page_number": page_no, "rows": rows}
 
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
 class OCRTextExtractor:
-    def __init__(self, pdf_path: str, password: str = None):
+    def __init__(self,
+                 pdf_path: str,
+                 password: str = None,
+                 tesseract_cmd: Optional[str] = None,
+                 dpi_by_type: Optional[Dict[str, int]] = None,
+                 max_workers: Optional[int] = None,
+                 lang: str = "eng",
+                 cache_path: Optional[str] = None,
+                 cache_size: int = 5000):
         self.pdf_path = pdf_path
         self.password = password
+        self.tesseract_cmd = tesseract_cmd
+        self.dpi_by_type = {**DEFAULT_OCR_DPI, **(dpi_by_type or {})}
+        self.max_workers = max_workers
+        self.lang = lang
+        self.cache_path = cache_path
+        self.cache_size = cache_size
+        self.cache = OCRCache(cache_path, cache_size) if cache_path else None
+        _configure_tesseract(tesseract_cmd)
 
     def extract(self, dpi: int = 300, threshold: int = 128):
-        # Convert each page to an image
-        images = convert_from_path(self.pdf_path, dpi=dpi, userpw=self.password)
-
+        # Render, binarize and OCR one page at a time so peak memory is a single page image
         pages = []
-        for i, img in enumerate(images):
-            # Convert to grayscale
-            gray_img = img.convert('L')
-            # Binarize (black and white) with a threshold
-            bw_img = gray_img.point(lambda x: 0 if x < threshold else 255, '1')
-            text = pytesseract.image_to_string(bw_img, lang='eng')
-            pages.append({
-                "page_number": i + 1,
-                "text": text.strip()
-            })
-
-        return pages
\ No newline at end of file
+        with _open_document(self.pdf_path, self.password) as doc:
+            for i in range(doc.page_count):
+                text = _ocr_cached(_render_page(doc, i + 1, dpi, threshold), self.lang, self.cache)
+                pages.append({
+                    "page_number": i + 1,
+                    "text": text
+                })
+
+        return pages
+
+    def _run(self, fn, jobs):
+        if len(jobs) == 1 or self.max_workers == 1:
+            return [fn(*job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(fn, *zip(*jobs)))
+
+    def _dpi_for(self, page_type: str, region: Optional[str]) -> int:
+        key = region or page_type
+        return self.dpi_by_type.get(key, self.dpi_by_type["scanned"])
+
+    def extract_pages(self,
+                      page_types: Dict[int, str],
+                      threshold: int = 128,
+                      region: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        OCR only the given pages in a process pool.
+
+        page_types: {page_no: page_type}, page_type selects the DPI from dpi_by_type.
+        region: optional OCR_REGIONS band (e.g. "header") to crop to; the
+                band's own DPI from dpi_by_type is used instead.
+        Returns [{"page_no", "text"}] sorted by page number.
+        """
+        if not page_types:
+            return []
+
+        render_jobs = [
+            (self.pdf_path, self.password, page_no,
+             self._dpi_for(page_type, region),
+             threshold, self.lang, region)
+            for page_no, page_type in sorted(page_types.items())
+        ]
+
+        if self.cache is None:
+            results = self._run(_ocr_page, [job + (self.tesseract_cmd,) for job in render_jobs])
+            return sorted(results, key=lambda p: p["page_no"])
+
+        # Render and hash every page first (each page is rendered once), then
+        # OCR one page per unique key, so identical pages (within this
+        # document or already seen in earlier ones) go through tesseract once.
+        rendered = self._run(_render_key, [job + (self.cache_path, self.cache_size) for job in render_jobs])
+        texts = {r["key"]: r["text"] for r in rendered if r["text"] is not None}
+        pending = {}
+        for r in rendered:
+            if r["key"] not in texts:
+                pending.setdefault(r["key"], r.pop("image"))
+            r.pop("image", None)
+        if pending:
+            ocr_texts = self._run(_ocr_packed, [(image, self.lang, self.tesseract_cmd)
+                                                for image in pending.values()])
+            for key, text in zip(pending, ocr_texts):
+                texts[key] = text
+                self.cache.put(key, text)
+
+        return [
+            {"page_no": job[2], "text": texts[r["key"]]}
+            for job, r in zip(render_jobs, rendered)
+        ]
+
+    def extract_tables(self,
+                       page_types: Dict[int, str],
+                       threshold: int = 128,
+                       region: Optional[str] = None,
+                       dpi_key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Recover tables for scanned pages from tesseract word boxes.
+
+        page_types: {page_no: page_type}, as returned by PDFTextExtractor.scanned_pages()
+        dpi_key: dpi_by_type entry to render at instead of the page type's
+                 (e.g. "body" in ROI mode), still at full page height.
+        Returns [{"page_number", "rows"}] like PlumberTableExtractor.extract_tables().
+        """
+        if not page_types:
+            return []
+
+        jobs = [
+            (self.pdf_path, self.password, page_no,
+             self._dpi_for(page_type, dpi_key or region),
+             threshold, self.lang, region, self.tesseract_cmd)
+            for page_no, page_type in sorted(page_types.items())
+        ]
+        tables = self._run(_ocr_table_page, jobs)
+        # same filter as PlumberTableExtractor: header + at least 1 row
+        return [t for t in tables if t["rows"] and len(t["rows"]) > 1]
+
+    def fill_scanned_pages(self,
+                           raw_pages: List[Dict[str, Any]],
+                           pages: Optional[Iterable[int]] = None,
+                           threshold: int = 128,
+                           region: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Replace the text of pages without a usable text layer with OCR output.
+
+        raw_pages: output of PDFTextExtractor.extractor()
+        pages: optional page numbers to restrict OCR to (default: all of raw_pages)
+        region: OCR only this OCR_REGIONS band of each page (e.g. "header")
+        Returns a new list in page order; pages with a text layer are passed through.
+        """
+        page_types = detect_scanned_pages(raw_pages)
+        if pages is not None:
+            wanted = set(pages)
+            page_types = {n: t for n, t in page_types.items() if n in wanted}
+
+        if not page_types:
+            return list(raw_pages)
+
+        ocr_text = {
+            p["page_no"]: p["text"]
+            for p in self.extract_pages(page_types, threshold=threshold, region=region)
+        }
+
+        merged = []
+        for page in raw_pages:
+            page_no = page.get("page_no")
+            if page_no in ocr_text:
+                merged.append({**page, "text": ocr_text[page_no], "ocr": region or "page"})
+            else:
+                merged.append(page)
+        return merged
+
+    def extract_profile_header(self,
+                               raw_pages: List[Dict[str, Any]],
+                               pages: Iterable[int],
+                               threshold: int = 128) -> List[Dict[str, Any]]:
+        """
+        Region-of-interest OCR for profile extraction: only the header band
+        of the scanned pages among `pages` is OCR'd (at header DPI), so
+        profile fields are available before any transaction-body OCR.
+        """
+        return self.fill_scanned_pages(raw_pages, pages=pages, threshold=threshold, region="header")
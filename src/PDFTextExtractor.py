@@ -1,7 +1,44 @@
 import fitz
 import re
+import logging
+import numpy as np
 import pdfplumber
 
+from src.WordTableBuilder import WordTableBuilder
+from src.HeaderParser import HeaderBasedTableParser
+from src.constants.table_backends import BANK_TABLE_BACKENDS
+from src.TableTransport import share_tables
+
+logger = logging.getLogger(__name__)
+
+# A page whose text layer has fewer alphanumeric characters than this is
+# treated as an image page (scanned statement, or a scan with a stamp on top).
+MIN_TEXT_LAYER_CHARS = 40
+
+
+def classify_page_text(text: str, min_chars: int = MIN_TEXT_LAYER_CHARS) -> str:
+    """
+    Classify a page by its PyMuPDF text layer:
+      "text"    - usable text layer, no OCR needed
+      "sparse"  - a few characters only (page number, bank stamp) over an image
+      "scanned" - no text layer at all
+    """
+    alnum = sum(1 for ch in (text or "") if ch.isalnum())
+    if alnum >= min_chars:
+        return "text"
+    return "sparse" if alnum else "scanned"
+
+
+def detect_scanned_pages(pages, min_chars: int = MIN_TEXT_LAYER_CHARS):
+    """Return {page_no: page_type} for pages without a usable text layer."""
+    page_types = {}
+    for page in pages:
+        page_type = classify_page_text(page.get("text", ""), min_chars)
+        if page_type != "text":
+            page_types[page["page_no"]] = page_type
+    return page_types
+
+
 class PDFTextExtractor:
     def __init__(self, pdf_path: str, password: str = None):
         self.pdf_path = pdf_path
@@ -23,18 +60,55 @@ class PDFTextExtractor:
                 }
             )
         return pages
+
+    def scanned_pages(self, pages=None, min_chars: int = MIN_TEXT_LAYER_CHARS):
+        """Return {page_no: page_type} for pages that need OCR."""
+        pages = pages if pages is not None else self.extractor()
+        return detect_scanned_pages(pages, min_chars)
     
 
-class PlumberTableExtractor:
+class TableExtractor:
+    """
+    Table-extraction backend interface.
+
+    extract_tables(pages=None) -> [{"page_number": int, "rows": [[cell, ...], ...]}]
+    pages: optional 1-based page numbers to restrict extraction to.
+    Every backend returns the same shape so HeaderBasedTableParser works unchanged.
+    page_independent: pages can be extracted in separate calls (or processes)
+    and concatenated; False when a page depends on what earlier pages taught.
+    """
+    name = None
+    page_independent = True
+
     def __init__(self, pdf_path: str, password: str = None):
         self.pdf_path = pdf_path
         self.password = password
 
-    def extract_tables(self):
+    def extract_tables(self, pages=None):
+        raise NotImplementedError
+
+    @staticmethod
+    def _wanted(pages):
+        return set(pages) if pages is not None else None
+
+    def _open_fitz(self):
+        doc = fitz.open(self.pdf_path)
+        if self.password:
+            doc.authenticate(self.password)
+        return doc
+
+
+class PlumberTableExtractor(TableExtractor):
+    name = "pdfplumber"
+
+    def extract_tables(self, pages=None):
         all_tables = []
+        wanted = self._wanted(pages)
 
         with pdfplumber.open(self.pdf_path, password=self.password) as pdf:
             for i, page in enumerate(pdf.pages):
+                if wanted is not None and i + 1 not in wanted:
+                    continue
                 tables = page.extract_tables()
                 for table in tables:
                     if table and len(table) > 1:  # has header + at least 1 row
@@ -44,3 +118,236 @@ class PlumberTableExtractor:
                         })
 
         return all_tables
+
+
+class PyMuPDFTableExtractor(TableExtractor):
+    """Ruled/stream table detection with PyMuPDF's native find_tables()."""
+    name = "pymupdf"
+
+    def extract_tables(self, pages=None):
+        all_tables = []
+        wanted = self._wanted(pages)
+
+        with self._open_fitz() as doc:
+            for i, page in enumerate(doc):
+                if wanted is not None and i + 1 not in wanted:
+                    continue
+                for table in page.find_tables().tables:
+                    rows = table.extract()
+                    if rows and len(rows) > 1:
+                        all_tables.append({
+                            "page_number": i + 1,
+                            "rows": rows
+                        })
+
+        return all_tables
+
+
+class WordTableExtractor(TableExtractor):
+    """
+    No table detection at all: one table per page rebuilt from PyMuPDF word
+    coordinates with WordTableBuilder. Fastest option for unruled statements.
+    """
+    name = "words"
+
+    def __init__(self, pdf_path: str, password: str = None, builder: WordTableBuilder = None):
+        super().__init__(pdf_path, password)
+        self.builder = builder or WordTableBuilder()
+
+    def extract_tables(self, pages=None):
+        all_tables = []
+        wanted = self._wanted(pages)
+
+        with self._open_fitz() as doc:
+            for i, page in enumerate(doc):
+                if wanted is not None and i + 1 not in wanted:
+                    continue
+                words = page.get_text("words")
+                if not words:
+                    continue
+                x0, y0, x1, y1, texts = zip(*(w[:5] for w in words))
+                rows = self.builder.build(x0, y0, x1, y1, texts)
+                if len(rows) > 1:
+                    all_tables.append({
+                        "page_number": i + 1,
+                        "rows": rows
+                    })
+
+        return all_tables
+
+
+# A transaction row: a date in the date column (01/04/2024, 01-04-24,
+# 01 Apr 2024, 01-APR-2024, 2024-04-01) and a number in an amount column
+TXN_DATE_RE = re.compile(
+    r"^(?:\d{1,2}[/\-. ](?:\d{1,2}|[A-Za-z]{3})[/\-. ]\d{2,4}|\d{4}-\d{2}-\d{2})\b"
+)
+TXN_AMOUNT_RE = re.compile(r"^-?[\d,]*\d(?:\.\d+)?(?:\s*(?:cr|dr))?$", re.I)
+# Lines after which a statement's transaction table does not continue
+END_OF_TABLE_RE = re.compile(
+    r"\b(?:end of (?:the )?statement|statement summary|\*+\s*end)\b", re.I
+)
+
+
+def _row_signature(row) -> tuple:
+    return tuple(" ".join(str(cell).split()).lower() if cell else "" for cell in row)
+
+
+class HeaderColumnTableExtractor(WordTableExtractor):
+    """
+    Learn column boundaries from the transaction header row on the first
+    transaction page, then slice every later page straight from PyMuPDF word
+    coordinates with those boundaries, without header detection. A later
+    page that repeats the learned header line starts its table there (page
+    titles above it are dropped); headerless pages are sliced whole.
+
+    Slicing stops after an end-of-table line (END_OF_TABLE_RE) or at the
+    first page on which no row parses as a transaction, i.e. has a date in
+    the header's date column and a number in one of its amount columns
+    (summaries, legends, deposit details).
+    """
+    name = "columns"
+    page_independent = False
+
+    def __init__(self, pdf_path: str, password: str = None, builder: WordTableBuilder = None,
+                 header_parser: HeaderBasedTableParser = None):
+        super().__init__(pdf_path, password, builder)
+        self.header_parser = header_parser or HeaderBasedTableParser()
+
+    def find_header(self, x0, x1, texts, row_ids, word_height):
+        """Return (row_id, cell_x0, cell_x1) of the first transaction header line, or None."""
+        for row_id in range(int(row_ids.max()) + 1):
+            idx = np.flatnonzero(row_ids == row_id)
+            if len(idx) < 3:
+                continue
+            cell_ids = self.builder.segment_line(x0[idx], x1[idx], word_height)
+            n_cells = int(cell_ids.max()) + 1
+            if n_cells < 3:
+                continue
+            cells = []
+            for c in range(n_cells):
+                members = idx[cell_ids == c]
+                members = members[np.argsort(x0[members], kind="stable")]
+                cells.append(" ".join(texts[i] for i in members))
+            if not self.header_parser.is_transaction_header(self.header_parser.map_headers(cells)):
+                continue
+            cell_x0 = np.array([x0[idx[cell_ids == c]].min() for c in range(n_cells)])
+            cell_x1 = np.array([x1[idx[cell_ids == c]].max() for c in range(n_cells)])
+            order = np.argsort(cell_x0)
+            return row_id, cell_x0[order], cell_x1[order]
+        return None
+
+    @staticmethod
+    def _has_transaction(rows, date_col: int, amount_cols) -> bool:
+        def cell(row, c):
+            return str(row[c]).strip() if c < len(row) and row[c] else ""
+        return any(TXN_DATE_RE.match(cell(row, date_col))
+                   and any(TXN_AMOUNT_RE.match(cell(row, c)) for c in amount_cols)
+                   for row in rows)
+
+    def extract_tables(self, pages=None):
+        all_tables = []
+        wanted = self._wanted(pages)
+        boundaries = None
+        header_signature = None
+        date_col, amount_cols = 0, ()
+
+        with self._open_fitz() as doc:
+            for i, page in enumerate(doc):
+                if wanted is not None and i + 1 not in wanted:
+                    continue
+                words = page.get_text("words")
+                if not words:
+                    continue
+                x0, y0, x1, y1 = (np.array(v, dtype=np.float64) for v in zip(*(w[:4] for w in words)))
+                texts = [w[4] for w in words]
+                row_ids = self.builder.assign_rows(y0, y1)
+
+                learned_here = boundaries is None
+                if learned_here:
+                    word_height = float(np.median(y1 - y0)) or 1.0
+                    header = self.find_header(x0, x1, texts, row_ids, word_height)
+                    if header is None:
+                        continue  # profile pages before the table
+                    header_row, cell_x0, cell_x1 = header
+                    body = row_ids > header_row
+                    boundaries = self.builder.header_boundaries(cell_x0, cell_x1, x0[body], x1[body])
+                    keep = row_ids >= header_row
+                    rows = self.builder.build(x0[keep], y0[keep], x1[keep], y1[keep],
+                                              [t for t, k in zip(texts, keep) if k], boundaries=boundaries)
+                    header_signature = _row_signature(rows[0]) if rows else None
+                    mapping = self.header_parser.map_headers(rows[0]) if rows else {}
+                    date_col = mapping.get("txn_date", 0)
+                    amount_cols = [mapping[f] for f in ("debit", "credit", "amount", "balance") if f in mapping]
+                else:
+                    rows = self.builder.build(x0, y0, x1, y1, texts, boundaries=boundaries)
+                    # A repeated header line: the page's table starts there
+                    for r, row in enumerate(rows):
+                        if _row_signature(row) == header_signature:
+                            rows = rows[r:]
+                            break
+
+                end = next((r for r, row in enumerate(rows)
+                            if END_OF_TABLE_RE.search(" ".join(str(c) for c in row if c))), None)
+                if end is not None:
+                    rows = rows[:end]
+                if not self._has_transaction(rows, date_col, amount_cols):
+                    if learned_here and end is None:
+                        continue  # header at the foot of the page, rows start on the next
+                    logger.debug("No transaction rows on page %s; table ends", i + 1)
+                    break
+                if len(rows) > 1:
+                    all_tables.append({
+                        "page_number": i + 1,
+                        "rows": rows
+                    })
+                if end is not None:
+                    break
+
+        return all_tables
+
+
+TABLE_BACKENDS = {
+    PlumberTableExtractor.name: PlumberTableExtractor,
+    PyMuPDFTableExtractor.name: PyMuPDFTableExtractor,
+    WordTableExtractor.name: WordTableExtractor,
+    HeaderColumnTableExtractor.name: HeaderColumnTableExtractor,
+}
+DEFAULT_TABLE_BACKEND = PlumberTableExtractor.name
+
+IFSC_RE = re.compile(r"\b([A-Z]{4})0[A-Z0-9]{6}\b")
+
+
+def select_table_backend(raw_pages=None, backend: str = DEFAULT_TABLE_BACKEND) -> str:
+    """
+    Resolve the backend for one document.
+
+    backend: a TABLE_BACKENDS name, or "auto" to pick per bank: the IFSC bank
+             code found on the first pages is looked up in BANK_TABLE_BACKENDS.
+    """
+    if backend != "auto":
+        return backend
+    text = "\n".join(p.get("text", "") or "" for p in (raw_pages or [])[:3])
+    m = IFSC_RE.search(text)
+    if m:
+        return BANK_TABLE_BACKENDS.get(m.group(1), DEFAULT_TABLE_BACKEND)
+    return DEFAULT_TABLE_BACKEND
+
+
+def get_table_extractor(backend: str, pdf_path: str, password: str = None) -> TableExtractor:
+    if backend not in TABLE_BACKENDS:
+        raise ValueError(f"Unknown table backend '{backend}'. Choose from: {', '.join(TABLE_BACKENDS)}")
+    return TABLE_BACKENDS[backend](pdf_path, password=password)
+
+
+def extract_backend_tables(backend: str, pdf_path: str, password: str = None, pages=None):
+    """Module-level entry point so table extraction can run in a worker process."""
+    return get_table_extractor(backend, pdf_path, password=password).extract_tables(pages)
+
+
+def extract_backend_tables_shared(backend: str, pdf_path: str, password: str = None, pages=None):
+    """
+    extract_backend_tables for a worker process: the tables come back packed
+    (string pool + index arrays, in shared memory when large) instead of
+    pickled nested lists. Read them with TableTransport.unshare_tables().
+    """
+    return share_tables(extract_backend_tables(backend, pdf_path, password, pages))
@@ -215,6 +215,7 @@
 # src/fields/account_extractor.py
 from __future__ import annotations
 from typing import List, Dict, Any, Optional, Tuple
+from bisect import bisect_right
 import re
 
 # ---------- Patterns & guard rails ----------
@@ -240,6 +241,8 @@ IFSC_RE = re.compile(r"\b[A-Z]{4}0[A-Z0-9]{6}\b", re.I)
 MICR_RE = re.compile(r"\b\d{9}\b")
 PIN_RE  = re.compile(r"\b\d{6}\b")
 
+TOKEN_RE = re.compile(r"[A-Za-z0-9Xx\*]{6,}")
+
 PROMO_HINTS = re.compile(
     r"(download\s+app|cashback|points|offer|emi|insurance|thank\s+you\s+for\s+banking|"
     r"open\s+an\s+account|credit\s*card|debit\s*card|upi|scan\s+to\s+pay|advertisement)",
@@ -287,6 +290,123 @@ def _dedupe_keep_best(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     # stable sort by confidence desc
     return sorted(best_by_key.values(), key=lambda x: (-x["confidence"], x["account_number"]))
 
+class _Line:
+    """One text line; tokenized and flagged at most once, however many labels point at it."""
+
+    __slots__ = ("start", "text", "_tokens", "_blocked", "_inr")
+
+    def __init__(self, start: int, text: str):
+        self.start = start
+        self.text = text
+        self._tokens: Optional[List[Tuple[int, int, str]]] = None
+        self._blocked: Optional[bool] = None
+        self._inr: Optional[bool] = None
+
+    @property
+    def tokens(self) -> List[Tuple[int, int, str]]:
+        # (abs start, abs end, token); tokens are [A-Za-z0-9Xx*] only, so _clean() is a no-op on them
+        if self._tokens is None:
+            self._tokens = [(self.start + t.start(), self.start + t.end(), t.group())
+                            for t in TOKEN_RE.finditer(self.text)]
+        return self._tokens
+
+    @property
+    def blocked(self) -> bool:
+        if self._blocked is None:
+            self._blocked = bool(NOT_ACCOUNT_LABEL.search(self.text))
+        return self._blocked
+
+    @property
+    def inr(self) -> bool:
+        if self._inr is None:
+            self._inr = bool(INR_TAIL.search(self.text))
+        return self._inr
+
+def _labeled_score(candidate: str, line: _Line) -> float:
+    # _score(candidate, line.text, labeled=True) using the line's cached flags
+    score = 0.9
+    if line.inr: score += 0.1
+    if line.blocked: score -= 0.6
+    if IFSC_RE.search(candidate) or MICR_RE.fullmatch(candidate) or PIN_RE.fullmatch(candidate):
+        score -= 1.0
+    if len(candidate) < 9 or len(candidate) > 22:
+        score -= 0.1
+    return score
+
+def _line_candidates(tokens: List[str], line: _Line, evidence: str) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    if line.blocked:
+        return out
+    for c in tokens[:5]:
+        if _looks_like_account(c):
+            sc = _labeled_score(c, line)
+            out.append({"account_number": c, "confidence": round(min(sc, 0.99), 2), "evidence": evidence})
+    return out
+
+def _text_candidates(full_text: str) -> List[Dict[str, Any]]:
+    """
+    Labeled candidates: tokens after an ACCT_LABEL match on its own line, and
+    the first tokens of the line below. Lines are indexed once and each line
+    is tokenized lazily at most once.
+    """
+    lines: List[_Line] = []
+    starts: List[int] = []
+    pos = 0
+    for text in full_text.split("\n"):
+        starts.append(pos)
+        lines.append(_Line(pos, text))
+        pos += len(text) + 1
+
+    out: List[Dict[str, Any]] = []
+    for m in ACCT_LABEL.finditer(full_text):
+        li = bisect_right(starts, m.start()) - 1
+        lj = bisect_right(starts, m.end()) - 1
+        if li == lj:
+            line = lines[li]
+            tail: List[str] = []
+            for t_start, t_end, tok in line.tokens:
+                if t_start >= m.end():
+                    tail.append(tok)
+                elif t_end - m.end() >= 6:
+                    tail.append(tok[m.end() - t_start:])  # number glued to the label
+                if len(tail) >= 5:
+                    break
+        else:
+            # label broken across lines ("Account\nNo"): treat the span as one line
+            line = _Line(starts[li], "\n".join(l.text for l in lines[li:lj + 1]))
+            tail = TOKEN_RE.findall(full_text, m.end(), line.start + len(line.text))
+        out.extend(_line_candidates(tail, line, "text labeled (same line)"))
+
+        if lj + 1 < len(lines):
+            below = lines[lj + 1]
+            out.extend(_line_candidates([tok for _, _, tok in below.tokens[:5]], below, "text labeled (next line)"))
+    return out
+
+def _table_candidates(rows: List[List[Any]]) -> List[Dict[str, Any]]:
+    """Right-cell and below-cell candidates from a single pass over the cells."""
+    right: List[Dict[str, Any]] = []
+    below: List[Dict[str, Any]] = []
+
+    def add(into: List[Dict[str, Any]], cell_norm: str, value: str, evidence: str) -> None:
+        cand = _clean(value) or ""
+        if _looks_like_account(cand):
+            sc = _score(cand, cell_norm + " " + cand, labeled=True)
+            into.append({"account_number": cand, "confidence": round(min(sc, 0.99), 2), "evidence": evidence})
+
+    for ri, row in enumerate(rows):
+        nxt = rows[ri + 1] if ri + 1 < len(rows) else None
+        for ci, cell in enumerate(row):
+            if not isinstance(cell, str): continue
+            cell_norm = _clean(cell) or ""
+            if not ACCT_LABEL.search(cell_norm) or NOT_ACCOUNT_LABEL.search(cell_norm):
+                continue
+            if ci + 1 < len(row) and isinstance(row[ci + 1], str):
+                add(right, cell_norm, row[ci + 1], "table right cell")
+            if nxt is not None and ci < len(nxt) and isinstance(nxt[ci], str) and nxt[ci]:
+                add(below, cell_norm, nxt[ci], "table below cell")
+    # right-cell hits first, as before, so dedupe ties resolve the same way
+    return right + below
+
 class AccountNumberExtractor:
     """
     extract(..., return_all=False) -> single best account
@@ -314,66 +434,15 @@ class AccountNumberExtractor:
                 break
 
         full_text = "\n".join(texts)
-        lines = full_text.splitlines()
-
         candidates: List[Dict[str, Any]] = []
 
         # ---- 1) labeled occurrences in text (same line & next line) ----
-        for m in ACCT_LABEL.finditer(full_text):
-            line_start = full_text.rfind("\n", 0, m.start())
-            line_end   = full_text.find("\n", m.end())
-            if line_start == -1: line_start = 0
-            if line_end   == -1: line_end   = len(full_text)
-            line = full_text[line_start:line_end]
-
-            # same line
-            tail = line[m.end() - line_start:]
-            for c in re.findall(r"([A-Za-z0-9Xx\*]{6,})", tail)[:5]:
-                c = _clean(c) or ""
-                if _looks_like_account(c) and not NOT_ACCOUNT_LABEL.search(line):
-                    sc = _score(c, line, labeled=True)
-                    candidates.append({"account_number": c, "confidence": round(min(sc, 0.99), 2), "evidence": "text labeled (same line)"})
-
-            # next line
-            next_line_start = line_end + 1
-            next_line_end = full_text.find("\n", next_line_start)
-            if next_line_end == -1: next_line_end = len(full_text)
-            next_line = full_text[next_line_start:next_line_end]
-            for c in re.findall(r"([A-Za-z0-9Xx\*]{6,})", next_line)[:5]:
-                c = _clean(c) or ""
-                if _looks_like_account(c) and not NOT_ACCOUNT_LABEL.search(next_line):
-                    sc = _score(c, next_line, labeled=True)
-                    candidates.append({"account_number": c, "confidence": round(min(sc, 0.99), 2), "evidence": "text labeled (next line)"})
+        candidates.extend(_text_candidates(full_text))
 
         # ---- 2) tables (right cell & below cell) ----
         if tables:
             for tbl in tables[:5]:
-                rows = tbl.get("rows", []) or []
-                # right cell
-                for row in rows:
-                    for i, cell in enumerate(row):
-                        if not isinstance(cell, str): continue
-                        cell_norm = _clean(cell) or ""
-                        if ACCT_LABEL.search(cell_norm) and not NOT_ACCOUNT_LABEL.search(cell_norm):
-                            if i + 1 < len(row) and isinstance(row[i + 1], str):
-                                cand = _clean(row[i + 1]) or ""
-                                if _looks_like_account(cand):
-                                    sc = _score(cand, cell_norm + " " + cand, labeled=True)
-                                    candidates.append({"account_number": cand, "confidence": round(min(sc, 0.99), 2), "evidence": "table right cell"})
-                # below cell
-                for ri in range(len(rows) - 1):
-                    row = rows[ri]
-                    nxt = rows[ri + 1]
-                    for ci, cell in enumerate(row):
-                        if not isinstance(cell, str): continue
-                        cell_norm = _clean(cell) or ""
-                        if ACCT_LABEL.search(cell_norm) and not NOT_ACCOUNT_LABEL.search(cell_norm):
-                            below = nxt[ci] if ci < len(nxt) and isinstance(nxt[ci], str) else None
-                            if below:
-                                cand = _clean(below) or ""
-                                if _looks_like_account(cand):
-                                    sc = _score(cand, cell_norm + " " + cand, labeled=True)
-                                    candidates.append({"account_number": cand, "confidence": round(min(sc, 0.99), 2), "evidence": "table below cell"})
+                candidates.extend(_table_candidates(tbl.get("rows", []) or []))
 
         # ---- 3) unlabeled “N…(INR) - NAME” line ----
         m = re.search(r"(^|\n)\s*([A-Za-z0-9Xx\*]{6,})\s*\(INR\)\s*[-–—:]\s*[A-Z].+$", full_text, re.I | re.M)
@@ -383,16 +452,6 @@ class AccountNumberExtractor:
                 sc = _score(cand, m.group(0), labeled=False) + 0.1
                 candidates.append({"account_number": cand, "confidence": round(min(sc, 0.99), 2), "evidence": "account line with (INR) - NAME"})
 
-        # ---- 4) top-block heuristic (useful when a table lists many accounts with no labels) ----
-        for ln in lines[:80]:
-            if NOT_ACCOUNT_LABEL.search(ln):  # skip rows that say “Customer ID”, etc.
-                continue
-            for tok in re.findall(r"[A-Za-z0-9Xx\*]{6,}", ln or "")[:6]:
-                tok = _clean(tok) or ""
-                if _looks_like_account(tok):
-                    sc = _score(tok, ln, labeled=False)
-                    if sc >= 0.72:  # slightly higher bar to avoid noise
-                        candidates.append({"account_number": tok})
         results = _dedupe_keep_best(candidates)
 
         if return_all:
@@ -1,7 +1,10 @@
 from __future__ import annotations
 from typing import List, Dict, Any, Optional
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 class AccountTypeExtractor:
     """
     Extract account type information from bank statements.
@@ -33,8 +36,7 @@ class AccountTypeExtractor:
                 tables: Optional[List[Dict[str, Any]]] = None,
                 first_n_pages: int = 3) -> Dict[str, Any]:
         
-        if self.debug:
-            print("Starting AccountTypeExtractor...")
+        logger.debug("Starting AccountTypeExtractor...")
         
         # Get text from first few pages
         texts = []
@@ -82,8 +84,7 @@ class AccountTypeExtractor:
             after_label = line[match.end() - line_start:].strip()
             account_type = self._identify_account_type(after_label)
             if account_type:
-                if self.debug:
-                    print(f"Found labeled account type: {account_type} in line: {line}")
+                logger.debug("Found labeled account type: %s in line: %s", account_type, line)
                 return {
                     "account_type": account_type,
                     "confidence": 0.9,
@@ -99,8 +100,7 @@ class AccountTypeExtractor:
                 
                 account_type = self._identify_account_type(next_line)
                 if account_type:
-                    if self.debug:
-                        print(f"Found labeled account type: {account_type} in next line: {next_line}")
+                    logger.debug("Found labeled account type: %s in next line: %s", account_type, next_line)
                     return {
                         "account_type": account_type,
                         "confidence": 0.85,
@@ -125,8 +125,7 @@ class AccountTypeExtractor:
                         if i + 1 < len(row) and isinstance(row[i + 1], str):
                             account_type = self._identify_account_type(row[i + 1])
                             if account_type:
-                                if self.debug:
-                                    print(f"Found account type in table right cell: {account_type}")
+                                logger.debug("Found account type in table right cell: %s", account_type)
                                 return {
                                     "account_type": account_type,
                                     "confidence": 0.85,
@@ -147,8 +146,7 @@ class AccountTypeExtractor:
                         if j < len(next_row) and isinstance(next_row[j], str):
                             account_type = self._identify_account_type(next_row[j])
                             if account_type:
-                                if self.debug:
-                                    print(f"Found account type in table below cell: {account_type}")
+                                logger.debug("Found account type in table below cell: %s", account_type)
                                 return {
                                     "account_type": account_type,
                                     "confidence": 0.8,
@@ -166,8 +164,7 @@ class AccountTypeExtractor:
             if re.search(r"\b\d{10,}\b", line):  # Has account-like number
                 account_type = self._identify_account_type(line)
                 if account_type:
-                    if self.debug:
-                        print(f"Found account type in account line: {account_type}")
+                    logger.debug("Found account type in account line: %s", account_type)
                     return {
                         "account_type": account_type,
                         "confidence": 0.75,
@@ -189,8 +186,7 @@ class AccountTypeExtractor:
             for match in matches:
                 account_type = self._identify_account_type(match.group(1))
                 if account_type:
-                    if self.debug:
-                        print(f"Found account type via pattern: {account_type}")
+                    logger.debug("Found account type via pattern: %s", account_type)
                     return {
                         "account_type": account_type,
                         "confidence": 0.7,
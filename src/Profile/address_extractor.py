@@ -3,8 +3,11 @@
 from __future__ import annotations
 from typing import List, Dict, Any, Optional
 from collections import deque
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 # --- regexes / signals ------------------------------------------------------
 
 CITIES_HINT = r"(?:mumbai|delhi|new\s*delhi|bengaluru|bangalore|chennai|kolkata|pune|hyderabad|gurgaon|noida|ahmedabad|jaipur|indore|surat|vadodara|thane|navi\s*mumbai)"
@@ -233,7 +236,7 @@ class AddressExtractor:
             start_pos = match.start()
             end_pos = match.end()
             
-            print(f"Found address label at position {start_pos}-{end_pos}")
+            logger.debug("Found address label at position %s-%s", start_pos, end_pos)
             
             # Show context around the match
             context_start = max(0, start_pos - 100)
@@ -449,7 +452,7 @@ class AddressExtractor:
         Handle two-column format where customer info is on the left
         and bank info is on the right
         """
-        print(f"DEBUG: Checking two-column format with {len(lines)} lines")
+        logger.debug("Checking two-column format with %s lines", len(lines))
    
         customer_lines = []
         started_collecting = False
@@ -628,7 +631,7 @@ class AddressExtractor:
         addr = self._two_column_format(lines)
         if addr and not is_pin_only(addr):
             # print(f"[address] via two-column format -> {addr}")
-            if self.debug: print("[address] via two-column format ->", addr)
+            logger.debug("[address] via two-column format -> %s", addr)
             return {"address": addr, "confidence": 0.88, "evidence": "two-column format"}
 
         
@@ -636,14 +639,14 @@ class AddressExtractor:
         addr = self._top_left_block(lines)
         if addr and not is_pin_only(addr):
             # print(f"[address] via top-left block -> {addr}")
-            if self.debug: print("[address] via top-left block ->", addr)
+            logger.debug("[address] via top-left block -> %s", addr)
             return {"address": addr, "confidence": 0.82, "evidence": "top-left block"}
         
         # 3) Enhanced labeled block
         addr = self._labeled_block(text)
         if addr and not is_pin_only(addr):
             # print(f"[address] via labeled block -> {addr}")
-            if self.debug: print("[address] via labeled block ->", addr)
+            logger.debug("[address] via labeled block -> %s", addr)
             return {"address": addr, "confidence": 0.92, "evidence": "labeled block"}
 
         # 4) Enhanced tables
@@ -652,5 +655,5 @@ class AddressExtractor:
             # if self.debug: print("[address] via tables ->", addr)
             return {"address": addr, "confidence": 0.70, "evidence": "table right/below cell"}
 
-        if self.debug: print("[address] not found")
+        logger.debug("[address] not found")
         return {"address": None, "confidence": 0.0, "evidence": None}
@@ -1,6 +1,7 @@
 # src/fields/email_extractor.py
 from __future__ import annotations
 from typing import List, Dict, Any, Optional, Tuple
+from bisect import bisect_right
 import re
 
 # --- label variants (case-insensitive) ---
@@ -15,10 +16,21 @@ NON_CUSTOMER_CONTEXT = re.compile(
 )
 
 # banky domains / shared mailboxes (add yours here)
+BANK_MAIL_HOSTS = (
+    "hdfcbank", "icicibank", "axisbank", "sbi", "yesbank", "kotak", "rblbank", "aubank", "idfcfirst",
+    "indusind", "federalbank", "bandhanbank", "iob", "pnb", "boi", "bankofbaroda",
+)
+BANK_MAIL_TLDS = ("com", "co.in", "in")
 BANKY_DOMAINS = re.compile(
-    r"@(hdfcbank|icicibank|axisbank|sbi|yesbank|kotak|rblbank|aubank|idfcfirst|indusind|federalbank|bandhanbank|iob|pnb|boi|bankofbaroda)\.(com|co\.in|in)$",
+    r"@(" + "|".join(BANK_MAIL_HOSTS) + r")\.(" + "|".join(re.escape(t) for t in BANK_MAIL_TLDS) + r")$",
     re.I,
 )
+# same domains as a lookup table for the part after '@'
+BANK_DOMAIN_TABLE = frozenset(f"{host}.{tld}" for host in BANK_MAIL_HOSTS for tld in BANK_MAIL_TLDS)
+
+NOREPLY_LOCAL = re.compile(r"\b(no[-_\.]?reply|service|support|help|donotreply)\b")
+DIGITS_LOCAL = re.compile(r"\d{6,}")
+MASK_RUN = re.compile(r"X{2,}", re.I)
 
 # normal email + masked variants (uppercase allowed)
 EMAIL_RE = re.compile(r"[A-Z0-9._%+\-]+@[A-Z0-9.\-]+\.[A-Z]{2,}", re.I)
@@ -42,7 +54,7 @@ def _tokenize_name(name_hint: Optional[str]) -> list[str]:
     return [t.lower() for t in re.findall(r"[A-Za-z]+", name_hint)]
 
 def _looks_like_masked(s: str) -> bool:
-    return bool(re.search(r"X{2,}", s, re.I))
+    return bool(MASK_RUN.search(s))
 
 def _context_is_staff(lines: List[str], idx: int, radius: int = 2) -> bool:
     lo = max(0, idx - radius)
@@ -50,13 +62,49 @@ def _context_is_staff(lines: List[str], idx: int, radius: int = 2) -> bool:
     ctx = " ".join(lines[lo:hi])
     return bool(NON_CUSTOMER_CONTEXT.search(ctx) or BANKY_DOMAINS.search(ctx))
 
+def _staff_lines(lines: List[str], radius: int = 2) -> List[bool]:
+    """
+    _context_is_staff(lines, i, radius) for every line at once.
+
+    NON_CUSTOMER_CONTEXT runs once over the space-joined lines; a match
+    covering lines f..l lies inside the window of every line in
+    [l - radius, f + radius], marked with a difference array. BANKY_DOMAINS is
+    anchored at the end of the joined window, so it only depends on the
+    window's last line.
+    """
+    n = len(lines)
+    if not n:
+        return []
+    starts, pos = [], 0
+    for ln in lines:
+        starts.append(pos)
+        pos += len(ln) + 1
+    joined = " ".join(lines)
+
+    marks = [0] * (n + 1)
+    for m in NON_CUSTOMER_CONTEXT.finditer(joined):
+        first = bisect_right(starts, m.start()) - 1
+        last = bisect_right(starts, m.end() - 1) - 1
+        lo, hi = max(0, last - radius), min(n - 1, first + radius)
+        if lo <= hi:
+            marks[lo] += 1
+            marks[hi + 1] -= 1
+
+    bank_end = [bool(BANKY_DOMAINS.search(ln)) for ln in lines]
+    staff, running = [], 0
+    for idx in range(n):
+        running += marks[idx]
+        staff.append(running > 0 or bank_end[min(n, idx + radius + 1) - 1])
+    return staff
+
 def _score_candidate(addr: str, name_tokens: list[str]) -> float:
     score = 1.0
-    local = addr.split("@")[0].lower()
-    dom = addr.split("@")[1].lower() if "@" in addr else ""
+    local, _, rest = addr.partition("@")
+    local = local.lower()
+    dom = rest.split("@")[0].lower()
 
     # penalize banky domains
-    if BANKY_DOMAINS.search("@" + dom):
+    if dom in BANK_DOMAIN_TABLE:
         score -= 0.8
 
     # boost if name is present in local part (either part of full name)
@@ -64,11 +112,11 @@ def _score_candidate(addr: str, name_tokens: list[str]) -> float:
         score += 0.6
 
     # penalize noreply/service/mailers
-    if re.search(r"\b(no[-_\.]?reply|service|support|help|donotreply)\b", local):
+    if NOREPLY_LOCAL.search(local):
         score -= 0.5
 
     # penalize weird locals (pure digits)
-    if re.fullmatch(r"\d{6,}", local):
+    if DIGITS_LOCAL.fullmatch(local):
         score -= 0.7
 
     # slight boost if not masked
@@ -99,6 +147,7 @@ class EmailExtractor:
         pages_text = "\n".join(p.get("text", "") or "" for p in raw_pages[:first_n_pages])
         lines = pages_text.splitlines()
         name_tokens = _tokenize_name(name_hint)
+        staff = _staff_lines(lines)
 
         # 0) label/value across lines
         #   A) label on one line, colon next, value next
@@ -139,11 +188,12 @@ class EmailExtractor:
                         m2 = EMAIL_RE.search(cand_line) or MASKY_RE.search(cand_line)
                         if m2:
                             addr = _norm(m2.group(0))
-                            if not _context_is_staff(lines, i):
+                            if not staff[i]:
                                 return {"email": addr, "confidence": 0.92, "evidence": "label within 2 lines"}
 
-        # 1) from tables (right/under cell)
-        candidates: list[Tuple[str, float, str, int]] = []  # (addr, score, evidence, line_idx_for_ctx)
+        # 1) from tables (right/under cell) and 2) every email in the text;
+        # collected first, then scored together with one score per address
+        found: list[Tuple[str, float, str, int]] = []  # (addr, score adjustment, evidence, line_idx_for_ctx)
         if tables:
             for tbl in tables[:3]:
                 rows = tbl.get("rows", []) or []
@@ -156,44 +206,26 @@ class EmailExtractor:
                             # right cell
                             if ci + 1 < len(row) and isinstance(row[ci + 1], str):
                                 for m in (EMAIL_RE.findall(row[ci + 1]) or MASKY_RE.findall(row[ci + 1])):
-                                    addr = _norm(m if isinstance(m, str) else m[0])
-                                    score = _score_candidate(addr, name_tokens)
-                                    candidates.append((addr, score, "table right cell", -1))
+                                    found.append((_norm(m if isinstance(m, str) else m[0]), 0.0, "table right cell", -1))
                             # below cell
                             if ri + 1 < len(rows) and ci < len(rows[ri + 1]) and isinstance(rows[ri + 1][ci], str):
                                 for m in (EMAIL_RE.findall(rows[ri + 1][ci]) or MASKY_RE.findall(rows[ri + 1][ci])):
-                                    addr = _norm(m if isinstance(m, str) else m[0])
-                                    score = _score_candidate(addr, name_tokens)
-                                    candidates.append((addr, score, "table below cell", -1))
-
-        # 2) harvest all emails from text
-        all_text_emails = [*_unique(EMAIL_RE.findall(pages_text))]
-        # include masked-ish as a last resort
-        all_text_emails += [*_unique(MASKY_RE.findall(pages_text))]  # returns tuples for group, normalize below
-        # normalize any tuple capture
-        normed = []
-        for e in all_text_emails:
-            if isinstance(e, tuple):
-                # MASKY_RE captured TLD; re-find full span for safety
-                m = MASKY_RE.search(pages_text)
-                if m:
-                    normed.append(_norm(m.group(0)))
-            else:
-                normed.append(_norm(e))
-        # score them with context
+                                    found.append((_norm(m if isinstance(m, str) else m[0]), 0.0, "table below cell", -1))
+
         for idx, ln in enumerate(lines):
+            if staff[idx]:
+                continue
             for m in EMAIL_RE.finditer(ln):
-                addr = _norm(m.group(0))
-                if _context_is_staff(lines, idx):
-                    continue
-                score = _score_candidate(addr, name_tokens)
-                candidates.append((addr, score, "text", idx))
+                found.append((_norm(m.group(0)), 0.0, "text", idx))
             for m in MASKY_RE.finditer(ln):
-                addr = _norm(m.group(0))
-                if _context_is_staff(lines, idx):
-                    continue
-                score = _score_candidate(addr, name_tokens) - 0.05  # small penalty for masked
-                candidates.append((addr, score, "text(masked)", idx))
+                found.append((_norm(m.group(0)), -0.05, "text(masked)", idx))  # small penalty for masked
+
+        scores: Dict[str, float] = {}
+        candidates: list[Tuple[str, float, str, int]] = []
+        for addr, adjust, evidence, idx in found:
+            if addr not in scores:
+                scores[addr] = _score_candidate(addr, name_tokens)
+            candidates.append((addr, scores[addr] + adjust, evidence, idx))
 
         # keep best non‑bank, non‑staff candidate
         if candidates:
@@ -203,13 +235,3 @@ class EmailExtractor:
                 return {"email": best[0], "confidence": round(min(0.99, 0.6 + best[1] / 2), 2), "evidence": best[2]}
 
         return {"email": None, "confidence": 0.0, "evidence": None}
-
-
-# helpers -----------------------------------------------------------------
-
-def _unique(xs):
-    seen = set()
-    for x in xs:
-        if x not in seen:
-            seen.add(x)
-            yield x
@@ -1,8 +1,13 @@
 # src/fields/name_extractor.py
 from __future__ import annotations
 from typing import List, Dict, Any, Optional, Tuple
+from bisect import bisect_right
+from functools import lru_cache
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 # --- helpers ---------------------------------------------------------------
 
 HEADERISH = re.compile(
@@ -21,6 +26,31 @@ NEG_NAME_TERMS = {
     "account number", "account no", "customer id", "cust id", "summary","bank","app","file","digital"
 }
 
+def _term_trie_pattern(terms) -> str:
+    """
+    Regex source matching any of `terms` as a substring, with shared prefixes
+    factored into a trie ("cust id" / "customer id" / "currency" -> "c(?:u(?:...))")
+    so each text position follows one branch instead of trying every term.
+    A term that ends at a node makes its longer extensions redundant.
+    """
+    trie: Dict[str, Any] = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def walk(node) -> str:
+        if "" in node:
+            return ""
+        branches = [re.escape(ch) + walk(child) for ch, child in sorted(node.items())]
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return walk(trie)
+
+# any NEG_NAME_TERMS entry as a substring of the lowercased line, in one scan
+NEG_NAME_RE = re.compile(_term_trie_pattern(NEG_NAME_TERMS))
+
 import re
 
 _NAME_AFTER_ACCOUNT_BLOCK = re.compile(
@@ -75,15 +105,14 @@ def _strip_prefixes(s: str) -> str:
 def _is_headerish(line: str) -> bool:
     return bool(HEADERISH.search(line))
 
+@lru_cache(maxsize=4096)
 def _looks_like_name(line: str) -> bool:
     line = (line or "").strip()
     if not line or ":" in line or any(ch.isdigit() for ch in line):
         return False
     # reject if any negative term is present
-    low = line.lower()
-    for t in NEG_NAME_TERMS:
-        if t in low:
-            return False
+    if NEG_NAME_RE.search(line.lower()):
+        return False
     if _is_headerish(line):
         return False
     if RMISH.search(line) or CORPORATE.search(line):
@@ -123,7 +152,10 @@ def _is_likely_branch_context(text: str, position: int) -> bool:
             line_idx = i
             break
         current_pos += len(line) + 1
-    
+    return _is_branch_context_line(lines, line_idx)
+
+
+def _is_branch_context_line(lines: List[str], line_idx: int) -> bool:
     # Check surrounding lines (wider context)
     context_start = max(0, line_idx - 5)
     context_end = min(len(lines), line_idx + 5)
@@ -156,6 +188,96 @@ def _is_likely_branch_context(text: str, position: int) -> bool:
     # If significantly more branch indicators, it's likely branch context
     return branch_count > customer_count + 1  # Bias towards customer unless clearly branch
 
+
+class _PageWindow:
+    """
+    Text of the first N pages, grown one page at a time. Keeps the '\n'-split
+    lines with their offsets, so branch-context checks are a lookup instead of
+    a re-split of the whole text, and the state each text pass of
+    NameExtractor needs to look only at what the new page can change: regex
+    matches found so far, how far the name & address zone search got, and the
+    passes whose miss no later page can undo.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.lines: List[str] = []
+        self.starts: List[int] = []
+        self.pages = 0
+        self.prev_tail = 0   # start of the old text's last non-blank line
+        self.prev_lines = 0  # len(lines) before the last page was added
+        self.matches: Dict[Any, List[re.Match]] = {}
+        self.settled: set = set()
+        self.zone_title: Optional[int] = None
+        self.zone_searched = 0
+        self.zone_closed = False
+
+    def add_page(self, page_text: str) -> None:
+        stripped = self.text.rstrip()
+        self.prev_tail, self.prev_lines = stripped.rfind("\n") + 1, len(self.lines)
+        if self.pages:
+            self.text += "\n"
+        pos = len(self.text)
+        self.text += page_text
+        for ln in page_text.split("\n"):
+            self.starts.append(pos)
+            self.lines.append(ln)
+            pos += len(ln) + 1
+        self.pages += 1
+
+    def is_branch_context(self, position: int) -> bool:
+        # same line lookup as _is_likely_branch_context(self.text, position)
+        return _is_branch_context_line(self.lines, max(0, bisect_right(self.starts, position) - 1))
+
+    def line_of(self, position: int) -> int:
+        return bisect_right(self.starts, position) - 1
+
+    def scan(self, key: Any, pattern: re.Pattern) -> List[re.Match]:
+        """
+        Matches of `pattern` whose outcome may differ from the previous
+        window. A match ending before the old text's last non-blank line was
+        decided by the old text alone, so it is unchanged; scanning resumes
+        after the last of them. Earlier matches within 5 lines of the old end
+        are returned again since their branch context now has more lines.
+        """
+        keep = [m for m in self.matches.get(key, []) if m.end() < self.prev_tail]
+        resume = keep[-1].end() if keep else 0
+        new = list(pattern.finditer(self.text, resume))
+        self.matches[key] = keep + new
+        recheck = [m for m in keep if self.line_of(m.start()) >= self.prev_lines - 5]
+        return recheck + new
+
+    def first_match(self, key: Any, pattern: re.Pattern) -> Optional[re.Match]:
+        """pattern.search(text), or None when that match is the one the previous window rejected."""
+        changed = self.scan(key, pattern)
+        found = self.matches[key]
+        return found[0] if found and any(m is found[0] for m in changed) else None
+
+    def find_zone(self, title_pat: re.Pattern, size: int) -> Tuple[int, int]:
+        """
+        _find_zone over the lines, limited to the first `size` zone lines.
+        The title search resumes at the first new line; (-1, -1) is returned
+        once the zone was already complete in an earlier window.
+        """
+        if self.zone_title is None:
+            for i in range(self.zone_searched, len(self.lines)):
+                if title_pat.search(self.lines[i]):
+                    self.zone_title = i
+                    break
+            else:
+                self.zone_searched = len(self.lines)
+                return -1, -1
+        if self.zone_closed:
+            return -1, -1
+        start = self.zone_title + 1
+        j = start
+        while j < len(self.lines) and j < start + size:
+            if not self.lines[j].strip() or _is_headerish(self.lines[j]):
+                break
+            j += 1
+        self.zone_closed = j < len(self.lines) or j == start + size
+        return start, j
+
 # --- extractor -------------------------------------------------------------
 
 class NameExtractor:
@@ -182,10 +304,19 @@ class NameExtractor:
    
     def extract(self, raw_pages: List[Dict[str, Any]], tables: List[Dict[str, Any]] | None = None) -> Dict[str, Any]:
         # --- try progressively larger page windows: 1, 2, 3, 4 ---
+        # Each window only adds one page to the previous one; table lookups do
+        # not depend on the window, so after one miss they are skipped.
+        win = _PageWindow()
+        check_tables = True
         for window in (1, 2, 3, 4):
-            result = self._extract_from_window(raw_pages, tables, window)
+            if window > 1 and window > len(raw_pages):
+                break  # no new page: same text as the window that just missed
+            if window <= len(raw_pages):
+                win.add_page(raw_pages[window - 1].get("text") or "")
+            result = self._extract_from_window(win, tables if check_tables else None, window)
             if result.get("name"):
                 return result
+            check_tables = False
 
         # nothing found even after 4 pages
         return {"name": None, "confidence": 0.0, "evidence": None}
@@ -239,21 +370,19 @@ class NameExtractor:
         return {"name": None, "confidence": 0.0, "evidence": None}
 
     # ---- SAME logic, but scoped per window ----
-    def _extract_from_window(self, raw_pages: List[Dict[str, Any]], tables: List[Dict[str, Any]] | None, window: int) -> Dict[str, Any]:
-        # build text/lines from the first `window` pages
-        pages_text = "\n".join(p.get("text") or "" for p in raw_pages[:window])
-        lines = (pages_text or "").splitlines()
+    def _extract_from_window(self, win: _PageWindow, tables: List[Dict[str, Any]] | None, window: int) -> Dict[str, Any]:
+        # lines of the first `window` pages; every pass below only looks at
+        # what can differ from the previous (missed) window
+        lines = win.lines
 
         # 0) NEW: Check for labeled names first (like "Account Name : Mr. ANURAG SINHA")
-        for pattern in self.LABELED_NAME_PATTERNS:
-            matches = pattern.finditer(pages_text)
-            for match in matches:
+        for idx, pattern in enumerate(self.LABELED_NAME_PATTERNS):
+            for match in win.scan(idx, pattern):
                 candidate = match.group(1).strip()
                 
                 # Check if this appears in branch context (right column)
-                if _is_likely_branch_context(pages_text, match.start()):
-                    if self.debug:
-                        print(f"Skipping labeled name '{candidate}' - appears in branch context")
+                if win.is_branch_context(match.start()):
+                    logger.debug("Skipping labeled name '%s' - appears in branch context", candidate)
                     continue
                     
                 if _looks_like_name(candidate):
@@ -262,28 +391,27 @@ class NameExtractor:
                     return {"name": nm, "confidence": 0.95, "evidence": f"labeled name pattern (first {window}p)"}
 
         # 1) "Account Number ↵ … ) - NAME" (multi-line block)
-        m_block = _NAME_AFTER_ACCOUNT_BLOCK.search(pages_text)
+        m_block = win.first_match("block", _NAME_AFTER_ACCOUNT_BLOCK)
         if m_block:
             # Check if this appears in branch context
-            if not _is_likely_branch_context(pages_text, m_block.start()):
+            if not win.is_branch_context(m_block.start()):
                 prefilled_name = _sanitize_name(m_block.group("who"))
                 if prefilled_name:
                     return {"name": prefilled_name, "confidence": 0.92, "evidence": f"account-block pattern (first {window}p)"}
 
         # 2) Name & Address zone
-        start, end = _find_zone(lines, self.NAME_ADDR_TITLE)
+        start, end = win.find_zone(self.NAME_ADDR_TITLE, 6)
         if start != -1:
-            for ln in lines[start:end][:6]:
+            for ln in lines[start:end]:
                 if _looks_like_name(ln):
                     nm = _title_if_caps(ln)  # Keep titles
                     return {"name": nm, "confidence": 0.95, "evidence": f"name&address zone (first {window}p)"}
 
         # 3) Account line – same line
-        joined = "\n".join(lines)
-        m = self.ACCOUNT_LINE_SAME.search(joined)
+        m = win.first_match("account_line", self.ACCOUNT_LINE_SAME)
         if m:
             # Check if this appears in branch context
-            if not _is_likely_branch_context(joined, m.start()):
+            if not win.is_branch_context(m.start()):
                 cand = m.group(1).strip()
                 cand = re.split(r"\b(transaction|search|period|list)\b", cand, flags=re.I)[0].strip()
                 tokens = [t for t in cand.split() if t.isalpha()]
@@ -293,7 +421,9 @@ class NameExtractor:
                         return {"name": nm, "confidence": 0.88, "evidence": f"account line (same line, {window}p)"}
 
         # 4) Account line – next line after number
-        for i, ln in enumerate(lines[:60]):
+        # settled once the first account line and the lines after it were all read
+        hit_end = len(lines) < 60
+        for i, ln in enumerate(lines[:60] if "account_next" not in win.settled else ()):
             if ln and re.search(r"\baccount\s*(?:number|no)\b", ln, re.I):
                 k = i + 1
                 seen = 0
@@ -320,10 +450,13 @@ class NameExtractor:
                     if _looks_like_name(nxt):
                         nm = _title_if_caps(nxt)  # Keep titles
                         return {"name": nm, "confidence": 0.86, "evidence": f"account line (next line fallback, {window}p)"}
+                hit_end = seen < 3
                 break
+        if not hit_end:
+            win.settled.add("account_next")
 
-        # 5) Top-left block heuristic
-        for ln in lines[:15]:
+        # 5) Top-left block heuristic (the first 15 lines never change once there)
+        for ln in lines[:15] if win.prev_lines < 15 else ():
             if _looks_like_name(ln):
                 nm = _title_if_caps(ln)  # Keep titles
                 return {"name": nm, "confidence": 0.70, "evidence": f"top-left block ({window}p)"}
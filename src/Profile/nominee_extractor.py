@@ -1,7 +1,10 @@
 from __future__ import annotations
 from typing import List, Dict, Any, Optional
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 class NomineeExtractor:
     """
     Extract nominee information from bank statements.
@@ -33,8 +36,7 @@ class NomineeExtractor:
                 first_n_pages: int = 3,
                 name_hint: Optional[str] = None) -> Dict[str, Any]:
         
-        if self.debug:
-            print("Starting NomineeExtractor...")
+        logger.debug("Starting NomineeExtractor...")
         
         # Get text from first few pages
         texts = []
@@ -79,8 +81,7 @@ class NomineeExtractor:
             
             nominee = self._identify_nominee(after_label, name_hint)
             if nominee:
-                if self.debug:
-                    print(f"Found labeled nominee: {nominee} in line: {line}")
+                logger.debug("Found labeled nominee: %s in line: %s", nominee, line)
                 return {
                     "nominee": nominee,
                     "confidence": 0.9,
@@ -96,8 +97,7 @@ class NomineeExtractor:
                 
                 nominee = self._identify_nominee(next_line, name_hint)
                 if nominee:
-                    if self.debug:
-                        print(f"Found labeled nominee: {nominee} in next line: {next_line}")
+                    logger.debug("Found labeled nominee: %s in next line: %s", nominee, next_line)
                     return {
                         "nominee": nominee,
                         "confidence": 0.85,
@@ -122,8 +122,7 @@ class NomineeExtractor:
                         if i + 1 < len(row) and isinstance(row[i + 1], str):
                             nominee = self._identify_nominee(row[i + 1], name_hint)
                             if nominee:
-                                if self.debug:
-                                    print(f"Found nominee in table right cell: {nominee}")
+                                logger.debug("Found nominee in table right cell: %s", nominee)
                                 return {
                                     "nominee": nominee,
                                     "confidence": 0.85,
@@ -144,8 +143,7 @@ class NomineeExtractor:
                         if j < len(next_row) and isinstance(next_row[j], str):
                             nominee = self._identify_nominee(next_row[j], name_hint)
                             if nominee:
-                                if self.debug:
-                                    print(f"Found nominee in table below cell: {nominee}")
+                                logger.debug("Found nominee in table below cell: %s", nominee)
                                 return {
                                     "nominee": nominee,
                                     "confidence": 0.8,
@@ -168,8 +166,7 @@ class NomineeExtractor:
             for match in matches:
                 nominee = self._identify_nominee(match.group(1), name_hint)
                 if nominee:
-                    if self.debug:
-                        print(f"Found nominee via pattern: {nominee}")
+                    logger.debug("Found nominee via pattern: %s", nominee)
                     return {
                         "nominee": nominee,
                         "confidence": 0.7,
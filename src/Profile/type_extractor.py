@@ -1,7 +1,10 @@
 from __future__ import annotations
 from typing import List, Dict, Any, Optional
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 class TypeExtractor:
     """
     Extract account holder type information from bank statements.
@@ -36,8 +39,7 @@ class TypeExtractor:
                 first_n_pages: int = 3,
                 name_hint: Optional[str] = None) -> Dict[str, Any]:
         
-        if self.debug:
-            print("Starting TypeExtractor...")
+        logger.debug("Starting TypeExtractor...")
         
         # Get text from first few pages
         texts = []
@@ -88,8 +90,7 @@ class TypeExtractor:
             
             holder_type = self._identify_type(after_label)
             if holder_type:
-                if self.debug:
-                    print(f"Found labeled type: {holder_type} in line: {line}")
+                logger.debug("Found labeled type: %s in line: %s", holder_type, line)
                 return {
                     "type": holder_type,
                     "confidence": 0.9,
@@ -105,8 +106,7 @@ class TypeExtractor:
                 
                 holder_type = self._identify_type(next_line)
                 if holder_type:
-                    if self.debug:
-                        print(f"Found labeled type: {holder_type} in next line: {next_line}")
+                    logger.debug("Found labeled type: %s in next line: %s", holder_type, next_line)
                     return {
                         "type": holder_type,
                         "confidence": 0.85,
@@ -131,8 +131,7 @@ class TypeExtractor:
                         if i + 1 < len(row) and isinstance(row[i + 1], str):
                             holder_type = self._identify_type(row[i + 1])
                             if holder_type:
-                                if self.debug:
-                                    print(f"Found type in table right cell: {holder_type}")
+                                logger.debug("Found type in table right cell: %s", holder_type)
                                 return {
                                     "type": holder_type,
                                     "confidence": 0.85,
@@ -153,8 +152,7 @@ class TypeExtractor:
                         if j < len(next_row) and isinstance(next_row[j], str):
                             holder_type = self._identify_type(next_row[j])
                             if holder_type:
-                                if self.debug:
-                                    print(f"Found type in table below cell: {holder_type}")
+                                logger.debug("Found type in table below cell: %s", holder_type)
                                 return {
                                     "type": holder_type,
                                     "confidence": 0.8,
@@ -172,8 +170,7 @@ class TypeExtractor:
         
         # Check if name suggests joint account
         if self.joint_indicators.search(name_clean):
-            if self.debug:
-                print(f"Inferred joint account from name pattern: {name_clean}")
+            logger.debug("Inferred joint account from name pattern: %s", name_clean)
             return {
                 "type": "joint",
                 "confidence": 0.7,
@@ -183,8 +180,7 @@ class TypeExtractor:
         # Check if multiple names appear in the document (suggesting joint)
         name_parts = re.split(r"\s+and\s+|\s+&\s+", name_clean, flags=re.I)
         if len(name_parts) > 1:
-            if self.debug:
-                print(f"Multiple names detected: {name_parts}")
+            logger.debug("Multiple names detected: %s", name_parts)
             return {
                 "type": "joint", 
                 "confidence": 0.75,
@@ -208,8 +204,7 @@ class TypeExtractor:
             for match in matches:
                 holder_type = self._identify_type(match.group(0))
                 if holder_type:
-                    if self.debug:
-                        print(f"Found type via pattern: {holder_type}")
+                    logger.debug("Found type via pattern: %s", holder_type)
                     return {
                         "type": holder_type,
                         "confidence": 0.7,
@@ -1,6 +1,11 @@
+import logging
 from typing import List, Dict, Union
 from datetime import datetime
 
+from src.Logger import log_row
+
+logger = logging.getLogger(__name__)
+
 class SchemaNormalizer:
     def __init__(self, profile_accounts=None):
         """
@@ -93,7 +98,7 @@ class SchemaNormalizer:
                 # return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
             except:
                 continue
-        print(f"DEBUG: Failed to parse date '{date_str}' with any format")
+        log_row(logger, "Failed to parse date '%s' with any format", date_str)
         return ""
     
     def _get_account_number(self, txn: Dict, available_accounts: List[str]) -> str:
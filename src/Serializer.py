@@ -0,0 +1,139 @@
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Union
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
+JSON_BACKENDS = ("auto", "orjson", "json")
+
+
+def _default(obj):
+    # stdlib fallback for the types orjson handles natively
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONSerializer:
+    """
+    JSON output for analysis files and batch summaries.
+
+    backend: "orjson" (fast, needs the orjson package), "json" (stdlib) or
+             "auto" to use orjson when it is installed.
+    compact: no indentation / whitespace; otherwise 2-space indent, matching
+             the previous json.dump(..., indent=2) output.
+    Output is always UTF-8 with non-ASCII kept as-is (ensure_ascii=False).
+    """
+
+    def __init__(self, backend: str = "auto", compact: bool = False):
+        if backend not in JSON_BACKENDS:
+            raise ValueError(f"Unknown JSON backend '{backend}'. Choose from: {', '.join(JSON_BACKENDS)}")
+        if backend == "orjson" and orjson is None:
+            raise ImportError("orjson is not installed (pip install orjson)")
+        if backend == "auto":
+            backend = "orjson" if orjson is not None else "json"
+        self.backend = backend
+        self.compact = compact
+
+    def dumps(self, obj: Any) -> bytes:
+        if self.backend == "orjson":
+            option = orjson.OPT_NON_STR_KEYS
+            if not self.compact:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=_default, option=option)
+        if self.compact:
+            text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+        else:
+            text = json.dumps(obj, ensure_ascii=False, indent=2, default=_default)
+        return text.encode("utf-8")
+
+    def dump(self, obj: Any, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.write_bytes(self.dumps(obj))
+        return path
+
+    def dump_model(self, model, path: Union[str, Path]) -> Path:
+        """Write a pydantic model (e.g. BankStatement) straight from model_dump_json."""
+        path = Path(path)
+        text = model.model_dump_json(indent=None if self.compact else 2)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def ndjson_line(self, record: Any) -> bytes:
+        """One compact JSON document plus newline."""
+        if self.backend == "orjson":
+            return orjson.dumps(record, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":"),
+                          default=_default).encode("utf-8") + b"\n"
+
+    def write_ndjson(self, records: Iterable[Any], path: Union[str, Path]) -> Path:
+        """One compact JSON document per line, written as the records are consumed."""
+        with NDJSONStream(path, self) as stream:
+            stream.write(records)
+        return stream.path
+
+
+class NDJSONStream:
+    """An open .ndjson file that records are appended to batch by batch."""
+
+    def __init__(self, path: Union[str, Path], serializer: JSONSerializer = None):
+        self.path = Path(path)
+        self.serializer = serializer or JSONSerializer()
+        self._file = self.path.open("wb")
+
+    def __enter__(self) -> "NDJSONStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write(self, records: Iterable[Any]) -> None:
+        line = self.serializer.ndjson_line
+        self._file.writelines(line(record) for record in records)
+        self._file.flush()
+
+    def close(self) -> Path:
+        if not self._file.closed:
+            self._file.close()
+        return self.path
+
+
+class NDJSONWriter:
+    """
+    Write a statement as a small JSON (document_info, profile, summary) plus
+    <name>_transactions.ndjson with one transaction per line, so consumers
+    can stream transactions without parsing one large array. The pipeline
+    appends each parsed batch through open_transactions() as it arrives.
+    """
+
+    def __init__(self, output_dir: Path, serializer: JSONSerializer = None):
+        self.output_dir = Path(output_dir)
+        self.serializer = serializer or JSONSerializer()
+
+    def open_transactions(self, pdf_name: str) -> NDJSONStream:
+        """Start <name>_transactions.ndjson; write() batches to it while parsing."""
+        return NDJSONStream(self.output_dir / f"{pdf_name}_transactions.ndjson", self.serializer)
+
+    def write(self, pdf_name: str, document_data: Dict[str, Any],
+              transactions: NDJSONStream = None) -> Dict[str, str]:
+        """
+        Returns {"json": path, "transactions": path}. transactions: the stream
+        from open_transactions() the rows were already written to; it is
+        closed here. Without it the whole transaction list is written now.
+        """
+        if transactions is not None:
+            txn_path = transactions.close()
+        else:
+            txn_path = self.serializer.write_ndjson(
+                document_data.get("transactions") or [], self.output_dir / f"{pdf_name}_transactions.ndjson"
+            )
+        meta = {k: v for k, v in document_data.items() if k != "transactions"}
+        meta["transactions_file"] = txn_path.name
+        json_path = self.serializer.dump(meta, self.output_dir / f"{pdf_name}_analysis.json")
+        return {"json": str(json_path), "transactions": str(txn_path)}
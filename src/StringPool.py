@@ -0,0 +1,45 @@
+from typing import Dict, Optional
+
+# Distinct strings kept before the pool starts over
+DEFAULT_POOL_SIZE = 50_000
+# Longer values (narrations, addresses) rarely repeat; they are passed through
+MAX_INTERN_LENGTH = 64
+
+
+class StringPool:
+    """
+    Bounded intern pool for table cells. Bank tables repeat the same short
+    values (dates, "UPI", "0.00", branch names, page headers) thousands of
+    times; intern() returns one shared str per distinct value, so the copies
+    made by strip()/str() are dropped right away and later equality checks
+    and dict lookups hit the identity fast path.
+
+    Unlike sys.intern the pool is owned by its extractor/parser and capped at
+    max_size entries: when full it is cleared and refills with whatever is
+    still repeating.
+    """
+
+    __slots__ = ("max_size", "max_length", "_pool")
+
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE, max_length: int = MAX_INTERN_LENGTH):
+        self.max_size = max(1, int(max_size))
+        self.max_length = max_length
+        self._pool: Dict[str, str] = {}
+
+    def intern(self, value: str) -> str:
+        if len(value) > self.max_length:
+            return value
+        pooled = self._pool.get(value)
+        if pooled is not None:
+            return pooled
+        if len(self._pool) >= self.max_size:
+            self._pool.clear()
+        self._pool[value] = value
+        return value
+
+    def cell(self, value) -> Optional[str]:
+        """str(value).strip(), interned; None for blank cells."""
+        if value is None:
+            return None
+        text = (value if isinstance(value, str) else str(value)).strip()
+        return self.intern(text) if text else None
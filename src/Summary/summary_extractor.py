@@ -1,7 +1,10 @@
 from __future__ import annotations
 from typing import List, Dict, Any, Optional
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 class SummaryExtractor:
     """
     Extract summary information from bank statements.
@@ -36,8 +39,7 @@ class SummaryExtractor:
                 first_n_pages: int = 3,
                 existing_profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         
-        if self.debug:
-            print("Starting SummaryExtractor...")
+        logger.debug("Starting SummaryExtractor...")
         
         # Get text from first few pages
         texts = []
@@ -99,8 +101,7 @@ class SummaryExtractor:
                 # Clean up common artifacts
                 branch_name = re.sub(r"(cid:\d+|\(INR\))", "", after_label).strip()
                 if len(branch_name) > 3:
-                    if self.debug:
-                        print(f"Found branch via labeled text: {branch_name}")
+                    logger.debug("Found branch via labeled text: %s", branch_name)
                     return branch_name
         
         # 2. Try table extraction
@@ -118,8 +119,7 @@ class SummaryExtractor:
                             if i + 1 < len(row) and isinstance(row[i + 1], str):
                                 branch_candidate = row[i + 1].strip()
                                 if len(branch_candidate) > 3:
-                                    if self.debug:
-                                        print(f"Found branch via table right cell: {branch_candidate}")
+                                    logger.debug("Found branch via table right cell: %s", branch_candidate)
                                     return branch_candidate
         
         return None
@@ -132,8 +132,7 @@ class SummaryExtractor:
         if currency_matches:
             # Return the most common currency found
             currency = max(set(currency_matches), key=currency_matches.count)
-            if self.debug:
-                print(f"Found currency: {currency}")
+            logger.debug("Found currency: %s", currency)
             return currency.upper()
         
         # Check tables for currency info
@@ -145,8 +144,7 @@ class SummaryExtractor:
                         if isinstance(cell, str):
                             currency_match = self.currency_pattern.search(cell)
                             if currency_match:
-                                if self.debug:
-                                    print(f"Found currency in table: {currency_match.group(0)}")
+                                logger.debug("Found currency in table: %s", currency_match.group(0))
                                 return currency_match.group(0).upper()
         
         return None
@@ -166,15 +164,13 @@ class SummaryExtractor:
             # Look for IFSC pattern in the same line
             ifsc_match = self.ifsc_pattern.search(line)
             if ifsc_match:
-                if self.debug:
-                    print(f"Found IFSC via labeled text: {ifsc_match.group(0)}")
+                logger.debug("Found IFSC via labeled text: %s", ifsc_match.group(0))
                 return ifsc_match.group(0)
         
         # 2. Try pattern matching across text
         ifsc_matches = self.ifsc_pattern.findall(text)
         if ifsc_matches:
-            if self.debug:
-                print(f"Found IFSC via pattern: {ifsc_matches[0]}")
+            logger.debug("Found IFSC via pattern: %s", ifsc_matches[0])
             return ifsc_matches[0]
         
         # 3. Try table extraction
@@ -193,15 +189,13 @@ class SummaryExtractor:
                             if i + 1 < len(row) and isinstance(row[i + 1], str):
                                 ifsc_match = self.ifsc_pattern.search(row[i + 1])
                                 if ifsc_match:
-                                    if self.debug:
-                                        print(f"Found IFSC via table: {ifsc_match.group(0)}")
+                                    logger.debug("Found IFSC via table: %s", ifsc_match.group(0))
                                     return ifsc_match.group(0)
                         
                         # Check if this cell contains IFSC code directly
                         ifsc_match = self.ifsc_pattern.search(cell)
                         if ifsc_match:
-                            if self.debug:
-                                print(f"Found IFSC in table cell: {ifsc_match.group(0)}")
+                            logger.debug("Found IFSC in table cell: %s", ifsc_match.group(0))
                             return ifsc_match.group(0)
         
         return None
@@ -221,8 +215,7 @@ class SummaryExtractor:
             # Look for MICR pattern in the same line
             micr_match = self.micr_pattern.search(line)
             if micr_match:
-                if self.debug:
-                    print(f"Found MICR via labeled text: {micr_match.group(0)}")
+                logger.debug("Found MICR via labeled text: %s", micr_match.group(0))
                 return micr_match.group(0)
         
         # 2. Try table extraction
@@ -241,8 +234,7 @@ class SummaryExtractor:
                             if i + 1 < len(row) and isinstance(row[i + 1], str):
                                 micr_match = self.micr_pattern.search(row[i + 1])
                                 if micr_match:
-                                    if self.debug:
-                                        print(f"Found MICR via table: {micr_match.group(0)}")
+                                    logger.debug("Found MICR via table: %s", micr_match.group(0))
                                     return micr_match.group(0)
         
         # 3. Pattern matching (but be careful not to pick up account numbers)
@@ -258,8 +250,7 @@ class SummaryExtractor:
                 
                 # If context suggests it's MICR (not account number)
                 if any(word in context for word in ["micr", "code", "branch"]):
-                    if self.debug:
-                        print(f"Found MICR via pattern with context: {candidate}")
+                    logger.debug("Found MICR via pattern with context: %s", candidate)
                     return candidate
         
         return None
\ No newline at end of file
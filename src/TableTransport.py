@@ -0,0 +1,222 @@
+import struct
+import logging
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # optional: packed tables are then returned through the pool's pipe
+    shared_memory = None
+
+logger = logging.getLogger(__name__)
+
+# counts: tables, rows, cells, pool strings, blob bytes
+_HEADER = struct.Struct("<5q")
+# Packed results at least this big go through shared memory instead of the pipe
+SHARED_MEMORY_MIN_BYTES = 64 * 1024
+
+
+def _layout(n_tables: int, n_rows: int, n_cells: int, n_strings: int) -> Dict[str, tuple]:
+    """Byte (offset, length, typecode) of every section; int64 sections first so each stays aligned."""
+    sections = {}
+    pos = _HEADER.size
+    for name, count, code in (("string_offsets", n_strings + 1, "q"),
+                              ("page_numbers", n_tables, "i"),
+                              ("table_rows", n_tables + 1, "i"),
+                              ("row_cells", n_rows + 1, "i"),
+                              ("cells", n_cells, "i")):
+        size = count * array(code).itemsize
+        sections[name] = (pos, size, code)
+        pos += size
+    sections["blob"] = (pos, 0, "B")
+    return sections
+
+
+def pack_tables(tables: Iterable[Dict[str, Any]]) -> bytearray:
+    """
+    Encode backend tables ({"page_number", "rows"}) as one buffer: a string
+    pool (UTF-8 blob + offsets, every distinct cell value stored once) and
+    int32 arrays of pool indices per cell, row and table. Pool index 0 is None.
+    """
+    pool: Dict[str, int] = {}
+    strings: List[bytes] = []
+    page_numbers = array("i")
+    table_rows = array("i", [0])
+    row_cells = array("i", [0])
+    cells = array("i")
+    for table in tables:
+        page_numbers.append(table.get("page_number") or 0)
+        for row in table.get("rows") or []:
+            for cell in row:
+                if cell is None:
+                    cells.append(0)
+                    continue
+                text = cell if isinstance(cell, str) else str(cell)
+                index = pool.get(text)
+                if index is None:
+                    index = pool[text] = len(strings) + 1
+                    strings.append(text.encode("utf-8", "surrogatepass"))
+                cells.append(index)
+            row_cells.append(len(cells))
+        table_rows.append(len(row_cells) - 1)
+
+    string_offsets = array("q", [0])
+    total = 0
+    for encoded in strings:
+        total += len(encoded)
+        string_offsets.append(total)
+
+    layout = _layout(len(page_numbers), len(row_cells) - 1, len(cells), len(strings))
+    blob_start = layout["blob"][0]
+    buffer = bytearray(blob_start + total)
+    _HEADER.pack_into(buffer, 0, len(page_numbers), len(row_cells) - 1, len(cells), len(strings), total)
+    for name, values in (("string_offsets", string_offsets), ("page_numbers", page_numbers),
+                         ("table_rows", table_rows), ("row_cells", row_cells), ("cells", cells)):
+        start, size, _ = layout[name]
+        buffer[start:start + size] = values.tobytes()
+    buffer[blob_start:] = b"".join(strings)
+    return buffer
+
+
+class PackedRows(Sequence):
+    """One table's rows, decoded from the packed buffer only when accessed."""
+
+    __slots__ = ("_packed", "_first", "_count")
+
+    def __init__(self, packed: "PackedTables", first: int, count: int):
+        self._packed = packed
+        self._first = first
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._packed.row(self._first + i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("row index out of range")
+        return self._packed.row(self._first + index)
+
+    def __iter__(self) -> Iterator[List[Optional[str]]]:
+        row = self._packed.row
+        for i in range(self._first, self._first + self._count):
+            yield row(i)
+
+
+class PackedTables(Sequence):
+    """
+    Read side of pack_tables(). Each table is a plain {"page_number", "rows"}
+    dict whose rows is a PackedRows, so HeaderBasedTableParser and
+    AccountTableIndex use it unchanged. Pool strings are decoded once and the
+    same str object is shared by every cell holding that value.
+
+    Pickles as the raw buffer, so sending it between processes copies one
+    bytes object instead of a nested list of small strings.
+    """
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]):
+        self._buffer = bytes(buffer)
+        n_tables, n_rows, n_cells, n_strings, _ = _HEADER.unpack_from(self._buffer, 0)
+        view = memoryview(self._buffer)
+        layout = _layout(n_tables, n_rows, n_cells, n_strings)
+        arrays = {}
+        for name in ("string_offsets", "page_numbers", "table_rows", "row_cells", "cells"):
+            start, size, code = layout[name]
+            arrays[name] = view[start:start + size].cast(code)
+        self._string_offsets = arrays["string_offsets"]
+        self._page_numbers = arrays["page_numbers"]
+        self._table_rows = arrays["table_rows"]
+        self._row_cells = arrays["row_cells"]
+        self._cells = arrays["cells"]
+        self._blob = view[layout["blob"][0]:]
+        self._strings: List[Optional[str]] = [None] * (n_strings + 1)
+
+    @classmethod
+    def from_tables(cls, tables: Iterable[Dict[str, Any]]) -> "PackedTables":
+        return cls(pack_tables(tables))
+
+    def __reduce__(self):
+        return (PackedTables, (self._buffer,))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    def string(self, index: int) -> Optional[str]:
+        if index == 0:
+            return None
+        text = self._strings[index]
+        if text is None:
+            start, end = self._string_offsets[index - 1], self._string_offsets[index]
+            text = self._strings[index] = str(self._blob[start:end], "utf-8", "surrogatepass")
+        return text
+
+    def row(self, row_index: int) -> List[Optional[str]]:
+        string = self.string
+        start, end = self._row_cells[row_index], self._row_cells[row_index + 1]
+        return [string(i) for i in self._cells[start:end]]
+
+    def __len__(self) -> int:
+        return len(self._page_numbers)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("table index out of range")
+        first, end = self._table_rows[index], self._table_rows[index + 1]
+        return {"page_number": self._page_numbers[index] or None,
+                "rows": PackedRows(self, first, end - first)}
+
+
+class SharedTables:
+    """Picklable name of a shared-memory block holding pack_tables() output."""
+
+    __slots__ = ("name", "size")
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+
+    def __reduce__(self):
+        return (SharedTables, (self.name, self.size))
+
+
+def share_tables(tables: Iterable[Dict[str, Any]],
+                 min_bytes: int = SHARED_MEMORY_MIN_BYTES) -> Union[SharedTables, PackedTables]:
+    """
+    Worker side: pack tables and place large results in shared memory. The
+    block is unlinked by the receiving unshare_tables() call.
+    """
+    buffer = pack_tables(tables)
+    if shared_memory is None or len(buffer) < min_bytes:
+        return PackedTables(buffer)
+    block = shared_memory.SharedMemory(create=True, size=len(buffer))
+    # The parent owns the block from here; keep this worker's tracker from
+    # unlinking it as leaked when the worker exits.
+    resource_tracker.unregister(block._name, "shared_memory")
+    try:
+        block.buf[:len(buffer)] = buffer
+        return SharedTables(block.name, len(buffer))
+    finally:
+        block.close()
+
+
+def unshare_tables(result: Union[SharedTables, PackedTables, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Parent side: table dicts (with lazily decoded rows) from share_tables() output."""
+    if isinstance(result, SharedTables):
+        block = shared_memory.SharedMemory(name=result.name)
+        try:
+            packed = PackedTables(block.buf[:result.size])
+        finally:
+            block.close()
+            block.unlink()
+        logger.debug("Received %s tables (%s bytes) through shared memory", len(packed), result.size)
+        result = packed
+    return list(result)
@@ -0,0 +1,141 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+class WordTableBuilder:
+    """
+    Rebuild table rows from positioned words (tesseract boxes, PDF word coordinates).
+
+    Rows are clustered by the vertical centre of each word, columns by gaps in
+    the horizontal occupancy profile of all words on the page. Output rows have
+    the same shape as pdfplumber's extract_tables(): a list of cell lists with
+    None for empty cells, so HeaderBasedTableParser can consume them as-is.
+    """
+
+    def __init__(self,
+                 row_tolerance: float = 0.5,
+                 min_column_gap: float = 0.8,
+                 column_noise: float = 0.15):
+        # row_tolerance / min_column_gap are multiples of the median word height;
+        # column_noise is the share of the busiest column's coverage allowed to
+        # spill across a gap (long narrations, free-text address blocks above
+        # the table bridging two amount columns).
+        self.row_tolerance = row_tolerance
+        self.min_column_gap = min_column_gap
+        self.column_noise = column_noise
+
+    def assign_rows(self, y0: np.ndarray, y1: np.ndarray) -> np.ndarray:
+        """Row id per word, ordered top to bottom."""
+        yc = (y0 + y1) / 2.0
+        med_h = float(np.median(y1 - y0)) or 1.0
+        order = np.argsort(yc, kind="stable")
+        breaks = np.diff(yc[order]) > self.row_tolerance * med_h
+        row_ids = np.empty(len(yc), dtype=np.int64)
+        row_ids[order] = np.concatenate(([0], np.cumsum(breaks)))
+        return row_ids
+
+    @staticmethod
+    def _coverage(x0: np.ndarray, x1: np.ndarray, origin: float) -> np.ndarray:
+        """Words covering each 1pt x slot, starting at origin."""
+        width = int(np.ceil(float(x1.max()) - origin)) + 1
+        left = np.clip(np.floor(x0 - origin).astype(np.int64), 0, width)
+        right = np.clip(np.ceil(x1 - origin).astype(np.int64), 0, width)
+
+        coverage = np.zeros(width + 1, dtype=np.int64)
+        np.add.at(coverage, left, 1)
+        np.add.at(coverage, right, -1)
+        return np.cumsum(coverage)[:width]
+
+    def segment_line(self, x0: np.ndarray, x1: np.ndarray, word_height: float) -> np.ndarray:
+        """Cell id per word of one line, split where the gap exceeds min_column_gap."""
+        order = np.argsort(x0, kind="stable")
+        right_edge = np.maximum.accumulate(x1[order])
+        gaps = x0[order][1:] - right_edge[:-1]
+        cell_ids = np.empty(len(x0), dtype=np.int64)
+        cell_ids[order] = np.concatenate(([0], np.cumsum(gaps > self.min_column_gap * word_height)))
+        return cell_ids
+
+    def header_boundaries(self,
+                          cell_x0: np.ndarray,
+                          cell_x1: np.ndarray,
+                          body_x0: np.ndarray,
+                          body_x1: np.ndarray) -> np.ndarray:
+        """
+        Column boundaries from a header row: one between each pair of adjacent
+        header cells, placed in the emptiest stretch of the body words below
+        (right-aligned amounts often stick out past their header label).
+        """
+        if len(body_x0) == 0:
+            return (cell_x1[:-1] + cell_x0[1:]) / 2.0
+        origin = float(min(body_x0.min(), cell_x0.min()))
+        coverage = self._coverage(body_x0, body_x1, origin)
+
+        boundaries = []
+        for left, right in zip(cell_x1[:-1], cell_x0[1:]):
+            lo = int(np.ceil(left - origin))
+            hi = min(int(np.floor(right - origin)), len(coverage))
+            if hi <= lo:
+                boundaries.append((left + right) / 2.0)
+                continue
+            window = coverage[lo:hi]
+            quiet = np.flatnonzero(window == window.min())
+            # middle of the first run of least-covered slots
+            breaks = np.flatnonzero(np.diff(quiet) > 1)
+            run_end = quiet[breaks[0]] if len(breaks) else quiet[-1]
+            boundaries.append(origin + lo + (quiet[0] + run_end + 1) / 2.0)
+        return np.asarray(boundaries, dtype=np.float64)
+
+    def column_boundaries(self,
+                          x0: np.ndarray,
+                          x1: np.ndarray,
+                          word_height: float) -> np.ndarray:
+        """x positions separating columns, from gaps in the word occupancy profile."""
+        origin = float(x0.min())
+        coverage = self._coverage(x0, x1, origin)
+        width = len(coverage)
+
+        empty = coverage <= int(self.column_noise * coverage.max())
+        edges = np.diff(np.concatenate(([0], empty.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        interior = (starts > 0) & (ends < width)
+        wide = (ends - starts) >= self.min_column_gap * word_height
+        keep = interior & wide
+        return origin + (starts[keep] + ends[keep]) / 2.0
+
+    def build(self,
+              x0: Sequence[float],
+              y0: Sequence[float],
+              x1: Sequence[float],
+              y1: Sequence[float],
+              texts: Sequence[str],
+              boundaries: Optional[np.ndarray] = None) -> List[List[Optional[str]]]:
+        """
+        Build table rows from word boxes.
+
+        boundaries: optional precomputed column boundaries (e.g. learned from a
+                    header row); inferred from the words themselves otherwise.
+        """
+        if len(texts) == 0:
+            return []
+
+        x0 = np.asarray(x0, dtype=np.float64)
+        y0 = np.asarray(y0, dtype=np.float64)
+        x1 = np.asarray(x1, dtype=np.float64)
+        y1 = np.asarray(y1, dtype=np.float64)
+
+        row_ids = self.assign_rows(y0, y1)
+        n_rows = int(row_ids.max()) + 1
+        if boundaries is None:
+            word_height = float(np.median(y1 - y0)) or 1.0
+            boundaries = self.column_boundaries(x0, x1, word_height)
+        col_ids = np.searchsorted(boundaries, (x0 + x1) / 2.0)
+        n_cols = len(boundaries) + 1
+
+        rows: List[List[Optional[str]]] = [[None] * n_cols for _ in range(n_rows)]
+        for i in np.lexsort((x0, col_ids, row_ids)):
+            r, c = row_ids[i], col_ids[i]
+            cell = rows[r][c]
+            rows[r][c] = texts[i] if cell is None else f"{cell} {texts[i]}"
+        return rows
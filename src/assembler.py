@@ -0,0 +1,171 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.models import (
+    BankStatement,
+    Profile,
+    Summary,
+    Transaction,
+    TransactionsMeta,
+    construct_transactions,
+    transaction_row,
+    validate_transactions,
+)
+from src.models.fields import blank_to_none
+
+
+class _AccountStream:
+    """Running state for one maskedAccNumber: rows plus incremental meta/totals."""
+
+    __slots__ = ("rows", "count", "from_ts", "to_ts", "total_credit", "total_debit")
+
+    def __init__(self):
+        self.rows: List[Dict[str, Any]] = []
+        self.count = 0
+        self.from_ts: Optional[int] = None
+        self.to_ts: Optional[int] = None
+        self.total_credit = 0.0
+        self.total_debit = 0.0
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.rows.append(row)
+        self.count += 1
+        ts = row.get("valueDate") or row.get("transactionTimestamp")
+        if ts is not None:
+            if self.from_ts is None or ts < self.from_ts:
+                self.from_ts = ts
+            if self.to_ts is None or ts > self.to_ts:
+                self.to_ts = ts
+        amount = row.get("amount")
+        if isinstance(amount, (int, float)):
+            kind = (row.get("type") or "").lower()
+            if kind == "credit":
+                self.total_credit += amount
+            elif kind == "debit":
+                self.total_debit += amount
+
+    @classmethod
+    def merge(cls, streams: Iterable["_AccountStream"]) -> "_AccountStream":
+        """One stream holding the rows of `streams` in order; their stats are combined, not recomputed."""
+        merged = cls()
+        for stream in streams:
+            merged.rows.extend(stream.rows)
+            merged.count += stream.count
+            merged.total_credit += stream.total_credit
+            merged.total_debit += stream.total_debit
+            if stream.from_ts is not None and (merged.from_ts is None or stream.from_ts < merged.from_ts):
+                merged.from_ts = stream.from_ts
+            if stream.to_ts is not None and (merged.to_ts is None or stream.to_ts > merged.to_ts):
+                merged.to_ts = stream.to_ts
+        return merged
+
+
+class BankStatementAssembler:
+    """
+    Build src.models.BankStatement documents from profile, summary and the
+    transaction stream.
+
+    Transactions are fed with add()/extend() as they are parsed; each row is
+    converted once and routed to its account, and TransactionsMeta (from/to
+    timestamps, noOfTransactions) plus credit/debit totals are kept up to date
+    on the way, so build() needs no further pass over the rows.
+
+    validate: run the rows through the bulk TypeAdapter instead of the
+              trusted model_construct path.
+    """
+
+    def __init__(self, validate: bool = False):
+        self.validate = validate
+        self._streams: Dict[Optional[str], _AccountStream] = {}
+        # account of the last row that had one; unassigned rows go there
+        self._current: Optional[str] = None
+
+    def add(self, txn: Dict[str, Any]) -> None:
+        row = transaction_row(txn)
+        account = row.get("maskedAccNumber")
+        if account is None:
+            # continuation row (wrapped narration, blank balance line, ...)
+            # of the account section it appears in
+            account = self._current
+        else:
+            self._current = account
+        stream = self._streams.get(account)
+        if stream is None:
+            stream = self._streams[account] = _AccountStream()
+        stream.add(row)
+
+    def extend(self, txns: Iterable[Dict[str, Any]]) -> None:
+        for txn in txns:
+            self.add(txn)
+
+    @property
+    def accounts(self) -> List[Optional[str]]:
+        return list(self._streams)
+
+    def _transactions(self, rows: List[Dict[str, Any]]) -> List[Transaction]:
+        return validate_transactions(rows) if self.validate else construct_transactions(rows, converted=True)
+
+    @staticmethod
+    def _profile_items(profile: Dict[str, Any], account: Optional[str]) -> List[Profile]:
+        item = dict(profile or {})
+        masked = item.get("maskedAccNumber")
+        if isinstance(masked, list):
+            # main1 collects every account number found on the first pages
+            item["maskedAccNumber"] = account or (masked[0] if masked else None)
+        elif account:
+            item["maskedAccNumber"] = account
+        return [Profile.model_validate({k: blank_to_none(v) for k, v in item.items()})]
+
+    def build(self,
+              profile: Optional[Dict[str, Any]] = None,
+              summary: Optional[Dict[str, Any]] = None,
+              split_accounts: bool = True) -> List[BankStatement]:
+        """
+        One BankStatement per maskedAccNumber (split_accounts=True), or a single
+        document holding every transaction. Rows without an account number
+        belong to the account that precedes them in the stream; rows before
+        the first account number go to that first account.
+        """
+        streams = self._streams
+        if None in streams and len(streams) > 1:
+            streams = dict(streams)
+            unassigned = streams.pop(None)
+            first = next(iter(streams))
+            streams[first] = _AccountStream.merge((unassigned, streams[first]))
+
+        if not split_accounts and len(streams) > 1:
+            streams = {None: _AccountStream.merge(streams.values())}
+        if not streams:
+            streams = {None: _AccountStream()}
+
+        documents = []
+        for account, stream in streams.items():
+            summary_data = {k: blank_to_none(v) for k, v in (summary or {}).items()}
+            if account:
+                summary_data["maskedAccNumber"] = account
+            meta = TransactionsMeta(
+                fipId=summary_data.get("fipId"),
+                linkedAccRef=summary_data.get("linkedAccRef"),
+                fnrkAccountId=summary_data.get("fnrkAccountId"),
+                maskedAccNumber=account or summary_data.get("maskedAccNumber"),
+                fromTimestamp=stream.from_ts,
+                toTimestamp=stream.to_ts,
+                noOfTransactions=stream.count,
+                totalCredit=round(stream.total_credit, 2),
+                totalDebit=round(stream.total_debit, 2),
+            )
+            documents.append(BankStatement(
+                profile=self._profile_items(profile, account),
+                summary=Summary.model_validate(summary_data),
+                transactions=self._transactions(stream.rows),
+                transactionsMeta=meta,
+            ))
+        return documents
+
+    def assemble(self,
+                 profile: Optional[Dict[str, Any]],
+                 summary: Optional[Dict[str, Any]],
+                 transactions: Iterable[Dict[str, Any]],
+                 split_accounts: bool = True) -> List[BankStatement]:
+        """Convenience: extend() + build() in one call."""
+        self.extend(transactions)
+        return self.build(profile, summary, split_accounts=split_accounts)
@@ -0,0 +1,13 @@
+# Per-bank table-extraction backend, keyed by the 4-letter IFSC bank code.
+# Used by PDFTextExtractor.select_table_backend() when the backend is "auto";
+# banks not listed here use the default (pdfplumber).
+# Values must be names from PDFTextExtractor.TABLE_BACKENDS
+# ("pdfplumber", "pymupdf", "words", "columns"). Pick them with bench_tables.py
+# on that bank's statements; "columns" is not used for any bank until benchmarked.
+BANK_TABLE_BACKENDS = {
+    "HDFC": "pdfplumber",
+    "ICIC": "pdfplumber",
+    "SBIN": "pdfplumber",
+    "PUNB": "pdfplumber",
+    "ESFB": "pdfplumber",
+}
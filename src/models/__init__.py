@@ -1,6 +1,6 @@
 from .profile import Profile
 from .summary import Summary
-from .transaction import Transaction
+from .transaction import Transaction, transactions_adapter, validate_transactions, construct_transactions, transaction_row
 from .transactions_meta import TransactionsMeta
 from .bank_statement import BankStatement
 
@@ -10,4 +10,8 @@ __all__ = [
     "Transaction",
     "TransactionsMeta",
     "BankStatement",
+    "transactions_adapter",
+    "validate_transactions",
+    "construct_transactions",
+    "transaction_row",
 ]
@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+from typing import Annotated, Optional, Union
+from pydantic import BeforeValidator
+
+
+def blank_to_none(v):
+    return None if isinstance(v, str) and v.strip() == "" else v
+
+
+def to_num_or_str(v):
+    """"1,785.00" -> 1785.0; blank -> None; anything unparseable stays a string."""
+    v = blank_to_none(v)
+    if v is None or isinstance(v, float):
+        return v
+    s = str(v).strip()
+    try:
+        return float(s.replace(",", ""))
+    except ValueError:
+        return s
+
+
+def to_int_or_none(v):
+    v = blank_to_none(v)
+    if v is None:
+        return None
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        try:
+            return int(float(str(v).replace(",", "")))
+        except (TypeError, ValueError):
+            return None
+
+
+def to_epoch_ms(v):
+    """"2024-04-01" (SchemaNormalizer dates) -> epoch ms at UTC midnight; blank or unparseable -> None."""
+    v = blank_to_none(v)
+    if v is None or isinstance(v, int):
+        return v
+    if isinstance(v, float):
+        return int(v)
+    try:
+        dt = datetime.strptime(str(v).strip()[:10], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        return int(dt.timestamp() * 1000)
+    except ValueError:
+        return None
+
+
+# Plain Annotated validators run inside pydantic-core, so they also apply on
+# the TypeAdapter(List[Transaction]) fast path
+NumberLike = Annotated[Optional[Union[float, str]], BeforeValidator(to_num_or_str)]
+IntLike = Annotated[Optional[int], BeforeValidator(to_int_or_none)]
+EpochMs = Annotated[Optional[int], BeforeValidator(to_epoch_ms)]
@@ -1,5 +1,8 @@
-from typing import Optional, Union
-from pydantic import BaseModel
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+from .fields import EpochMs, NumberLike, blank_to_none, to_epoch_ms, to_num_or_str
 
 class Transaction(BaseModel):
     """Single transaction row."""
@@ -7,16 +10,59 @@ class Transaction(BaseModel):
     type: Optional[str] = None                        # CREDIT/DEBIT
     fipId: Optional[str] = None
     txnId: Optional[str] = None
-    amount: Optional[Union[float, str]] = None
+    amount: NumberLike = None                         # "1,785.00" -> 1785.0, "" -> None
     narration: Optional[str] = None
     reference: Optional[str] = None
-    valueDate: Optional[int] = None                   # epoch ms
+    valueDate: EpochMs = None                         # "2024-04-01" -> epoch ms
     account_type: Optional[str] = None
     linkedAccRef: Optional[str] = None
     fnrkAccountId: Optional[str] = None
-    currentBalance: Optional[Union[str, float]] = None
+    currentBalance: NumberLike = None
     maskedAccNumber: Optional[str] = None
-    transactionTimestamp: Optional[int] = None        # epoch ms
+    transactionTimestamp: EpochMs = None              # epoch ms
+
+    model_config = ConfigDict(extra="allow")
+
+
+@lru_cache(maxsize=None)
+def transactions_adapter() -> TypeAdapter:
+    """Cached TypeAdapter(List[Transaction]); building the validator is the expensive part."""
+    return TypeAdapter(List[Transaction])
+
+
+def validate_transactions(rows: Iterable[Dict[str, Any]]) -> List[Transaction]:
+    """Validate a whole list of rows in one pydantic-core call."""
+    return transactions_adapter().validate_python(list(rows))
+
+
+# model_construct skips the field validators, so the trusted path applies them itself
+_ROW_CONVERTERS = {
+    "amount": to_num_or_str,
+    "currentBalance": to_num_or_str,
+    "valueDate": to_epoch_ms,
+    "transactionTimestamp": to_epoch_ms,
+}
+
+
+def transaction_row(txn: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    A SchemaNormalizer row as Transaction field values: blank strings -> None,
+    "YYYY-MM-DD" dates -> epoch ms, amount strings -> numbers.
+    """
+    row = {k: blank_to_none(v) for k, v in txn.items()}
+    for field, convert in _ROW_CONVERTERS.items():
+        if field in row:
+            row[field] = convert(row[field])
+    return row
+
 
-    class Config:
-        extra = "allow"
+def construct_transactions(rows: Iterable[Dict[str, Any]], converted: bool = False) -> List[Transaction]:
+    """
+    Trusted fast path: wrap rows without validation (model_construct).
+    Rows are passed through transaction_row() first, so SchemaNormalizer
+    output works as-is; converted=True skips that for rows that already
+    were (BankStatementAssembler converts every row once in add()).
+    """
+    if not converted:
+        rows = map(transaction_row, rows)
+    return [Transaction.model_construct(**row) for row in rows]
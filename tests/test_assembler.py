@@ -0,0 +1,48 @@
+from src.assembler import BankStatementAssembler
+
+
+def _txn(account, amount, date="2024-04-01", kind="debit"):
+    return {"maskedAccNumber": account, "amount": amount, "type": kind, "valueDate": date, "narration": "x"}
+
+
+def test_unassigned_rows_follow_the_preceding_account():
+    documents = BankStatementAssembler().assemble({"name": "A"}, {}, [
+        _txn("111", 10.0),
+        _txn("", "", date=""),                   # blank continuation row
+        _txn("111", 20.0),
+        _txn("222", 5.0, kind="credit"),
+        _txn(None, 1.0),
+    ])
+    assert [d.transactionsMeta.maskedAccNumber for d in documents] == ["111", "222"]
+    assert [d.transactionsMeta.noOfTransactions for d in documents] == [3, 2]
+    assert documents[0].transactionsMeta.totalDebit == 30.0
+    assert documents[1].transactionsMeta.totalDebit == 1.0
+
+
+def test_leading_unassigned_rows_go_to_the_first_account():
+    documents = BankStatementAssembler().assemble({}, {}, [
+        _txn("", 7.0),
+        _txn("111", 10.0),
+        _txn("222", 5.0),
+    ])
+    assert len(documents) == 2
+    assert [t.amount for t in documents[0].transactions] == [7.0, 10.0]
+
+
+def test_single_account_and_merged_documents():
+    rows = [_txn("111", 10.0), _txn("", 2.0)]
+    assert len(BankStatementAssembler().assemble({}, {}, rows)) == 1
+    merged = BankStatementAssembler().assemble({}, {}, rows + [_txn("222", 1.0)], split_accounts=False)
+    assert len(merged) == 1 and merged[0].transactionsMeta.noOfTransactions == 3
+
+
+def test_merged_streams_keep_meta_and_totals():
+    rows = [_txn("", 7.0, date="2024-03-30"), _txn("111", 10.0, date="2024-04-02"),
+            _txn("222", 5.0, date="2024-04-05", kind="credit"), _txn("111", 1.0, date="2024-04-01")]
+    first = BankStatementAssembler().assemble({}, {}, rows)[0].transactionsMeta
+    assert (first.noOfTransactions, first.totalDebit) == (3, 18.0)
+    merged = BankStatementAssembler().assemble({}, {}, rows, split_accounts=False)[0]
+    meta = merged.transactionsMeta
+    assert (meta.noOfTransactions, meta.totalDebit, meta.totalCredit) == (4, 18.0, 5.0)
+    assert (meta.fromTimestamp, meta.toTimestamp) == (1711756800000, 1712275200000)
+    assert [t.amount for t in merged.transactions] == [7.0, 10.0, 1.0, 5.0]
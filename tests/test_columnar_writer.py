@@ -0,0 +1,32 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.dataset as ds
+
+from src.ColumnarWriter import ColumnarWriter, TRANSACTION_COLUMNS, transactions_to_table
+from src.SchemaNormalizer import SchemaNormalizer
+
+
+def _transactions():
+    return SchemaNormalizer().normalize_transactions([
+        {"txn_date": "01/04/2024", "description": "UPI/SHOP", "debit": "1,785.00", "balance": "900.00"},
+        {"txn_date": "02/04/2024", "description": "SALARY", "credit": "5000", "balance": "5900.00"},
+    ], profile_accounts=["040901501624"])
+
+
+def test_empty_transactions_keep_full_schema():
+    assert transactions_to_table([]).schema == transactions_to_table(_transactions()).schema
+    assert tuple(transactions_to_table([]).column_names) == TRANSACTION_COLUMNS
+
+
+@pytest.mark.parametrize("empty_first", [True, False])
+def test_dataset_with_empty_and_non_empty_statements(tmp_path, empty_first):
+    writer = ColumnarWriter(tmp_path / "out", dataset_dir=tmp_path / "transactions")
+    docs = [("a_empty", []), ("b_icici", _transactions())]
+    for name, transactions in (docs if empty_first else docs[::-1]):
+        writer.write(name, {"document_info": {}, "transactions": transactions})
+
+    table = ds.dataset(tmp_path / "transactions", partitioning="hive").to_table()
+    assert set(TRANSACTION_COLUMNS) <= set(table.column_names)
+    assert table.num_rows == 2
+    assert sorted(table.column("amount").to_pylist()) == [1785.0, 5000.0]
@@ -0,0 +1,54 @@
+import logging
+
+import pytest
+
+from src.CSVExtractor import CSVExtractor
+
+PREAMBLE = [["Account Name", "Anurag Sinha"], ["Account Number", "040901501624"]]
+HEADER = ["Date", "Narration", "Withdrawal Amt", "Deposit Amt", "Closing Balance"]
+ROWS = [["01/04/2024", "UPI/CAFÉ", "1,785.00", "", "8,215.00"],
+        ["02/04/2024", "SALARY", "", "5000.00", "13,215.00"]]
+
+
+def _write(path, delimiter, encoding="utf-8", preamble=PREAMBLE):
+    def quote(cell):
+        return f'"{cell}"' if delimiter in cell else cell
+    lines = [delimiter.join(quote(c) for c in row) for row in list(preamble) + [HEADER] + ROWS]
+    path.write_bytes(("\n".join(lines) + "\n").encode(encoding))
+    return str(path)
+
+
+def _parse(extractor):
+    return extractor.parser.parse(extractor.extract_tables())
+
+
+@pytest.mark.parametrize("delimiter", [",", ";", "\t", "|"])
+@pytest.mark.parametrize("preamble", [PREAMBLE, []], ids=["preamble", "bare"])
+def test_delimiter_found_past_the_preamble(tmp_path, delimiter, preamble):
+    extractor = CSVExtractor(_write(tmp_path / "stmt.csv", delimiter, preamble=preamble))
+    assert extractor.dialect.delimiter == delimiter
+    assert extractor.header_index == len(preamble)
+    txns = _parse(extractor)
+    assert [t["description"] for t in txns] == ["UPI/CAFÉ", "SALARY"]
+    if preamble:
+        assert "Anurag Sinha" in extractor.extract_text_pages()[0]["text"]
+
+
+def test_non_utf8_export(tmp_path):
+    extractor = CSVExtractor(_write(tmp_path / "stmt.csv", ";", encoding="cp1252"))
+    assert extractor.encoding == "cp1252"
+    assert [t["description"] for t in _parse(extractor)] == ["UPI/CAFÉ", "SALARY"]
+
+
+def test_small_chunks_keep_every_row(tmp_path):
+    extractor = CSVExtractor(_write(tmp_path / "stmt.csv", "\t"), chunk_rows=1)
+    assert len(_parse(extractor)) == 2
+
+
+def test_missing_header_is_logged(tmp_path, caplog):
+    path = tmp_path / "notes.csv"
+    path.write_text("just;some;notes\nnothing;to;parse\n")
+    with caplog.at_level(logging.WARNING, logger="src.CSVExtractor"):
+        extractor = CSVExtractor(str(path))
+    assert extractor.header_index is None
+    assert "No transaction header" in caplog.text
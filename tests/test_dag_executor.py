@@ -0,0 +1,53 @@
+import threading
+from concurrent.futures import Future
+
+from src.Graphs.dag_executor import DAGExecutor, FutureSequence, Node
+
+
+def _text_only(raw_pages, tables):
+    return raw_pages[0]
+
+
+def _table_fallback(raw_pages, tables):
+    return raw_pages[0] if raw_pages else len(tables)
+
+
+def test_lazy_node_runs_while_tables_pending():
+    tables = Future()
+    with DAGExecutor(max_workers=2) as executor:
+        futures = executor.submit([Node("name", _text_only, ("raw_pages", "tables"), lazy=("tables",))],
+                                  {"raw_pages": ["page text"], "tables": tables})
+        assert futures["name"].result(timeout=5) == "page text"
+        assert not tables.done()
+        tables.set_result([])
+
+
+def test_eager_node_waits_for_tables():
+    tables = Future()
+    with DAGExecutor(max_workers=2) as executor:
+        futures = executor.submit([Node("addr", _text_only, ("raw_pages", "tables"))],
+                                  {"raw_pages": ["page text"], "tables": tables})
+        assert not futures["addr"].done()
+        tables.set_result([{"rows": []}])
+        assert futures["addr"].result(timeout=5) == "page text"
+
+
+def test_lazy_fallback_reads_tables_once_ready():
+    tables = Future()
+    threading.Timer(0.1, tables.set_result, ([{"rows": []}, {"rows": []}],)).start()
+    with DAGExecutor(max_workers=2) as executor:
+        result = executor.run([Node("acct", _table_fallback, ("raw_pages", "tables"), lazy=("tables",))],
+                              {"raw_pages": [], "tables": tables})
+    assert result["acct"] == 2
+
+
+def test_future_sequence_behaves_like_list():
+    future = Future()
+    future.set_result([{"page_number": 1}, {"page_number": 2}])
+    tables = FutureSequence(future)
+    assert len(tables) == 2 and bool(tables)
+    assert tables[:1] == [{"page_number": 1}]
+    assert [t["page_number"] for t in tables] == [1, 2]
+    empty = Future()
+    empty.set_result(None)
+    assert not FutureSequence(empty)
@@ -0,0 +1,67 @@
+from src.HeaderParser import HeaderBasedTableParser
+
+HEADER = ["Date", "Narration", "Withdrawal Amt", "Deposit Amt", "Closing Balance"]
+
+
+def _table(*rows, page=1):
+    return {"page_number": page, "rows": [list(row) for row in rows]}
+
+
+def _descriptions(txns):
+    return [t["description"] for t in txns]
+
+
+def test_continuation_rows_stitch_within_a_table():
+    txns = HeaderBasedTableParser().parse([_table(
+        HEADER,
+        ["01/04/2024", "UPI/SHOP", "100.00", None, "900.00"],
+        [None, "GROCERIES PUNE", None, None, None],
+        [None, "REF 123", None, None, None],
+        ["02/04/2024", "SALARY", None, "5000.00", "5900.00"],
+    )])
+    assert _descriptions(txns) == ["UPI/SHOP GROCERIES PUNE REF 123", "SALARY"]
+
+
+def test_continuation_on_next_page_extends_the_held_back_transaction():
+    batches = list(HeaderBasedTableParser().iter_parse([
+        _table(HEADER,
+               ["01/04/2024", "NEFT/ACME", None, "10.00", "10.00"],
+               ["02/04/2024", "IMPS/JOHN", "5.00", None, "5.00"], page=1),
+        _table([None, "DOE SAVINGS", None, None, None],
+               ["03/04/2024", "ATM", "1.00", None, "4.00"], page=2),
+    ]))
+    assert [_descriptions(b) for b in batches] == [["NEFT/ACME"], ["IMPS/JOHN DOE SAVINGS"], ["ATM"]]
+
+
+def test_rows_with_amounts_are_not_stitched():
+    txns = HeaderBasedTableParser().parse([_table(
+        HEADER,
+        ["01/04/2024", "UPI/SHOP", "100.00", None, "900.00"],
+        [None, "CHARGES", "2.00", None, "898.00"],
+        [None, "BALANCE LINE", None, None, "898.00"],
+    )])
+    assert _descriptions(txns) == ["UPI/SHOP"]
+
+
+def test_stitching_disabled():
+    txns = HeaderBasedTableParser(stitch_continuations=False).parse([_table(
+        HEADER,
+        ["01/04/2024", "UPI/SHOP", "100.00", None, "900.00"],
+        [None, "GROCERIES", None, None, None],
+    )])
+    assert _descriptions(txns) == ["UPI/SHOP"]
+
+
+def test_continuation_does_not_cross_into_another_account():
+    accounts = [{"account_number": "111122223333", "confidence": 0.9},
+                {"account_number": "444455556666", "confidence": 0.8}]
+    txns = HeaderBasedTableParser().parse([
+        _table(["Account Number", "111122223333", "Savings", None, None],
+               HEADER,
+               ["01/04/2024", "UPI/SHOP", "100.00", None, "900.00"], page=1),
+        _table(["Account Number", "444455556666", "Current", None, None], page=2),
+        _table([None, "TRANSFER FROM SAVINGS", None, None, None],
+               ["02/04/2024", "NEFT/IN", None, "50.00", "50.00"], page=3),
+    ], accounts)
+    assert [(t["description"], t["account_number"]) for t in txns] == [
+        ("UPI/SHOP", "111122223333"), ("NEFT/IN", "444455556666")]
@@ -0,0 +1,130 @@
+import threading
+
+import pytest
+
+import src.Ingestion as ingestion
+from src.Ingestion import iter_process_pdf
+from src.Profile.address_extractor import AddressExtractor
+from src.Profile.name_extractor import NameExtractor
+
+PAGE_TEXT = "Statement of Account\nName: Anurag Sinha\nAccount No: 040901501624\nIFSC: ICIC0000409"
+HEADER = ["Date", "Narration", "Withdrawal Amt.", "Deposit Amt.", "Closing Balance"]
+
+
+class SlowTailTables:
+    """Table backend whose tail pages wait until the test releases them."""
+
+    page_independent = True
+
+    def __init__(self, head_pages):
+        self.head_pages = set(head_pages)
+        self.release = threading.Event()
+        self.tail_done = threading.Event()
+
+    def extract_tables(self, pages=None):
+        if pages and not self.head_pages.issuperset(pages):
+            self.release.wait(timeout=5)
+            self.tail_done.set()
+        return [{"page_number": p, "rows": [HEADER, ["01/04/2024", "UPI/SHOP", "100.00", "", "900.00"]]}
+                for p in pages or []]
+
+
+@pytest.fixture
+def slow_pdf(monkeypatch):
+    pages = [{"page_no": n, "text": PAGE_TEXT} for n in range(1, 6)]
+    tables = SlowTailTables(head_pages=[1, 2, 3])
+
+    class FakeText:
+        def __init__(self, pdf_path, password=None):
+            pass
+
+        def extractor(self):
+            return pages
+
+    monkeypatch.setattr(ingestion, "PDFTextExtractor", FakeText)
+    monkeypatch.setattr(ingestion, "get_table_extractor", lambda backend, path, password=None: tables)
+    return tables
+
+
+def test_profile_overlaps_tail_tables_on_owned_executor(slow_pdf):
+    events = iter_process_pdf("slow.pdf", NameExtractor(), AddressExtractor(), first_n_pages=3)
+    first = next(events)
+    assert first["event"] == "profile"
+    # the owned executor must not queue the profile graph behind the tail pages
+    assert not slow_pdf.tail_done.is_set()
+    slow_pdf.release.set()
+    rest = [event["event"] for event in events]
+    assert slow_pdf.tail_done.is_set()
+    assert rest[0] == "summary" and rest[-1] == "done"
+
+
+def test_runner_emits_profile_before_slow_tail_tables(slow_pdf):
+    with ingestion.IngestionRunner(table_workers=0) as runner:
+        events = runner.iter_process("slow.pdf")
+        assert [next(events)["event"], next(events)["event"]] == ["profile", "summary"]
+        assert not slow_pdf.tail_done.is_set()
+        slow_pdf.release.set()
+        assert [event["event"] for event in events][-1] == "done"
+
+
+def test_ndjson_transactions_written_as_batches_arrive(slow_pdf, tmp_path):
+    slow_pdf.release.set()
+    ndjson = tmp_path / "slow_transactions.ndjson"
+    with ingestion.IngestionRunner(output_dir=tmp_path, output_format="ndjson", table_workers=0) as runner:
+        written = 0
+        for event in runner.iter_process("slow.pdf"):
+            if event["event"] == "transactions":
+                written += len(event["data"])
+                assert len(ndjson.read_text().splitlines()) == written
+            assert event["event"] != "error", event
+    assert written > 0
+
+
+class WholeDocumentTables:
+    """Page-dependent backend: every call reads the pages it is given."""
+
+    page_independent = False
+
+    def extract_tables(self, pages=None):
+        return [{"page_number": p, "rows": [HEADER, ["01/04/2024", f"UPI/PAGE{p}", "100.00", "", "900.00"]]}
+                for p in pages or range(1, 6)]
+
+
+def test_whole_document_backend_ocrs_each_scanned_page_once(monkeypatch):
+    pages = [{"page_no": n, "text": PAGE_TEXT} for n in range(1, 6)]
+    ocr_calls = []
+
+    class FakeText:
+        def __init__(self, pdf_path, password=None):
+            pass
+
+        def extractor(self):
+            return pages
+
+        def scanned_pages(self, pages=None):
+            return {2: "scanned", 4: "scanned"}
+
+    class FakeOCR:
+        def __init__(self, pdf_path, password=None, max_workers=None, cache_path=None):
+            pass
+
+        def fill_scanned_pages(self, raw_pages):
+            return raw_pages
+
+        def extract_tables(self, page_types, dpi_key=None):
+            ocr_calls.extend(page_types)
+            return [{"page_number": p, "rows": [HEADER, ["02/04/2024", f"OCR/PAGE{p}", "1.00", "", "899.00"]]}
+                    for p in page_types]
+
+    monkeypatch.setattr(ingestion, "PDFTextExtractor", FakeText)
+    monkeypatch.setattr(ingestion, "OCRTextExtractor", FakeOCR)
+    monkeypatch.setattr(ingestion, "get_table_extractor",
+                        lambda backend, path, password=None: WholeDocumentTables())
+    narrations = []
+    for event in iter_process_pdf("scan.pdf", NameExtractor(), AddressExtractor(), first_n_pages=3, ocr=True):
+        assert event["event"] != "error", event
+        if event["event"] == "transactions":
+            narrations += [t["narration"] for t in event["data"]]
+    assert sorted(ocr_calls) == [2, 4]
+    assert narrations == ["UPI/PAGE1", "UPI/PAGE2", "OCR/PAGE2", "UPI/PAGE3",
+                          "UPI/PAGE4", "OCR/PAGE4", "UPI/PAGE5"]
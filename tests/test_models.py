@@ -0,0 +1,48 @@
+import pytest
+
+from src.models import Summary, Transaction, construct_transactions, validate_transactions
+from src.Schema.bank_statement import Transaction as SchemaTransaction
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("1,785.00", 1785.0),
+    (" 250 ", 250.0),
+    (42, 42.0),
+    ("", None),
+    ("   ", None),
+    (None, None),
+    ("N/A", "N/A"),
+])
+def test_transaction_numeric_coercion(raw, expected):
+    assert Transaction(amount=raw, currentBalance=raw).amount == expected
+    assert SchemaTransaction(currentBalance=raw).currentBalance == expected
+
+
+def test_bulk_validation_coerces_like_the_model():
+    rows = validate_transactions([{"amount": "1,785.00", "currentBalance": ""},
+                                  {"amount": "12.5", "currentBalance": "9,000"}])
+    assert [(t.amount, t.currentBalance) for t in rows] == [(1785.0, None), (12.5, 9000.0)]
+
+
+NORMALIZED_ROW = {"type": "debit", "amount": 1785.0, "narration": "UPI/CAFE", "reference": "",
+                  "valueDate": "2024-04-01", "currentBalance": "", "maskedAccNumber": "111",
+                  "transactionTimestamp": ""}
+
+
+def test_construct_converts_normalizer_rows_like_validation():
+    built = construct_transactions([NORMALIZED_ROW])[0]
+    validated = validate_transactions([NORMALIZED_ROW])[0]
+    assert built.valueDate == validated.valueDate == 1711929600000
+    assert built.transactionTimestamp is validated.transactionTimestamp is None
+    assert built.currentBalance is validated.currentBalance is None
+    assert built.reference is None
+
+
+def test_summary_numeric_and_int_fields():
+    summary = Summary(currentBalance="1,00,000.50", drawingLimit="", exchgeRate="n/a",
+                      balanceDateTime="1,712,000,000,000", accountAgeInDays=" ")
+    assert summary.currentBalance == 100000.5
+    assert summary.drawingLimit is None
+    assert summary.exchgeRate == "n/a"
+    assert summary.balanceDateTime == 1712000000000
+    assert summary.accountAgeInDays is None
@@ -0,0 +1,29 @@
+from src.Profile.name_extractor import NameExtractor
+
+
+def _pages(*texts):
+    return [{"text": text} for text in texts]
+
+
+def test_labeled_name_on_a_later_page():
+    result = NameExtractor().extract(_pages("Statement of account", "Page 2", "Customer Name : RAVI KUMAR"))
+    assert result["name"] == "Ravi Kumar"
+    assert "first 3p" in result["evidence"]
+
+
+def test_name_address_zone_continues_on_the_next_page():
+    result = NameExtractor().extract(_pages("Statement 01\nName & Address", "MR ANIL KAPOOR\nFlat 4"))
+    assert result["name"] == "Mr Anil Kapoor"
+    assert result["evidence"] == "name&address zone (first 2p)"
+
+
+def test_account_line_completed_by_the_next_page():
+    # the last line of page 1 could still be followed by a separator and name
+    result = NameExtractor().extract(_pages("Statement 01\nAccount No 55 (INR)", "- PRIYA NAIR\n01/04/2024"))
+    assert result["name"] == "Priya Nair"
+    assert result["evidence"] == "account line (same line, 2p)"
+
+
+def test_branch_names_are_skipped():
+    text = "Branch : MG ROAD\nName : SOUTH CITY\nIFSC : HDFC0001"
+    assert NameExtractor().extract(_pages(text))["name"] is None
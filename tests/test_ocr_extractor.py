@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+pytest.importorskip("pytesseract")
+
+import src.OCRExtractor as ocr
+from src.OCRExtractor import OCRTextExtractor
+
+
+@pytest.fixture
+def scanned_pdf(tmp_path):
+    path = tmp_path / "scanned.pdf"
+    doc = fitz.open()
+    for n in range(3):
+        page = doc.new_page()
+        page.draw_rect(fitz.Rect(50, 50 + n * 20, 200, 120 + n * 20), color=(0, 0, 0), fill=(0, 0, 0))
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    calls = {"render": 0, "ocr": 0}
+    render = ocr._render_page
+
+    def counting_render(*args, **kwargs):
+        calls["render"] += 1
+        return render(*args, **kwargs)
+
+    def fake_ocr(bw, lang):
+        calls["ocr"] += 1
+        return f"page {bw.shape[0]}x{bw.shape[1]} {int(bw.sum()) % 997}"
+
+    monkeypatch.setattr(ocr, "_render_page", counting_render)
+    monkeypatch.setattr(ocr, "_ocr_array", fake_ocr)
+    return calls
+
+
+def test_cached_extract_renders_each_page_once(scanned_pdf, tmp_path, counted):
+    extractor = OCRTextExtractor(scanned_pdf, max_workers=1, cache_path=str(tmp_path / "ocr.sqlite3"),
+                                 dpi_by_type={"scanned": 50})
+    pages = extractor.extract_pages({1: "scanned", 2: "scanned", 3: "scanned"})
+    assert [p["page_no"] for p in pages] == [1, 2, 3]
+    assert counted == {"render": 3, "ocr": 3}
+
+    # second run: rendered once more for the key, answered from the cache
+    again = extractor.extract_pages({1: "scanned", 2: "scanned", 3: "scanned"})
+    assert again == pages
+    assert counted == {"render": 6, "ocr": 3}
+
+
+def test_roi_tables_render_full_height_at_body_dpi(scanned_pdf, monkeypatch):
+    seen = []
+
+    def fake_table_page(pdf_path, password, page_no, dpi, threshold, lang, region, tesseract_cmd):
+        seen.append((page_no, dpi, region))
+        return {"page_number": page_no, "rows": [["Date", "Amount"], ["01/04/2024", "10.00"]]}
+
+    monkeypatch.setattr(ocr, "_ocr_table_page", fake_table_page)
+    tables = OCRTextExtractor(scanned_pdf, max_workers=1).extract_tables({2: "scanned", 3: "scanned"},
+                                                                         dpi_key="body")
+    assert [t["page_number"] for t in tables] == [2, 3]
+    assert seen == [(2, 200, None), (3, 200, None)]
+
+
+def test_duplicate_pages_ocr_once_across_workers(tmp_path, monkeypatch):
+    path = tmp_path / "dupes.pdf"
+    doc = fitz.open()
+    for n in (0, 1, 0, 1, 2):
+        page = doc.new_page()
+        page.draw_rect(fitz.Rect(50, 50 + n * 40, 200, 120 + n * 40), color=(0, 0, 0), fill=(0, 0, 0))
+    doc.save(path)
+    doc.close()
+
+    log = tmp_path / "calls.log"
+    render = ocr._render_page
+
+    def logged_render(*args, **kwargs):
+        with open(log, "a") as fh:
+            fh.write("render\n")
+        return render(*args, **kwargs)
+
+    def logged_ocr(bw, lang):
+        with open(log, "a") as fh:
+            fh.write("ocr\n")
+        time.sleep(0.2)  # keep workers busy at the same time
+        return "text " + ocr._page_key(bw, lang)[:8]
+
+    # worker processes are forked after patching, so they log to the same file
+    monkeypatch.setattr(ocr, "_render_page", logged_render)
+    monkeypatch.setattr(ocr, "_ocr_array", logged_ocr)
+    extractor = OCRTextExtractor(str(path), max_workers=4, cache_path=str(tmp_path / "ocr.sqlite3"),
+                                 dpi_by_type={"scanned": 50})
+    pages = extractor.extract_pages({n: "scanned" for n in range(1, 6)})
+
+    calls = log.read_text().split()
+    assert calls.count("render") == 5
+    assert calls.count("ocr") == 3
+    texts = [p["text"] for p in pages]
+    assert texts[0] == texts[2] and texts[1] == texts[3]
+    assert len(set(texts)) == 3
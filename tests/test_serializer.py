@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from src.Serializer import JSONSerializer, NDJSONWriter
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_ndjson_stream_writes_each_batch(tmp_path, backend):
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+    writer = NDJSONWriter(tmp_path, JSONSerializer(backend))
+    stream = writer.open_transactions("stmt")
+    stream.write([{"amount": 1.0, "narration": "café"}])
+    assert (tmp_path / "stmt_transactions.ndjson").read_text(encoding="utf-8").count("\n") == 1
+    stream.write([{"amount": 2.0}, {"amount": 3.0}])
+
+    written = writer.write("stmt", {"document_info": {}, "transactions": []}, transactions=stream)
+    lines = (tmp_path / "stmt_transactions.ndjson").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["amount"] for line in lines] == [1.0, 2.0, 3.0]
+    meta = json.loads((tmp_path / "stmt_analysis.json").read_text(encoding="utf-8"))
+    assert meta["transactions_file"] == "stmt_transactions.ndjson"
+    assert written["transactions"].endswith("stmt_transactions.ndjson")
+
+
+def test_ndjson_writer_without_stream_writes_the_list(tmp_path):
+    NDJSONWriter(tmp_path).write("stmt", {"transactions": [{"a": 1}, {"a": 2}]})
+    assert (tmp_path / "stmt_transactions.ndjson").read_text().splitlines() == ['{"a":1}', '{"a":2}']
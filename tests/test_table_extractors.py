@@ -0,0 +1,77 @@
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from src.HeaderParser import HeaderBasedTableParser
+from src.PDFTextExtractor import HeaderColumnTableExtractor
+
+COLUMNS = (40, 120, 330, 420, 500)
+HEADER = ("Date", "Narration", "Withdrawal", "Deposit", "Balance")
+
+
+def _line(page, y, cells):
+    for x, text in zip(COLUMNS, cells):
+        if text:
+            page.insert_text((x, y), text, fontsize=9)
+
+
+def _rows(page, y, start, count):
+    for n in range(start, start + count):
+        _line(page, y, (f"{n:02d}/04/2024", f"UPI/PAYMENT/REF{n}", f"{n}.00", "", f"{1000 - n}.00"))
+        y += 14
+    return y
+
+
+@pytest.fixture
+def statement(tmp_path):
+    doc = fitz.open()
+    page = doc.new_page()                       # 1: profile only
+    page.insert_text((40, 60), "Statement of account  Name: Anurag Sinha  Period 01/04/2024", fontsize=9)
+    page = doc.new_page()                       # 2: header + rows
+    _line(page, 60, HEADER)
+    _rows(page, 80, 1, 4)
+    page = doc.new_page()                       # 3: page title, repeated header, rows
+    page.insert_text((40, 40), "HDFC BANK LTD  Page 3", fontsize=9)
+    _line(page, 60, HEADER)
+    _rows(page, 80, 5, 3)
+    page = doc.new_page()                       # 4: no header at all, rows only
+    _rows(page, 60, 8, 3)
+    page = doc.new_page()                       # 5: summary: dates but no transaction rows
+    page.insert_text((40, 60), "Statement as on 30/04/2024", fontsize=9)
+    page.insert_text((40, 80), "Deposits opened 01/01/2024 maturing 01/01/2027", fontsize=9)
+    page = doc.new_page()                       # 6: after the table ended
+    _rows(page, 60, 20, 2)
+    path = tmp_path / "statement.pdf"
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+def test_headerless_pages_are_sliced_until_the_table_ends(statement):
+    tables = HeaderColumnTableExtractor(statement).extract_tables()
+    assert [t["page_number"] for t in tables] == [2, 3, 4]
+    assert [c for c in tables[1]["rows"][0]] == list(HEADER)  # page title dropped
+    txns = HeaderBasedTableParser().parse(tables)
+    assert [t["description"] for t in txns] == [f"UPI/PAYMENT/REF{n}" for n in range(1, 11)]
+
+
+def test_header_is_detected_once(statement, monkeypatch):
+    extractor = HeaderColumnTableExtractor(statement)
+    calls = []
+    find_header = extractor.find_header
+    monkeypatch.setattr(extractor, "find_header", lambda *a: calls.append(1) or find_header(*a))
+    extractor.extract_tables()
+    assert len(calls) == 2  # profile page, then the first transaction page
+
+
+def test_end_of_statement_line_stops_slicing(tmp_path):
+    doc = fitz.open()
+    page = doc.new_page()
+    _line(page, 60, HEADER)
+    y = _rows(page, 80, 1, 2)
+    page.insert_text((40, y), "*** End of Statement ***", fontsize=9)
+    _rows(doc.new_page(), 60, 3, 2)
+    doc.save(tmp_path / "s.pdf")
+    tables = HeaderColumnTableExtractor(str(tmp_path / "s.pdf")).extract_tables()
+    assert [t["page_number"] for t in tables] == [1]
+    assert len(HeaderBasedTableParser().parse(tables)) == 2